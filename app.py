@@ -12,6 +12,13 @@ from routes.aulas import aulas_bp, set_firestore_client as set_aulas_firestore
 from routes.exercicios import exercicios_bp
 from routes.api import api_bp, set_firestore_client as set_api_firestore
 from routes.progress import progress_bp, set_firestore_client as set_progress_firestore
+from routes.terminal import terminal_bp, init_terminal
+
+# Terminal interativo via WebSocket (opcional: requer flask-socketio)
+try:
+    from flask_socketio import SocketIO
+except ImportError:
+    SocketIO = None
 
 # Carrega variáveis de ambiente
 load_dotenv()
@@ -106,6 +113,20 @@ app.register_blueprint(aulas_bp)
 app.register_blueprint(exercicios_bp)
 app.register_blueprint(api_bp)
 app.register_blueprint(progress_bp)
+app.register_blueprint(terminal_bp)
+
+# Servidor WebSocket do terminal interativo
+socketio = None
+if SocketIO is not None:
+    from utils.terminal_sessions import TerminalSessionManager
+    # Modo threading: o código do aluno bloqueia (input), não pode rodar em greenlets.
+    # WebSocket requer simple-websocket; em produção, um worker do gunicorn com várias
+    # threads (render.yaml), pois as sessões do terminal ficam na memória do processo
+    socketio = SocketIO(app, async_mode='threading')
+    init_terminal(socketio, TerminalSessionManager(socketio))
+    print("✅ Terminal interativo (WebSocket) habilitado")
+else:
+    print("⚠️  flask-socketio não instalado: terminal interativo desabilitado")
 
 print("Static folder:", app.static_folder)
 
@@ -140,4 +161,7 @@ if __name__ == "__main__":
     print("\n💡 Pressione CTRL+C para parar o servidor")
     print("="*60 + "\n")
     
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if socketio is not None:
+        socketio.run(app, debug=True, host='0.0.0.0', port=5000)
+    else:
+        app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,214 @@
+"""
+Corpus de programas para os benchmarks do executor
+Programas no estilo das aulas de cada módulo, com as entradas dos exemplos,
+e programas patológicos que exercitam os limites do sandbox.
+"""
+
+
+def _matrix_inputs(order, start=1):
+    """Entradas de uma matriz quadrada: a ordem seguida dos elementos"""
+    return [str(order)] + [str(float((start + i) % 17 - 8)) for i in range(order * order)]
+
+
+SEQUENCIAL = [
+    {
+        'name': 'sequencial/retangulo',
+        'code': (
+            "import math\n"
+            "base = float(input('Base do retangulo: '))\n"
+            "altura = float(input('Altura do retangulo: '))\n"
+            "area = base * altura\n"
+            "perimetro = 2 * (base + altura)\n"
+            "diagonal = math.sqrt(base ** 2 + altura ** 2)\n"
+            "print(f'AREA = {area:.4f}')\n"
+            "print(f'PERIMETRO = {perimetro:.4f}')\n"
+            "print(f'DIAGONAL = {diagonal:.4f}')\n"
+        ),
+        'inputs': ['10.3', '13.1'],
+    },
+    {
+        'name': 'sequencial/troco',
+        'code': (
+            "preco = float(input('Preco unitario do produto: '))\n"
+            "quantidade = int(input('Quantidade comprada: '))\n"
+            "pago = float(input('Dinheiro recebido: '))\n"
+            "troco = pago - preco * quantidade\n"
+            "print(f'TROCO = {troco:.2f}')\n"
+        ),
+        'inputs': ['30.00', '3', '100.00'],
+    },
+]
+
+COMPARATIVA = [
+    {
+        'name': 'comparativa/temperatura',
+        'code': (
+            "escala = input('Voce vai digitar a temperatura em qual escala (C/F)? ')\n"
+            "if escala == 'F':\n"
+            "    f = float(input('Digite a temperatura em Fahrenheit: '))\n"
+            "    c = 5 / 9 * (f - 32)\n"
+            "    print(f'Temperatura equivalente em Celsius: {c:.2f}')\n"
+            "else:\n"
+            "    c = float(input('Digite a temperatura em Celsius: '))\n"
+            "    f = c * 9 / 5 + 32\n"
+            "    print(f'Temperatura equivalente em Fahrenheit: {f:.2f}')\n"
+        ),
+        'inputs': ['F', '77.00'],
+    },
+    {
+        'name': 'comparativa/glicose',
+        'code': (
+            "glicose = float(input('Digite a medida da glicose: '))\n"
+            "if glicose <= 100:\n"
+            "    classificacao = 'normal'\n"
+            "elif glicose <= 140:\n"
+            "    classificacao = 'elevado'\n"
+            "else:\n"
+            "    classificacao = 'diabetes'\n"
+            "print(f'Classificacao: {classificacao}')\n"
+        ),
+        'inputs': ['125.4'],
+    },
+]
+
+REPETITIVA = [
+    {
+        'name': 'repetitiva/par_impar',
+        'code': (
+            "n = int(input('Quantos numeros voce vai digitar? '))\n"
+            "for i in range(n):\n"
+            "    x = int(input('Digite um numero: '))\n"
+            "    if x == 0:\n"
+            "        print('NULO')\n"
+            "    else:\n"
+            "        paridade = 'PAR' if x % 2 == 0 else 'IMPAR'\n"
+            "        sinal = 'POSITIVO' if x > 0 else 'NEGATIVO'\n"
+            "        print(paridade, sinal)\n"
+        ),
+        'inputs': ['4', '-5', '0', '3', '-2'],
+    },
+    {
+        'name': 'repetitiva/soma_ate_n',
+        'code': (
+            "n = int(input('Digite um numero: '))\n"
+            "soma = 0\n"
+            "i = 1\n"
+            "while i <= n:\n"
+            "    soma += i\n"
+            "    i += 1\n"
+            "print(f'SOMA = {soma}')\n"
+        ),
+        'inputs': ['200000'],
+    },
+]
+
+VETORES = [
+    {
+        'name': 'vetores/maior_posicao',
+        'code': (
+            "n = int(input('Quantos numeros voce vai digitar? '))\n"
+            "vet = []\n"
+            "for i in range(n):\n"
+            "    vet.append(float(input('Digite um numero: ')))\n"
+            "maior = 0\n"
+            "for i in range(1, n):\n"
+            "    if vet[i] > vet[maior]:\n"
+            "        maior = i\n"
+            "print(f'MAIOR VALOR = {vet[maior]:.1f}')\n"
+            "print(f'POSICAO DO MAIOR VALOR = {maior}')\n"
+        ),
+        'inputs': ['4', '8.0', '4.0', '10.0', '14.0'],
+    },
+    {
+        'name': 'vetores/ordenacao_bolha',
+        'code': (
+            "n = int(input('Quantos numeros? '))\n"
+            "vet = [(i * 7919) % n for i in range(n)]\n"
+            "for i in range(n):\n"
+            "    for j in range(n - 1 - i):\n"
+            "        if vet[j] > vet[j + 1]:\n"
+            "            vet[j], vet[j + 1] = vet[j + 1], vet[j]\n"
+            "print(vet[:5], vet[-5:])\n"
+        ),
+        'inputs': ['400'],
+    },
+]
+
+MATRIZES = [
+    {
+        'name': 'matrizes/diagonal_positivos',
+        'code': (
+            "n = int(input('Qual a ordem da matriz? '))\n"
+            "mat = []\n"
+            "for i in range(n):\n"
+            "    linha = []\n"
+            "    for j in range(n):\n"
+            "        linha.append(float(input(f'Elemento [{i},{j}]: ')))\n"
+            "    mat.append(linha)\n"
+            "soma = sum(v for linha in mat for v in linha if v > 0)\n"
+            "print(f'SOMA DOS POSITIVOS: {soma:.1f}')\n"
+            "print('DIAGONAL PRINCIPAL:')\n"
+            "print(' '.join(str(mat[i][i]) for i in range(n)))\n"
+        ),
+        'inputs': _matrix_inputs(3),
+    },
+    {
+        'name': 'matrizes/diagonal_positivos_20x20',
+        'code': None,  # mesmo programa, matriz maior (preenchido abaixo)
+        'inputs': _matrix_inputs(20),
+    },
+    {
+        'name': 'matrizes/produto',
+        'code': (
+            "n = int(input('Ordem: '))\n"
+            "a = [[(i + j) % 10 for j in range(n)] for i in range(n)]\n"
+            "b = [[(i * j) % 10 for j in range(n)] for i in range(n)]\n"
+            "c = [[sum(a[i][k] * b[k][j] for k in range(n)) for j in range(n)] for i in range(n)]\n"
+            "print(sum(sum(linha) for linha in c))\n"
+        ),
+        'inputs': ['40'],
+    },
+]
+MATRIZES[1]['code'] = MATRIZES[0]['code']
+
+# Programas que devem ser interrompidos pelos limites do executor
+PATHOLOGICAL = [
+    {
+        'name': 'patologico/loop_infinito',
+        'code': "x = 0\nwhile True:\n    x += 1\n",
+        'inputs': [],
+    },
+    {
+        'name': 'patologico/saida_enorme',
+        'code': "while True:\n    print('x' * 1000)\n",
+        'inputs': [],
+    },
+    {
+        'name': 'patologico/recursao_profunda',
+        'code': "def f(n):\n    return f(n + 1)\nf(0)\n",
+        'inputs': [],
+    },
+    {
+        'name': 'patologico/lista_gigante',
+        'code': "dados = [0] * (10 ** 9)\nprint(len(dados))\n",
+        'inputs': [],
+    },
+]
+
+MODULES = {
+    'sequencial': SEQUENCIAL,
+    'comparativa': COMPARATIVA,
+    'repetitiva': REPETITIVA,
+    'vetores': VETORES,
+    'matrizes': MATRIZES,
+}
+
+
+def load_corpus(include_pathological=True):
+    """Retorna a lista de programas, cada um com name, module, code e inputs"""
+    corpus = []
+    for module, programs in MODULES.items():
+        corpus.extend({**program, 'module': module} for program in programs)
+    if include_pathological:
+        corpus.extend({**program, 'module': 'patologico'} for program in PATHOLOGICAL)
+    return corpus
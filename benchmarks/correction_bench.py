@@ -0,0 +1,119 @@
+"""
+Benchmark da correção por IA contra o servidor falso da OpenAI
+Dispara correções simultâneas (com soluções repetidas, como numa turma real)
+pelo AICorrector e mede latência, chamadas à API economizadas pelo
+agrupamento de requisições idênticas e o pico de concorrência no servidor.
+Com --stream usa a correção em streaming e mede também o tempo até o
+primeiro evento exibido ao aluno (veredito ou trecho do feedback).
+
+Uso (na raiz do projeto; requer o pacote openai):
+    python -m benchmarks.correction_bench --requests 200 --concurrency 32 --distinct 20
+    python -m benchmarks.correction_bench --stream --token-delay 0.02
+"""
+
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.executor_bench import summarize, git_commit
+from benchmarks.fake_openai import FakeOpenAIServer
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark da correção por IA')
+    parser.add_argument('--requests', type=int, default=200, help='correções enviadas')
+    parser.add_argument('--concurrency', type=int, default=32, help='requisições simultâneas')
+    parser.add_argument('--distinct', type=int, default=20, help='soluções diferentes entre as enviadas')
+    parser.add_argument('--latency', type=float, default=0.5, help='latência do servidor falso (segundos)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 429/500')
+    parser.add_argument('--max-concurrency', type=int, default=8, help='limite de chamadas simultâneas à API')
+    parser.add_argument('--budget', type=float, default=8.0, help='segundos aguardando a IA antes da correção local')
+    parser.add_argument('--stream', action='store_true', help='usa a correção em streaming')
+    parser.add_argument('--token-delay', type=float, default=0.02, help='intervalo entre trechos no streaming (segundos)')
+    parser.add_argument('--output', help='arquivo para gravar o JSON (padrão: stdout)')
+    return parser.parse_args(argv)
+
+
+def make_solution(index):
+    # Soluções distintas de verdade (ASTs diferentes), não apenas nomes trocados
+    return f"nome = input('Nome: ')\nprint('Olá,', nome, {index})\n"
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    server = FakeOpenAIServer(
+        ('127.0.0.1', 0), latency=args.latency, error_rate=args.error_rate, token_delay=args.token_delay
+    ).start()
+    # O corretor lê a configuração do ambiente ao ser importado
+    os.environ['OPENAI_API_KEY'] = 'fake'
+    os.environ['OPENAI_BASE_URL'] = server.base_url
+    os.environ['OPENAI_MAX_CONCURRENCY'] = str(args.max_concurrency)
+    os.environ['AI_CORRECTOR_MOCK'] = '0'
+    os.environ['AI_CORRECTION_BUDGET'] = str(args.budget)
+    os.environ.pop('CORRECTION_CACHE_PATH', None)
+
+    from utils.ai_corrector import corrector
+
+    description = 'Aula 1 - Peça o nome do aluno e mostre uma saudação.'
+    jobs = [make_solution(index % args.distinct) for index in range(args.requests)]
+
+    def timed(code):
+        started = time.perf_counter()
+        result = corrector.correct_exercise(code, description, 1, 'sequencial/1')
+        return {
+            'latency': time.perf_counter() - started,
+            # A correção local indica que a chamada à API falhou ou excedeu o orçamento
+            'success': 'Correção gerada pelo servidor falso' in result.get('feedback', ''),
+        }
+
+    def timed_stream(code):
+        started = time.perf_counter()
+        first_event = None
+        result = {}
+        for event, payload in corrector.correct_exercise_stream(code, description, 1, 'sequencial/1'):
+            if first_event is None:
+                first_event = time.perf_counter() - started
+            if event == 'result':
+                result = payload
+        return {
+            'latency': time.perf_counter() - started,
+            'first_event': first_event,
+            'success': 'Correção gerada pelo servidor falso' in result.get('feedback', ''),
+        }
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as threads:
+        samples = list(threads.map(timed_stream if args.stream else timed, jobs))
+    elapsed = time.perf_counter() - started
+
+    report = {
+        'commit': git_commit(),
+        'config': vars(args),
+        'overall': summarize(samples, elapsed),
+        'server': server.stats(),
+        'openai_client': corrector.client.stats(),
+        'correction_cache': corrector.cache.stats(),
+        'corrector': corrector.stats(),
+    }
+    if args.stream:
+        # Tempo até o aluno ver algo na tela
+        report['first_event'] = summarize(
+            [{'latency': sample['first_event'] or sample['latency'], 'success': sample['success']}
+             for sample in samples],
+            elapsed
+        )
+    server.shutdown()
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
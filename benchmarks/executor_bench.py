@@ -0,0 +1,227 @@
+"""
+Benchmark do executor de código
+Executa o corpus de programas das aulas (e os patológicos) pelo CodeExecutor
+e/ou pela rota /api/execute (Flask test client), com concorrência configurável,
+e imprime latências p50/p95/p99, jobs por segundo e pico de memória em JSON.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.executor_bench --target both --concurrency 4 --rounds 5
+    python -m benchmarks.executor_bench --output resultado.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import argparse
+import platform
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows não possui o módulo resource
+    resource = None
+
+from benchmarks.corpus import load_corpus
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark do executor de código')
+    parser.add_argument('--target', choices=['executor', 'api', 'both'], default='executor',
+                        help='executor direto, rota /api/execute ou ambos')
+    parser.add_argument('--concurrency', type=int, default=4, help='requisições simultâneas')
+    parser.add_argument('--rounds', type=int, default=3, help='quantas vezes o corpus é executado')
+    parser.add_argument('--backend', choices=['pool', 'inline'], default='pool')
+    parser.add_argument('--pool-size', type=int, default=2)
+    parser.add_argument('--timeout', type=float, default=2.0,
+                        help='limite de tempo por execução (os loops infinitos esperam por ele)')
+    parser.add_argument('--no-pathological', action='store_true',
+                        help='executa apenas os programas das aulas')
+    parser.add_argument('--result-cache', action='store_true',
+                        help='mantém o cache de resultados ligado (desligado por padrão)')
+    parser.add_argument('--output', help='arquivo para gravar o JSON (padrão: stdout)')
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    """O executor lê a configuração do ambiente ao ser importado"""
+    os.environ['EXECUTOR_BACKEND'] = args.backend
+    os.environ['EXECUTOR_POOL_SIZE'] = str(args.pool_size)
+    os.environ['EXECUTOR_QUEUE_DEPTH'] = str(max(16, args.concurrency * 2))
+    os.environ['EXECUTOR_TIMEOUT'] = str(args.timeout)
+    if not args.result_cache:
+        # Sem cache de resultados cada job realmente executa
+        os.environ['EXECUTOR_RESULT_CACHE_ENTRIES'] = '0'
+
+
+def percentile(sorted_values, fraction):
+    """Percentil pelo método nearest-rank"""
+    if not sorted_values:
+        return None
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize(samples, elapsed):
+    """Resumo de latência (ms) de uma lista de amostras"""
+    latencies = sorted(sample['latency'] * 1000 for sample in samples)
+    return {
+        'jobs': len(samples),
+        'errors': sum(1 for sample in samples if not sample['success']),
+        'jobs_per_second': round(len(samples) / elapsed, 2) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50), 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 0.95), 2) if latencies else None,
+        'p99_ms': round(percentile(latencies, 0.99), 2) if latencies else None,
+        'max_ms': round(latencies[-1], 2) if latencies else None,
+    }
+
+
+def make_executor_runner():
+    from utils.executor import executor
+
+    def run(program):
+        return executor.execute_python_code(program['code'], program['inputs'])
+
+    return run, executor
+
+
+def make_api_runner():
+    """App Flask mínimo com apenas o blueprint da API (sem Firebase inicializado)"""
+    from flask import Flask
+    from routes.api import api_bp
+    from utils.executor import executor
+
+    app = Flask(__name__)
+    app.register_blueprint(api_bp)
+    client = app.test_client
+
+    def run(program):
+        # Um client por chamada: o test client não é compartilhável entre threads
+        with client() as http:
+            response = http.post('/api/execute', json={
+                'code': program['code'],
+                'inputs': program['inputs']
+            })
+            return response.get_json()
+
+    return run, executor
+
+
+def run_target(run, corpus, rounds, concurrency):
+    """Executa o corpus 'rounds' vezes com 'concurrency' threads"""
+    jobs = [program for _ in range(rounds) for program in corpus]
+
+    def timed(program):
+        started = time.perf_counter()
+        result = run(program) or {}
+        latency = time.perf_counter() - started
+        usage = result.get('usage') or {}
+        return {
+            'name': program['name'],
+            'module': program['module'],
+            'latency': latency,
+            'success': bool(result.get('success')),
+            'limits_hit': result.get('limits_hit') or [],
+            'worker_peak_rss_kb': usage.get('worker_peak_rss_kb'),
+        }
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        samples = list(threads.map(timed, jobs))
+    elapsed = time.perf_counter() - started
+
+    by_program = {}
+    for sample in samples:
+        by_program.setdefault(sample['name'], []).append(sample)
+    by_module = {}
+    for sample in samples:
+        by_module.setdefault(sample['module'], []).append(sample)
+
+    worker_rss = [sample['worker_peak_rss_kb'] for sample in samples if sample['worker_peak_rss_kb']]
+    return {
+        'elapsed_seconds': round(elapsed, 3),
+        'overall': summarize(samples, elapsed),
+        'modules': {module: summarize(items, None) for module, items in by_module.items()},
+        'programs': {
+            name: {
+                **summarize(items, None),
+                'limits_hit': sorted({limit for item in items for limit in item['limits_hit']}),
+            }
+            for name, items in by_program.items()
+        },
+        'worker_peak_rss_kb': max(worker_rss) if worker_rss else None,
+    }
+
+
+def peak_rss_kb(who):
+    if resource is None:
+        return None
+    peak = resource.getrusage(who).ru_maxrss
+    # macOS reporta em bytes, Linux em KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+
+    corpus = load_corpus(include_pathological=not args.no_pathological)
+    targets = ['executor', 'api'] if args.target == 'both' else [args.target]
+
+    report = {
+        'commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'config': {
+            'backend': args.backend,
+            'pool_size': args.pool_size,
+            'concurrency': args.concurrency,
+            'rounds': args.rounds,
+            'timeout': args.timeout,
+            'result_cache': args.result_cache,
+            'programs': len(corpus),
+        },
+        'targets': {},
+    }
+
+    executor = None
+    for target in targets:
+        run, executor = make_executor_runner() if target == 'executor' else make_api_runner()
+        # Aquece o pool para não medir a criação dos workers
+        run({'code': "print('ok')", 'inputs': [], 'name': 'warmup', 'module': 'warmup'})
+        report['targets'][target] = run_target(run, corpus, args.rounds, args.concurrency)
+
+    if executor is not None:
+        report['executor_stats'] = executor.get_stats()
+        if executor.pool is not None:
+            executor.pool.shutdown()
+
+    report['peak_rss_kb'] = {
+        'harness': peak_rss_kb(resource.RUSAGE_SELF) if resource else None,
+        # Workers encerrados (substituídos após timeout ou limite de memória)
+        'children': peak_rss_kb(resource.RUSAGE_CHILDREN) if resource else None,
+    }
+
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
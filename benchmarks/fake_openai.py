@@ -0,0 +1,185 @@
+"""
+Servidor falso compatível com a API de chat da OpenAI (apenas biblioteca padrão)
+Responde POST /v1/chat/completions com uma correção em JSON após uma latência
+configurável e, opcionalmente, com erros 429/500 aleatórios. Com "stream": true
+a resposta vem em Server-Sent Events: o primeiro trecho após a latência e os
+demais a cada --token-delay. GET /stats retorna quantas chamadas chegaram e o
+pico de chamadas simultâneas.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.fake_openai --port 8099 --latency 0.5 --error-rate 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8099/v1 OPENAI_API_KEY=fake AI_CORRECTOR_MOCK=0 python app.py
+"""
+
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CORRECTION = {
+    'correct': True,
+    'score': 90,
+    'feedback': 'Correção gerada pelo servidor falso de testes. O código lê as entradas, '
+                'faz os cálculos pedidos e exibe a saída no formato dos exemplos.',
+    'suggestions': ['Continue praticando!'],
+}
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, latency=0.5, jitter=0.0, error_rate=0.0, token_delay=0.02, chunk_size=4):
+        super().__init__(address, FakeOpenAIHandler)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.token_delay = token_delay
+        self.chunk_size = chunk_size
+        self.lock = threading.Lock()
+        self.counters = {'requests': 0, 'streams': 0, 'errors': 0, 'active': 0, 'peak_active': 0}
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def stats(self):
+        with self.lock:
+            return dict(self.counters)
+
+    def start(self):
+        """Atende em uma thread daemon (para uso dentro de benchmarks)"""
+        thread = threading.Thread(target=self.serve_forever, name='fake-openai', daemon=True)
+        thread.start()
+        return self
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip('/') == '/stats':
+            self._send_json(200, self.server.stats())
+        else:
+            self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            self._send_json(400, {'error': {'message': 'Invalid JSON', 'type': 'invalid_request_error'}})
+            return
+
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found', 'type': 'invalid_request_error'}})
+            return
+
+        server = self.server
+        with server.lock:
+            server.counters['requests'] += 1
+            server.counters['active'] += 1
+            server.counters['peak_active'] = max(server.counters['peak_active'], server.counters['active'])
+        try:
+            time.sleep(max(0.0, server.latency + random.uniform(-server.jitter, server.jitter)))
+
+            if random.random() < server.error_rate:
+                with server.lock:
+                    server.counters['errors'] += 1
+                status, kind = random.choice([(429, 'rate_limit_error'), (500, 'server_error')])
+                self._send_json(status, {'error': {'message': 'Erro simulado', 'type': kind}})
+                return
+
+            content = json.dumps(CORRECTION, ensure_ascii=False)
+            if body.get('stream'):
+                self._send_stream(body.get('model', 'fake'), content)
+                return
+            self._send_json(200, {
+                'id': f'chatcmpl-fake-{server.counters["requests"]}',
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': body.get('model', 'fake'),
+                'choices': [{
+                    'index': 0,
+                    'message': {'role': 'assistant', 'content': content},
+                    'finish_reason': 'stop',
+                }],
+                'usage': {'prompt_tokens': 0, 'completion_tokens': 0, 'total_tokens': 0},
+            })
+        finally:
+            with server.lock:
+                server.counters['active'] -= 1
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model, content):
+        """Envia o conteúdo em trechos no formato de streaming da API (sem Content-Length)"""
+        server = self.server
+        with server.lock:
+            server.counters['streams'] += 1
+            completion_id = f'chatcmpl-fake-{server.counters["requests"]}'
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None):
+            payload = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+            }
+            self.wfile.write(f'data: {json.dumps(payload, ensure_ascii=False)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+
+        try:
+            chunk({'role': 'assistant', 'content': ''})
+            for start in range(0, len(content), server.chunk_size):
+                if start:
+                    time.sleep(server.token_delay)
+                chunk({'content': content[start:start + server.chunk_size]})
+            chunk({}, 'stop')
+            self.wfile.write(b'data: [DONE]\n\n')
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # Cliente cancelou a correção no meio do streaming
+            pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servidor falso compatível com a API da OpenAI')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8099)
+    parser.add_argument('--latency', type=float, default=0.5, help='latência de cada resposta (segundos)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='variação aleatória da latência (segundos)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fração de respostas 429/500')
+    parser.add_argument('--token-delay', type=float, default=0.02, help='intervalo entre trechos no streaming (segundos)')
+    args = parser.parse_args(argv)
+
+    server = FakeOpenAIServer(
+        (args.host, args.port), args.latency, args.jitter, args.error_rate, token_delay=args.token_delay
+    )
+    print(f'Servidor falso da OpenAI em {server.base_url}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
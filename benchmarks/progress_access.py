@@ -0,0 +1,119 @@
+"""
+Verificação de acesso aos módulos: módulo anterior x campo derivado
+Cria alunos com progresso aleatório em um Firestore em memória e simula a
+navegação (o painel verifica os cinco módulos e cada página de módulo verifica
+o seu) comparando a leitura do módulo anterior a cada verificação com o
+conjunto de módulos liberados (usuarios/{user_id}.modulos_liberados), antes e
+depois do backfill, com e sem cache. As respostas dos dois métodos são comparadas.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.progress_access --users 500
+    python -m benchmarks.progress_access --output resultado.json
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+
+from benchmarks.executor_bench import summarize, git_commit
+from tests.memory_firestore import MemoryFirestore
+from benchmarks.progress_layout import seed_users
+from utils.progress_migration import backfill_unlocked
+from utils.progress_store import ProgressStore, MODULE_ORDER, COMPLETION_FIELDS, module_access
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Verificação de acesso aos módulos')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='latência simulada de cada chamada ao Firestore (segundos)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='arquivo para gravar o JSON (padrão: stdout)')
+    return parser.parse_args(argv)
+
+
+def previous_module_check(store, user_id, module):
+    """Verificação anterior: lê o módulo anterior a cada chamada"""
+    if module == MODULE_ORDER[0] or module not in MODULE_ORDER:
+        return module_access(module, None)
+    previous_module = MODULE_ORDER[MODULE_ORDER.index(module) - 1]
+    return module_access(module, store.get_module(user_id, previous_module, fields=COMPLETION_FIELDS))
+
+
+def derived_field_check(store, user_id, module):
+    return store.check_access(user_id, module)
+
+
+METHODS = {
+    'previous_module': previous_module_check,
+    'derived_field': derived_field_check,
+}
+
+
+def navigate(db, check, user_ids, cache_entries):
+    """Painel (cinco verificações) e a página de cada módulo liberado, por aluno"""
+    store = ProgressStore(db, cache_entries=cache_entries)
+    reads_before = db.rpcs['documents_read']
+    commits_before = db.rpcs['commit']
+    samples = []
+    answers = {}
+    started = time.perf_counter()
+    for user_id in user_ids:
+        visits = list(MODULE_ORDER)
+        visits += [module for module in MODULE_ORDER if answers.get((user_id, module), True)]
+        for module in visits:
+            start = time.perf_counter()
+            can_access, _ = check(store, user_id, module)
+            samples.append({'latency': time.perf_counter() - start, 'success': True})
+            answers[(user_id, module)] = can_access
+    elapsed = time.perf_counter() - started
+
+    return {
+        'checks': len(samples),
+        'documents_read_per_check': round((db.rpcs['documents_read'] - reads_before) / len(samples), 3),
+        'writes': db.rpcs['commit'] - commits_before,
+        'latency': summarize(samples, elapsed),
+    }, answers
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    results = {}
+    expected = None
+    same_answers = {}
+    for scenario in ('lazy_backfill', 'backfill_job'):
+        db = MemoryFirestore()
+        user_ids = seed_users(db, args.users, random.Random(args.seed))
+        db.latency = args.latency
+        if scenario == 'backfill_job':
+            results['backfill'] = backfill_unlocked(db)
+        # Sem o job, a primeira verificação de cada aluno monta o campo (veja "writes")
+        for cache_entries, cache in ((0, 'no_cache'), (1024, 'cache')):
+            for name, check in METHODS.items():
+                key = f'{scenario}.{cache}.{name}'
+                results[key], answers = navigate(db, check, user_ids, cache_entries)
+                if expected is None:
+                    expected = answers
+                same_answers[key] = answers == expected
+
+    report = {
+        'commit': git_commit(),
+        'config': {'users': args.users, 'latency': args.latency, 'seed': args.seed},
+        'results': results,
+        'same_answers': same_answers,
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Concorrência na conclusão de aulas
+Dispara conclusões simultâneas contra um Firestore em memória (com latência
+por chamada) e compara a leitura-modificação-escrita antiga da rota
+/api/complete-lesson com a transação de ProgressStore.complete_lesson:
+atualizações perdidas, chamadas ao Firestore por conclusão e latência.
+
+Cenários:
+    double_click      a mesma aula concluída várias vezes ao mesmo tempo
+    parallel_lessons  as 10 aulas de um módulo concluídas ao mesmo tempo
+                      (o módulo tem de terminar completo e liberar o próximo)
+
+Uso (na raiz do projeto):
+    python -m benchmarks.progress_concurrency --trials 50 --latency 0.005
+    python -m benchmarks.progress_concurrency --output resultado.json
+"""
+
+import sys
+import json
+import time
+import argparse
+import threading
+
+from firebase_admin import firestore
+
+from benchmarks.executor_bench import summarize, git_commit
+from tests.memory_firestore import MemoryFirestore
+from utils.progress_store import ProgressStore, MODULE_ORDER, TOTAL_LESSONS, new_module_document
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Concorrência na conclusão de aulas')
+    parser.add_argument('--trials', type=int, default=30, help='repetições de cada cenário')
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help='latência simulada de cada chamada ao Firestore (segundos)')
+    parser.add_argument('--clicks', type=int, default=4, help='cliques simultâneos no double_click')
+    parser.add_argument('--output', help='arquivo para gravar o JSON (padrão: stdout)')
+    return parser.parse_args(argv)
+
+
+def legacy_complete_lesson(store, user_id, module, lesson_number):
+    """Fluxo anterior da rota: lê o documento, altera as listas e grava por cima"""
+    data = store.get_module(user_id, module, fields=['aulas_concluidas', 'aulas_liberadas', 'total_aulas'],
+                            fresh=True) or {}
+    aulas_concluidas = data.get('aulas_concluidas', [])
+    aulas_liberadas = data.get('aulas_liberadas', [1])
+    total_aulas = data.get('total_aulas', TOTAL_LESSONS)
+    if lesson_number not in aulas_liberadas:
+        return None
+
+    if lesson_number not in aulas_concluidas:
+        aulas_concluidas = sorted(aulas_concluidas + [lesson_number])
+        if lesson_number + 1 <= total_aulas and lesson_number + 1 not in aulas_liberadas:
+            aulas_liberadas = sorted(aulas_liberadas + [lesson_number + 1])
+        if len(aulas_concluidas) == total_aulas:
+            # unlock_next_module
+            next_module = MODULE_ORDER[MODULE_ORDER.index(module) + 1]
+            next_data = store.get_module(user_id, next_module, fields=['aulas_liberadas'], fresh=True)
+            if next_data is None:
+                store.set_module(user_id, next_module, new_module_document(next_module, [1]))
+            elif 1 not in next_data.get('aulas_liberadas', []):
+                store.update_module(user_id, next_module, {
+                    'aulas_liberadas': sorted(next_data.get('aulas_liberadas', []) + [1]),
+                    'ultima_atualizacao': firestore.SERVER_TIMESTAMP
+                })
+
+    store.set_module(user_id, module, {
+        'aulas_concluidas': aulas_concluidas,
+        'aulas_liberadas': aulas_liberadas,
+        'ultima_atualizacao': firestore.SERVER_TIMESTAMP,
+        'total_aulas': total_aulas
+    }, merge=True)
+    return {'aulas_concluidas': aulas_concluidas, 'aulas_liberadas': aulas_liberadas}
+
+
+def transactional_complete_lesson(store, user_id, module, lesson_number):
+    return store.complete_lesson(user_id, module, lesson_number)
+
+
+APPROACHES = {
+    'legacy': legacy_complete_lesson,
+    'transaction': transactional_complete_lesson,
+}
+
+
+def run_concurrently(calls):
+    """Executa as chamadas em threads liberadas juntas; retorna as amostras de latência"""
+    barrier = threading.Barrier(len(calls))
+    samples = [None] * len(calls)
+
+    def worker(index, call):
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            call()
+            success = True
+        except Exception:
+            success = False
+        samples[index] = {'latency': time.perf_counter() - start, 'success': success}
+
+    threads = [threading.Thread(target=worker, args=(index, call)) for index, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def module_path(user_id, module):
+    return ('usuarios', user_id, 'conteudo', module)
+
+
+def scenario_double_click(db, store, complete, user_id, clicks):
+    """Aula 1 concluída por vários cliques simultâneos: deve ficar registrada uma única vez"""
+    db.seed(module_path(user_id, 'sequencial'), new_module_document('sequencial'))
+    samples = run_concurrently([lambda: complete(store, user_id, 'sequencial', 1)] * clicks)
+    data = db.document_data(module_path(user_id, 'sequencial'))
+    ok = data['aulas_concluidas'] == [1] and sorted(data['aulas_liberadas']) == [1, 2]
+    return ok, samples, clicks
+
+
+def scenario_parallel_lessons(db, store, complete, user_id, clicks):
+    """Todas as aulas liberadas e concluídas ao mesmo tempo: nenhuma pode se perder"""
+    lessons = list(range(1, TOTAL_LESSONS + 1))
+    db.seed(module_path(user_id, 'sequencial'), new_module_document('sequencial', lessons))
+    samples = run_concurrently([
+        (lambda lesson=lesson: complete(store, user_id, 'sequencial', lesson)) for lesson in lessons
+    ])
+    data = db.document_data(module_path(user_id, 'sequencial'))
+    next_data = db.document_data(module_path(user_id, MODULE_ORDER[1]))
+    ok = (
+        sorted(data['aulas_concluidas']) == lessons
+        and next_data is not None and 1 in next_data.get('aulas_liberadas', [])
+    )
+    return ok, samples, len(lessons)
+
+
+SCENARIOS = {
+    'double_click': scenario_double_click,
+    'parallel_lessons': scenario_parallel_lessons,
+}
+
+
+def run_scenario(scenario, complete, args):
+    db = MemoryFirestore(latency=args.latency)
+    # Sem cache: cada conclusão lê do Firestore, como em vários processos
+    store = ProgressStore(db, cache_entries=0, transactional=db.transactional)
+    failures = 0
+    completions = 0
+    samples = []
+    started = time.perf_counter()
+    for trial in range(args.trials):
+        ok, trial_samples, calls = scenario(db, store, complete, f'aluno-{trial}', args.clicks)
+        failures += not ok
+        completions += calls
+        samples.extend(trial_samples)
+    elapsed = time.perf_counter() - started
+
+    rpcs = db.stats()
+    documents_read = rpcs.pop('documents_read', 0)
+    return {
+        'lost_updates': failures,
+        'trials': args.trials,
+        'rpcs_per_completion': round(sum(rpcs.values()) / completions, 2),
+        'documents_read_per_completion': round(documents_read / completions, 2),
+        'rpcs': rpcs,
+        'latency': summarize(samples, elapsed),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = {
+        'commit': git_commit(),
+        'config': {'trials': args.trials, 'latency': args.latency, 'clicks': args.clicks},
+        'results': {
+            name: {approach: run_scenario(scenario, complete, args) for approach, complete in APPROACHES.items()}
+            for name, scenario in SCENARIOS.items()
+        }
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
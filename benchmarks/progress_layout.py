@@ -0,0 +1,141 @@
+"""
+Layout do progresso: documentos por módulo x documento compacto
+Cria alunos com progresso aleatório no formato por módulo em um Firestore em
+memória, migra metade com utils/progress_migration.py (período dual) e depois o
+restante, e mede em cada fase os documentos lidos e a latência por carga do
+painel (/api/get-all-progress) e o tamanho armazenado. As respostas do painel
+nos três layouts são comparadas com as do formato por módulo.
+
+Uso (na raiz do projeto):
+    python -m benchmarks.progress_layout --users 500 --latency 0.002
+    python -m benchmarks.progress_layout --output resultado.json
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+
+from benchmarks.executor_bench import summarize, git_commit
+from tests.memory_firestore import MemoryFirestore
+from utils.progress_migration import migrate
+from utils.progress_store import (
+    ProgressStore, MODULE_ORDER, TOTAL_LESSONS, new_module_document, module_access, module_summary
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Layout do progresso: por módulo x compacto')
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='latência simulada de cada chamada ao Firestore (segundos)')
+    parser.add_argument('--page-size', type=int, default=100, help='usuários por página na migração')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', help='arquivo para gravar o JSON (padrão: stdout)')
+    return parser.parse_args(argv)
+
+
+def seed_users(db, users, rng):
+    """Alunos com alguns módulos concluídos e o seguinte em andamento (como a rota grava)"""
+    for index in range(users):
+        user_id = f'aluno-{index:05d}'
+        completed_modules = rng.randint(0, len(MODULE_ORDER))
+        for position, module in enumerate(MODULE_ORDER):
+            document = new_module_document(module)
+            if position < completed_modules:
+                lessons = list(range(1, TOTAL_LESSONS + 1))
+            elif position == completed_modules:
+                lessons = list(range(1, rng.randint(0, TOTAL_LESSONS - 1) + 1))
+            else:
+                lessons = []
+            document['aulas_concluidas'] = lessons
+            if position <= completed_modules:
+                document['aulas_liberadas'] = sorted({1} | set(lessons) | {n + 1 for n in lessons if n < TOTAL_LESSONS})
+            db.seed(('usuarios', user_id, 'conteudo', module), document)
+    return [f'aluno-{index:05d}' for index in range(users)]
+
+
+def dashboard(store, user_id):
+    """Mesmo cálculo da rota /api/get-all-progress"""
+    modules_data = store.get_modules(user_id)
+    return {
+        module: module_summary(
+            module, modules_data[module],
+            module_access(module, modules_data[MODULE_ORDER[index - 1]] if index > 0 else None)[0]
+        )
+        for index, module in enumerate(MODULE_ORDER)
+    }
+
+
+def measure(db, layout, user_ids, expected=None):
+    """Carrega o painel de cada aluno sem cache: documentos lidos, latência e respostas iguais"""
+    store = ProgressStore(db, cache_entries=0, layout=layout)
+    before = db.rpcs['documents_read']
+    samples = []
+    answers = {}
+    started = time.perf_counter()
+    for user_id in user_ids:
+        start = time.perf_counter()
+        answers[user_id] = dashboard(store, user_id)
+        samples.append({'latency': time.perf_counter() - start, 'success': True})
+    elapsed = time.perf_counter() - started
+
+    result = {
+        'documents_read_per_dashboard': round((db.rpcs['documents_read'] - before) / len(user_ids), 2),
+        'legacy_fallbacks': store.stats()['legacy_fallbacks'],
+        'latency': summarize(samples, elapsed),
+    }
+    if expected is not None:
+        result['same_answers'] = sum(answers[user_id] == expected[user_id] for user_id in user_ids)
+    return result, answers
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = MemoryFirestore()
+    user_ids = seed_users(db, args.users, random.Random(args.seed))
+    db.latency = args.latency
+
+    results = {}
+    results['modules'], expected = measure(db, 'modules', user_ids)
+
+    # Metade migrada: o layout dual lê o compacto de uns e os documentos por módulo dos outros
+    half = migrate(db, page_size=args.page_size, start_after=user_ids[args.users // 2 - 1])
+    results['dual_half_migrated'], _ = measure(db, 'dual', user_ids, expected)
+
+    rest = migrate(db, page_size=args.page_size)
+    results['compact'], _ = measure(db, 'compact', user_ids, expected)
+    verify = migrate(db, page_size=args.page_size, verify=True)
+
+    report = {
+        'commit': git_commit(),
+        'config': {'users': args.users, 'latency': args.latency, 'page_size': args.page_size, 'seed': args.seed},
+        'results': results,
+        'migration': {
+            'first_run_migrated': half['migrated'],
+            'second_run_migrated': rest['migrated'],
+            'second_run_already_migrated': rest['already_migrated'],
+            'mismatches': verify['mismatches'],
+            'unlocked_differences': verify['unlocked_differences'],
+        },
+        'storage': {
+            'legacy_documents': rest['legacy_documents'],
+            'compact_documents': rest['migrated'] + rest['already_migrated'],
+            'legacy_bytes': rest['legacy_bytes'],
+            'compact_bytes': rest['compact_bytes'],
+            'ratio': round(rest['legacy_bytes'] / rest['compact_bytes'], 2) if rest['compact_bytes'] else None,
+        },
+    }
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,6 +1,7 @@
-from flask import Blueprint, request, jsonify
-from firebase_admin import auth, firestore
+from flask import Blueprint, request, jsonify, Response, stream_with_context
+from firebase_admin import auth
 import logging
+import json
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
@@ -12,6 +13,10 @@ def set_firestore_client(firestore_client):
     global db
     db = firestore_client
 
+def _sse(event, payload):
+    """Formata um evento Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
 def verify_token_with_tolerance(token, max_retries=3):
     """Verifica token Firebase com tolerância para clock skew"""
     for attempt in range(max_retries):
@@ -88,6 +93,7 @@ def execute_code():
         
         code = data['code']
         inputs = data.get('inputs', None)  # Lista de valores de entrada
+        profile = bool(data.get('profile', False))  # Inclui o perfil da execução
         
         # Valida sintaxe primeiro
         validation = executor.validate_code(code)
@@ -99,7 +105,7 @@ def execute_code():
             })
         
         # Executa o código
-        result = executor.execute_python_code(code, inputs)
+        result = executor.execute_python_code(code, inputs, profile=profile)
         return jsonify(result)
         
     except Exception as e:
@@ -110,6 +116,193 @@ def execute_code():
             "error": "Erro interno do servidor"
         }), 500
 
+@api_bp.route("/execute-stream", methods=["POST"])
+def execute_code_stream():
+    """
+    API para execução de código Python com saída em tempo real (Server-Sent Events)
+    Envia eventos 'output' com trechos da saída e um evento 'result' no final,
+    com os mesmos campos retornados por /api/execute
+    """
+    from utils.executor import executor
+    
+    data = request.get_json()
+    if not data or 'code' not in data:
+        return jsonify({"error": "Código não fornecido"}), 400
+    
+    code = data['code']
+    inputs = data.get('inputs', None)
+    
+    def generate():
+        # Ao desconectar, o Flask fecha o gerador e o worker é encerrado
+        try:
+            for event, payload in executor.execute_stream(code, inputs):
+                yield _sse(event, payload)
+        except Exception as e:
+            logging.error(f"Erro na execução em streaming: {e}")
+            yield _sse('result', {
+                "success": False,
+                "output": "",
+                "error": "Erro interno do servidor"
+            })
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api_bp.route("/preflight", methods=["POST"])
+def preflight_code():
+    """
+    Análise estática do código, sem executá-lo (sintaxe e entradas necessárias)
+    O editor consulta enquanto o aluno digita: ao clicar em Executar, o modal de
+    entradas abre direto, sem uma execução só para descobrir os inputs
+    """
+    try:
+        from utils.executor import executor
+        
+        data = request.get_json()
+        if not data or 'code' not in data:
+            return jsonify({"error": "Código não fornecido"}), 400
+        
+        analysis = executor.preflight(data['code'])
+        return jsonify({
+            "valid": analysis['valid'],
+            "error": analysis['error'],
+            "input_count": analysis['input_count'],
+            "input_prompts": analysis['input_prompts'],
+            "input_unbounded": analysis['input_unbounded']
+        })
+        
+    except Exception as e:
+        logging.error(f"Erro no preflight: {e}")
+        return jsonify({"error": "Erro interno do servidor"}), 500
+
+@api_bp.route("/execute-batch", methods=["POST"])
+def execute_batch():
+    """API para executar um código com vários conjuntos de entrada"""
+    try:
+        from utils.executor import executor
+        import time
+        
+        data = request.get_json()
+        if not data or 'code' not in data or not isinstance(data.get('cases'), list):
+            return jsonify({"error": "É necessário enviar 'code' e a lista 'cases'"}), 400
+        
+        code = data['code']
+        cases = data['cases']  # Lista de listas de valores de entrada
+        
+        if len(cases) > executor.max_batch_cases:
+            return jsonify({
+                "error": f"Máximo de {executor.max_batch_cases} casos por requisição"
+            }), 400
+        
+        if not all(isinstance(case, list) for case in cases):
+            return jsonify({"error": "Cada caso deve ser uma lista de valores de entrada"}), 400
+        
+        # Valida sintaxe uma única vez para todos os casos
+        validation = executor.validate_code(code)
+        if not validation['valid']:
+            return jsonify({
+                "success": False,
+                "results": [],
+                "error": validation['error']
+            })
+        
+        started = time.perf_counter()
+        results = executor.execute_batch(code, cases)
+        
+        return jsonify({
+            "success": True,
+            "results": results,
+            "total_seconds": round(time.perf_counter() - started, 4)
+        })
+        
+    except Exception as e:
+        logging.error(f"Erro na execução em lote: {e}")
+        return jsonify({
+            "success": False,
+            "results": [],
+            "error": "Erro interno do servidor"
+        }), 500
+
+@api_bp.route("/executor-stats", methods=["GET"])
+def executor_stats():
+    """Estatísticas do pool de execução (ocupados, ociosos, encerrados)"""
+    try:
+        from utils.executor import executor
+        return jsonify({"success": True, "stats": executor.get_stats()})
+    except Exception as e:
+        logging.error(f"Erro ao obter estatísticas do executor: {e}")
+        return jsonify({"success": False, "error": "Erro interno do servidor"}), 500
+
+@api_bp.route("/correction-stats", methods=["GET"])
+def correction_stats():
+    """Estatísticas do cache de correções, das chamadas à OpenAI e do circuito"""
+    try:
+        from utils.ai_corrector import corrector
+        return jsonify({
+            "success": True,
+            "stats": corrector.cache.stats(),
+            "openai": corrector.client.stats() if corrector.client else None,
+            "corrector": corrector.stats()
+        })
+    except Exception as e:
+        logging.error(f"Erro ao obter estatísticas de correção: {e}")
+        return jsonify({"success": False, "error": "Erro interno do servidor"}), 500
+
+def _parse_correction_request(data, executor, registry):
+    """
+    Valida o corpo de /api/correct e /api/correct-stream
+    Retorna: (dict com code, module, lesson_number e exercise_description, None)
+             ou (None, (resposta de erro, status))
+    """
+    if not data or 'code' not in data:
+        logging.warning("Dados incompletos na requisição")
+        return None, (jsonify({
+            "success": False,
+            "error": "Dados incompletos. É necessário enviar 'code', 'module' e 'lesson'."
+        }), 400)
+    
+    code = data['code']
+    module = data.get('module')
+    try:
+        lesson_number = int(data.get('lesson', data.get('lesson_number', 1)))
+    except (TypeError, ValueError):
+        return None, (jsonify({"success": False, "error": "Número da aula inválido"}), 400)
+    
+    # Descrição vem do registro montado a partir dos templates;
+    # 'exercise_description' só é aceito para exercícios fora do registro
+    exercise = registry.get(module, lesson_number) if module else None
+    exercise_description = exercise['description'] if exercise else data.get('exercise_description')
+    if not exercise_description:
+        logging.warning(f"Exercício não encontrado: {module}/{lesson_number}")
+        return None, (jsonify({
+            "success": False,
+            "error": "Exercício não encontrado",
+            "details": f"Nenhum exercício registrado para {module}/aula{lesson_number}"
+        }), 404)
+    
+    logging.info(f"Validando código da aula {lesson_number}")
+    
+    # Valida sintaxe primeiro
+    validation = executor.validate_code(code)
+    if not validation['valid']:
+        logging.warning(f"Código com erro de sintaxe: {validation['error']}")
+        return None, (jsonify({
+            "success": False,
+            "error": "Erro de sintaxe no código",
+            "details": validation['error']
+        }), 400)
+    
+    return {
+        "code": code,
+        "module": module,
+        "lesson_number": lesson_number,
+        "exercise_description": exercise_description,
+        "exercise_id": f"{module}/{lesson_number}" if module else None
+    }, None
+
 @api_bp.route("/correct", methods=["POST"])
 def correct_exercise():
     """API para correção automática de exercícios"""
@@ -118,6 +311,8 @@ def correct_exercise():
         try:
             from utils.executor import executor
             from utils.ai_corrector import corrector
+            from utils.example_grader import grader
+            from utils.exercise_registry import registry
         except ImportError as ie:
             logging.error(f"Erro ao importar módulos: {ie}")
             return jsonify({
@@ -126,37 +321,25 @@ def correct_exercise():
                 "details": str(ie)
             }), 500
         
-        # Obtém dados da requisição
-        data = request.get_json()
-        logging.info(f"Dados recebidos: {data}")
-        
-        if not data or 'code' not in data or 'exercise_description' not in data:
-            logging.warning("Dados incompletos na requisição")
-            return jsonify({
-                "success": False,
-                "error": "Dados incompletos. É necessário enviar 'code' e 'exercise_description'."
-            }), 400
-        
-        code = data['code']
-        exercise_description = data['exercise_description']
-        lesson_number = data.get('lesson_number', 1)
-        
-        logging.info(f"Validando código da aula {lesson_number}")
-        
-        # Valida sintaxe primeiro
-        validation = executor.validate_code(code)
-        if not validation['valid']:
-            logging.warning(f"Código com erro de sintaxe: {validation['error']}")
-            return jsonify({
-                "success": False,
-                "error": "Erro de sintaxe no código",
-                "details": validation['error']
-            }), 400
+        params, error = _parse_correction_request(request.get_json(), executor, registry)
+        if error:
+            return error
+        code = params['code']
+        module = params['module']
+        lesson_number = params['lesson_number']
         
         logging.info("Código validado com sucesso. Executando correção...")
         
-        # Executa a correção com IA
-        correction_result = corrector.correct_exercise(code, exercise_description, lesson_number)
+        # Aulas com exemplos de entrada/saída: correção determinística, sem IA
+        correction_result = None
+        if module and grader.has_suite(module, lesson_number):
+            correction_result = grader.grade(code, module, lesson_number, executor)
+        
+        # Demais aulas: correção com IA
+        if correction_result is None:
+            correction_result = corrector.correct_exercise(
+                code, params['exercise_description'], lesson_number, params['exercise_id']
+            )
         
         logging.info(f"Correção concluída: {correction_result.get('correct', 'N/A')}")
         
@@ -176,112 +359,53 @@ def correct_exercise():
             "details": str(e)
         }), 500
 
-@api_bp.route("/get-all-progress/<user_id>", methods=["GET"])
-def get_all_progress(user_id):
-    """Obtém progresso de todos os módulos do usuário"""
+@api_bp.route("/correct-stream", methods=["POST"])
+def correct_exercise_stream():
+    """
+    Correção automática com o feedback da IA em tempo real (Server-Sent Events)
+    Envia 'verdict' (correct e score) assim que a IA os decide, 'feedback' com
+    trechos do texto e um evento 'result' no final com a mesma correção
+    retornada por /api/correct. Aulas corrigidas pelos exemplos enviam só o 'result'.
+    """
     try:
-        if not db:
-            return jsonify({"error": "Banco de dados não configurado"}), 500
-        
-        modules = ['sequencial', 'comparativa', 'repetitiva', 'vetores', 'matrizes']
-        module_data = {}
-        global_stats = {
-            'total_completed': 0,
-            'total_lessons': 50,  # 10 aulas por módulo × 5 módulos
-            'progress_percentage': 0
-        }
-        
-        for module in modules:
-            try:
-                # Busca progresso do módulo
-                doc_ref = db.collection('usuarios').document(user_id).collection('conteudo').document(module)
-                doc = doc_ref.get()
-                
-                if doc.exists:
-                    data = doc.to_dict()
-                    aulas_concluidas = data.get('aulas_concluidas', [])
-                    aulas_liberadas = data.get('aulas_liberadas', [1] if module == 'sequencial' else [])
-                    
-                    total_completed = len(aulas_concluidas)
-                    progress_percentage = (total_completed / 10) * 100
-                    
-                    module_data[module] = {
-                        'total_completed': total_completed,
-                        'total_lessons': 10,
-                        'progress_percentage': progress_percentage,
-                        'aulas_concluidas': aulas_concluidas,
-                        'aulas_liberadas': aulas_liberadas
-                    }
-                    
-                    global_stats['total_completed'] += total_completed
-                    
-                else:
-                    # Módulo não existe, cria com dados padrão
-                    aulas_liberadas = [1] if module == 'sequencial' else []
-                    module_data[module] = {
-                        'total_completed': 0,
-                        'total_lessons': 10,
-                        'progress_percentage': 0,
-                        'aulas_concluidas': [],
-                        'aulas_liberadas': aulas_liberadas
-                    }
-                    
-                    # Inicializa o documento no Firestore
-                    doc_ref.set({
-                        'aulas_concluidas': [],
-                        'aulas_liberadas': aulas_liberadas,
-                        'ultimo_acesso': firestore.SERVER_TIMESTAMP
-                    })
-                    
-            except Exception as e:
-                logging.error(f"Erro ao carregar progresso do módulo {module}: {e}")
-                # Em caso de erro, retorna dados padrão
-                module_data[module] = {
-                    'total_completed': 0,
-                    'total_lessons': 10,
-                    'progress_percentage': 0,
-                    'aulas_concluidas': [],
-                    'aulas_liberadas': [1] if module == 'sequencial' else []
-                }
-        
-        # Calcula estatísticas globais
-        global_stats['progress_percentage'] = (global_stats['total_completed'] / global_stats['total_lessons']) * 100
-        
+        from utils.executor import executor
+        from utils.ai_corrector import corrector
+        from utils.example_grader import grader
+        from utils.exercise_registry import registry
+    except ImportError as ie:
+        logging.error(f"Erro ao importar módulos: {ie}")
         return jsonify({
-            "success": True,
-            "modules": module_data,
-            "global_stats": global_stats
-        })
-        
-    except Exception as e:
-        logging.error(f"Erro ao obter progresso global: {e}")
-        return jsonify({"error": f"Erro interno: {str(e)}"}), 500
-
-@api_bp.route("/init-user-progress/<user_id>", methods=["POST"])
-def init_user_progress(user_id):
-    """Inicializa progresso do usuário para todos os módulos"""
-    try:
-        if not db:
-            return jsonify({"error": "Banco de dados não configurado"}), 500
-        
-        modules = ['sequencial', 'comparativa', 'repetitiva', 'vetores', 'matrizes']
-        
-        for module in modules:
-            doc_ref = db.collection('usuarios').document(user_id).collection('conteudo').document(module)
-            doc = doc_ref.get()
+            "success": False,
+            "error": "Erro ao carregar módulos de correção",
+            "details": str(ie)
+        }), 500
+    
+    params, error = _parse_correction_request(request.get_json(), executor, registry)
+    if error:
+        return error
+    code = params['code']
+    module = params['module']
+    lesson_number = params['lesson_number']
+    
+    def generate():
+        # Ao desconectar, o Flask fecha o gerador e a chamada à IA é cancelada
+        try:
+            if module and grader.has_suite(module, lesson_number):
+                graded = grader.grade(code, module, lesson_number, executor)
+                if graded is not None:
+                    yield _sse('result', graded)
+                    return
             
-            if not doc.exists:
-                # Só o módulo sequencial começa com aula 1 liberada
-                aulas_liberadas = [1] if module == 'sequencial' else []
-                
-                doc_ref.set({
-                    'aulas_concluidas': [],
-                    'aulas_liberadas': aulas_liberadas,
-                    'ultimo_acesso': firestore.SERVER_TIMESTAMP
-                })
-        
-        return jsonify({"success": True, "message": "Progresso inicializado"})
-        
-    except Exception as e:
-        logging.error(f"Erro ao inicializar progresso: {e}")
-        return jsonify({"error": f"Erro interno: {str(e)}"}), 500
\ No newline at end of file
+            for event, payload in corrector.correct_exercise_stream(
+                code, params['exercise_description'], lesson_number, params['exercise_id']
+            ):
+                yield _sse(event, payload)
+        except Exception as e:
+            logging.error(f"Erro na correção em streaming: {e}")
+            yield _sse('result', corrector._fallback_response(code))
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
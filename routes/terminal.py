@@ -0,0 +1,117 @@
+"""
+Terminal interativo via WebSocket (Flask-SocketIO)
+
+Conexão: o cliente pode enviar {token, last_seq} no auth (ou na query string)
+para retomar uma sessão após queda da conexão; a saída com seq > last_seq é
+reenviada e um input() pendente é pedido de novo.
+
+Eventos recebidos do cliente:
+    execute {code}   coloca a execução na fila da sessão
+    input {data}     responde a um input() pendente
+    cancel           cancela a execução (na fila ou em andamento)
+
+Eventos enviados ao cliente:
+    connected {session_id}, session_resumed {session_id, state, truncated},
+    execution_queued {position}, execution_started, output {data, seq},
+    request_input {prompt}, execution_complete {success, output, error},
+    session_expired {message}
+"""
+
+from flask import Blueprint, request, jsonify
+import logging
+
+terminal_bp = Blueprint('terminal', __name__, url_prefix='/api')
+
+# Gerenciador de sessões (será injetado pelo app principal)
+manager = None
+
+
+def init_terminal(socketio, session_manager):
+    """Registra os eventos do terminal no servidor Socket.IO"""
+    global manager
+    manager = session_manager
+
+    from flask_socketio import emit, join_room, leave_room
+    from utils.executor import executor
+
+    def open_session():
+        token = manager.open_session(request.sid)
+        join_room(token)
+        emit('connected', {'session_id': token})
+        return token
+
+    @socketio.on('connect')
+    def handle_connect(auth=None):
+        auth = auth if isinstance(auth, dict) else {}
+        token = auth.get('token') or request.args.get('token')
+        try:
+            last_seq = int(auth.get('last_seq') or request.args.get('last_seq') or 0)
+        except (TypeError, ValueError):
+            last_seq = 0
+
+        if token:
+            # Entra na sala antes do replay: frames repetidos são descartados pelo seq
+            join_room(token)
+            resumed = manager.resume_session(token, request.sid, last_seq)
+            if resumed is not None:
+                emit('session_resumed', {
+                    'session_id': token,
+                    'state': resumed['state'],
+                    'truncated': resumed['truncated']
+                })
+                for frame in resumed['replay']:
+                    emit('output', frame)
+                if resumed['pending_prompt'] is not None:
+                    emit('request_input', {'prompt': resumed['pending_prompt']})
+                return
+            leave_room(token)
+
+        open_session()
+
+    @socketio.on('disconnect')
+    def handle_disconnect():
+        # A sessão continua viva por alguns instantes esperando a reconexão
+        manager.detach(request.sid)
+
+    @socketio.on('execute')
+    def handle_execute(data):
+        code = (data or {}).get('code')
+        if not code:
+            emit('execution_complete', {"success": False, "output": "", "error": "Código não fornecido"})
+            return
+
+        # Mesma validação da execução não interativa (sintaxe e imports proibidos)
+        validation = executor.validate_code(code)
+        if not validation['valid']:
+            emit('execution_complete', {"success": False, "output": "", "error": validation['error']})
+            return
+
+        # Sessão removida por inatividade: abre outra para esta conexão
+        token = manager.token_for(request.sid) or open_session()
+        status = manager.submit(token, code)
+        if status['queued']:
+            emit('execution_queued', {'position': status['position']})
+        else:
+            emit('execution_complete', {"success": False, "output": "", "error": status['error']})
+
+    @socketio.on('input')
+    def handle_input(data):
+        token = manager.token_for(request.sid)
+        if token:
+            manager.provide_input(token, (data or {}).get('data', ''))
+
+    @socketio.on('cancel')
+    def handle_cancel(data=None):
+        token = manager.token_for(request.sid)
+        if token:
+            manager.cancel(token)
+
+    logging.info("🖥️ Eventos do terminal interativo registrados")
+
+
+@terminal_bp.route("/terminal-stats", methods=["GET"])
+def terminal_stats():
+    """Estatísticas das sessões do terminal interativo"""
+    if manager is None:
+        return jsonify({"success": False, "error": "Terminal interativo desabilitado"}), 503
+    return jsonify({"success": True, "stats": manager.stats()})
@@ -0,0 +1,82 @@
+"""
+Cliente de chat falso para os testes (sem rede e sem o pacote openai)
+FakeCompletions imita client.chat.completions com latência configurável e falhas
+programadas; FakeChatClient é o AsyncChatClient real usando esse backend.
+"""
+
+import json
+import asyncio
+from types import SimpleNamespace
+
+from utils.openai_pool import AsyncChatClient
+
+CORRECTION = {
+    'correct': True,
+    'score': 95,
+    'feedback': 'Muito bem! O programa lê as entradas e exibe a saída pedida.',
+    'suggestions': ['Continue praticando'],
+}
+
+
+class FakeCompletions:
+    """chat.completions: responde após delay; stream em trechos a cada chunk_delay"""
+
+    def __init__(self, reply=None, delay=0.0, chunk_delay=0.0, failures=()):
+        self.reply = reply if reply is not None else json.dumps(CORRECTION)
+        self.delay = delay
+        self.chunk_delay = chunk_delay
+        self.failures = list(failures)
+        self.calls = 0
+        self.active = 0
+        self.peak_active = 0
+
+    async def create(self, stream=False, **request):
+        self.calls += 1
+        if self.failures:
+            raise self.failures.pop(0)
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if stream:
+            return FakeStream(self.reply, self.chunk_delay)
+        message = SimpleNamespace(content=self.reply)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeStream:
+    def __init__(self, text, chunk_delay, size=16):
+        self.parts = [text[i:i + size] for i in range(0, len(text), size)]
+        self.chunk_delay = chunk_delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for index, part in enumerate(self.parts):
+            if index:
+                await asyncio.sleep(self.chunk_delay)
+            delta = SimpleNamespace(content=part)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeChatClient(AsyncChatClient):
+    """AsyncChatClient com o backend falso; ConnectionError conta como erro temporário"""
+
+    def __init__(self, completions, **kwargs):
+        kwargs.setdefault('backoff', 0.01)
+        super().__init__(api_key='teste', **kwargs)
+        self.completions = completions
+
+    async def _create_client(self):
+        return SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+
+    @staticmethod
+    def _is_retryable(error):
+        return isinstance(error, ConnectionError)
@@ -0,0 +1,647 @@
+"""
+Soluções típicas das 50 aulas (uma por aula), usadas pelos testes da correção local
+"""
+
+SOLUTIONS = {}
+SOLUTIONS['sequencial/1'] = '''print("Olá, mundo!")
+print("Meu nome é Ana e tenho 20 anos")
+print("Estou aprendendo Python")
+'''
+SOLUTIONS['sequencial/2'] = '''largura = float(input("Digite a largura do terreno: "))
+comprimento = float(input("Digite o comprimento do terreno: "))
+valor = float(input("Digite o valor do metro quadrado: "))
+area = largura * comprimento
+preco = area * valor
+print(f"Area do terreno = {area:.2f}")
+print(f"Preco do terreno = {preco:.2f}")
+'''
+SOLUTIONS['sequencial/3'] = '''import math
+base = float(input("Base do retangulo: "))
+altura = float(input("Altura do retangulo: "))
+area = base * altura
+perimetro = 2 * (base + altura)
+diagonal = math.sqrt(base ** 2 + altura ** 2)
+print(f"AREA = {area:.4f}")
+print(f"PERIMETRO = {perimetro:.4f}")
+print(f"DIAGONAL = {diagonal:.4f}")
+'''
+SOLUTIONS['sequencial/4'] = '''print("Dados da primeira pessoa:")
+nome1 = input("Nome: ")
+idade1 = int(input("Idade: "))
+print("Dados da segunda pessoa:")
+nome2 = input("Nome: ")
+idade2 = int(input("Idade: "))
+media = (idade1 + idade2) / 2
+print(f"A idade média de {nome1} e {nome2} é de {media:.1f} anos")
+'''
+SOLUTIONS['sequencial/5'] = '''x = int(input("Digite o valor de X: "))
+y = int(input("Digite o valor de Y: "))
+soma = x + y
+print(f"SOMA = {soma}")
+'''
+SOLUTIONS['sequencial/6'] = '''preco = float(input("Preço unitário do produto: "))
+quantidade = int(input("Quantidade comprada: "))
+dinheiro = float(input("Dinheiro recebido: "))
+troco = dinheiro - preco * quantidade
+print(f"TROCO = {troco:.2f}")
+'''
+SOLUTIONS['sequencial/7'] = '''import math
+raio = float(input("Digite o valor do raio do circulo: "))
+area = math.pi * raio ** 2
+print(f"AREA = {area:.3f}")
+'''
+SOLUTIONS['sequencial/8'] = '''nome = input("Nome: ")
+valor_hora = float(input("Valor por hora: "))
+horas = int(input("Horas trabalhadas: "))
+pagamento = valor_hora * horas
+print(f"O pagamento para {nome} deve ser {pagamento:.2f}")
+'''
+SOLUTIONS['sequencial/9'] = '''distancia = int(input("Distancia percorrida: "))
+combustivel = float(input("Combustível gasto: "))
+consumo = distancia / combustivel
+print(f"Consumo medio = {consumo:.3f}")
+'''
+SOLUTIONS['sequencial/10'] = '''a = float(input("Digite a medida A: "))
+b = float(input("Digite a medida B: "))
+c = float(input("Digite a medida C: "))
+quadrado = a * a
+triangulo = a * b / 2
+trapezio = (a + b) * c / 2
+print(f"AREA DO QUADRADO = {quadrado:.4f}")
+print(f"AREA DO TRIANGULO = {triangulo:.4f}")
+print(f"AREA DO TRAPEZIO = {trapezio:.4f}")
+'''
+SOLUTIONS['comparativa/1'] = '''import math
+a = float(input("Coeficiente a: "))
+b = float(input("Coeficiente b: "))
+c = float(input("Coeficiente c: "))
+delta = b ** 2 - 4 * a * c
+if a == 0:
+    print("Esta equacao nao e do segundo grau")
+elif delta < 0:
+    print("Esta equacao nao possui raizes reais")
+else:
+    x1 = (-b + math.sqrt(delta)) / (2 * a)
+    x2 = (-b - math.sqrt(delta)) / (2 * a)
+    print(f"X1 = {x1:.5f}")
+    print(f"X2 = {x2:.5f}")
+'''
+SOLUTIONS['comparativa/2'] = '''a = int(input("Primeiro valor: "))
+b = int(input("Segundo valor: "))
+c = int(input("Terceiro valor: "))
+if a < b and a < c:
+    menor = a
+elif b < c:
+    menor = b
+else:
+    menor = c
+print(f"MENOR = {menor}")
+'''
+SOLUTIONS['comparativa/3'] = '''minutos = int(input("Digite a quantidade de minutos: "))
+if minutos <= 100:
+    conta = 50.0
+else:
+    conta = 50.0 + (minutos - 100) * 2.0
+print(f"Valor a pagar: R$ {conta:.2f}")
+'''
+SOLUTIONS['comparativa/4'] = '''escala = input("Voce vai digitar a temperatura em qual escala (C/F)? ")
+if escala == "F":
+    f = float(input("Digite a temperatura em Fahrenheit: "))
+    c = (f - 32) * 5 / 9
+    print(f"Temperatura equivalente em Celsius: {c:.2f}")
+else:
+    c = float(input("Digite a temperatura em Celsius: "))
+    f = 9 * c / 5 + 32
+    print(f"Temperatura equivalente em Fahrenheit: {f:.2f}")
+'''
+SOLUTIONS['comparativa/5'] = '''n = int(input("Serao digitados dados de quantos produtos? "))
+abaixo = entre = acima = 0
+total_compra = 0.0
+total_venda = 0.0
+for i in range(n):
+    print(f"Produto {i + 1}:")
+    nome = input("Nome: ")
+    compra = float(input("Preco de compra: "))
+    venda = float(input("Preco de venda: "))
+    lucro = (venda - compra) / compra * 100
+    if lucro < 10:
+        abaixo += 1
+    elif lucro <= 20:
+        entre += 1
+    else:
+        acima += 1
+    total_compra += compra
+    total_venda += venda
+print()
+print("RELATORIO:")
+print(f"Lucro abaixo de 10%: {abaixo}")
+print(f"Lucro entre 10% e 20%: {entre}")
+print(f"Lucro acima de 20%: {acima}")
+print(f"Valor total de compra: {total_compra:.2f}")
+print(f"Valor total de venda: {total_venda:.2f}")
+print(f"Lucro total: {total_venda - total_compra:.2f}")
+'''
+SOLUTIONS['comparativa/6'] = '''codigo = int(input("Codigo do produto: "))
+quantidade = int(input("Quantidade: "))
+if codigo == 1:
+    preco = 5.00
+elif codigo == 2:
+    preco = 3.50
+elif codigo == 3:
+    preco = 4.80
+elif codigo == 4:
+    preco = 8.90
+else:
+    preco = 7.32
+total = preco * quantidade
+print(f"Valor a pagar: R$ {total:.2f}")
+'''
+SOLUTIONS['comparativa/7'] = '''print("Digite dois numeros inteiros:")
+a = int(input())
+b = int(input())
+if a % b == 0 or b % a == 0:
+    print("Sao multiplos")
+else:
+    print("Nao sao multiplos")
+'''
+SOLUTIONS['comparativa/8'] = '''x = float(input("Valor de X: "))
+y = float(input("Valor de Y: "))
+if x == 0 and y == 0:
+    print("Origem")
+elif y == 0:
+    print("Eixo X")
+elif x == 0:
+    print("Eixo Y")
+elif x > 0 and y > 0:
+    print("Q1")
+elif x < 0 and y > 0:
+    print("Q2")
+elif x < 0:
+    print("Q3")
+else:
+    print("Q4")
+'''
+SOLUTIONS['comparativa/9'] = '''salario = float(input("Digite o salario da pessoa: "))
+if salario <= 1000.0:
+    porcentagem = 20
+elif salario <= 3000.0:
+    porcentagem = 15
+elif salario <= 8000.0:
+    porcentagem = 10
+else:
+    porcentagem = 5
+aumento = salario * porcentagem / 100
+novo = salario + aumento
+print(f"Novo salario = R$ {novo:.2f}")
+print(f"Aumento = R$ {aumento:.2f}")
+print(f"Porcentagem = {porcentagem} %")
+'''
+SOLUTIONS['comparativa/10'] = '''preco = float(input("Preco unitario do produto: "))
+quantidade = int(input("Quantidade comprada: "))
+dinheiro = float(input("Dinheiro recebido: "))
+total = preco * quantidade
+if dinheiro >= total:
+    print(f"TROCO = {dinheiro - total:.2f}")
+else:
+    print(f"DINHEIRO INSUFICIENTE. FALTAM {total - dinheiro:.2f} REAIS")
+'''
+SOLUTIONS['repetitiva/1'] = '''nota1 = float(input("Digite a primeira nota: "))
+while nota1 < 0 or nota1 > 10:
+    nota1 = float(input("Valor invalido! Tente novamente: "))
+nota2 = float(input("Digite a segunda nota: "))
+while nota2 < 0 or nota2 > 10:
+    nota2 = float(input("Valor invalido! Tente novamente: "))
+media = (nota1 + nota2) / 2
+print(f"MEDIA = {media:.2f}")
+'''
+SOLUTIONS['repetitiva/2'] = '''print("Digite os valores das coordenadas X e Y:")
+x = int(input())
+y = int(input())
+while x != 0 and y != 0:
+    if x > 0 and y > 0:
+        print("primeiro quadrante")
+    elif x < 0 and y > 0:
+        print("segundo quadrante")
+    elif x < 0 and y < 0:
+        print("terceiro quadrante")
+    else:
+        print("quarto quadrante")
+    x = int(input())
+    y = int(input())
+'''
+SOLUTIONS['repetitiva/3'] = '''senha = int(input("Digite a senha: "))
+while senha != 2002:
+    senha = int(input("Senha Invalida! Tente novamente: "))
+print("Acesso Permitido")
+'''
+SOLUTIONS['repetitiva/4'] = '''print("Digite as idades:")
+idade = int(input())
+soma = 0
+quantidade = 0
+while idade >= 0:
+    soma += idade
+    quantidade += 1
+    idade = int(input())
+if quantidade == 0:
+    print("IMPOSSIVEL CALCULAR")
+else:
+    print(f"MEDIA = {soma / quantidade:.2f}")
+'''
+SOLUTIONS['repetitiva/5'] = '''print("Digite um numero (0 para sair):")
+x = int(input())
+while x != 0:
+    if x % 2 != 0:
+        x = x + 1
+    soma = 0
+    for i in range(5):
+        soma += x + 2 * i
+    print(soma)
+    x = int(input())
+'''
+SOLUTIONS['repetitiva/6'] = '''n = int(input("Quantos numeros voce vai digitar? "))
+for i in range(n):
+    x = int(input("Digite um numero: "))
+    if x == 0:
+        print("NULO")
+    else:
+        tipo = "PAR" if x % 2 == 0 else "IMPAR"
+        sinal = "POSITIVO" if x > 0 else "NEGATIVO"
+        print(f"{tipo} {sinal}")
+'''
+SOLUTIONS['repetitiva/7'] = '''n = int(input("Quantos casos de teste serao digitados? "))
+coelhos = ratos = sapos = 0
+for i in range(n):
+    quantidade = int(input("Quantidade de cobaias: "))
+    tipo = input("Tipo de cobaia: ")
+    if tipo == "C":
+        coelhos += quantidade
+    elif tipo == "R":
+        ratos += quantidade
+    else:
+        sapos += quantidade
+total = coelhos + ratos + sapos
+print()
+print(f"Total: {total} cobaias")
+print(f"Total de coelhos: {coelhos}")
+print(f"Total de ratos: {ratos}")
+print(f"Total de sapos: {sapos}")
+print(f"Percentual de coelhos: {coelhos * 100 / total:.2f} %")
+print(f"Percentual de ratos: {ratos * 100 / total:.2f} %")
+print(f"Percentual de sapos: {sapos * 100 / total:.2f} %")
+'''
+SOLUTIONS['repetitiva/8'] = '''n = int(input("Digite o valor de N: "))
+for i in range(n):
+    x = int(input("Digite o valor de X: "))
+    for j in range(x):
+        print(2 * j + 1)
+    print()
+'''
+SOLUTIONS['repetitiva/9'] = '''n = int(input("Deseja a tabuada para qual valor? "))
+for i in range(1, 11):
+    print(f"{n} x {i} = {n * i}")
+'''
+SOLUTIONS['repetitiva/10'] = '''n = int(input("Quantos casos voce vai digitar? "))
+for i in range(n):
+    numerador = int(input("Entre com o numerador: "))
+    denominador = int(input("Entre com o denominador: "))
+    if denominador == 0:
+        print("DIVISAO IMPOSSIVEL")
+    else:
+        print(f"DIVISAO = {numerador / denominador:.1f}")
+    print()
+'''
+SOLUTIONS['vetores/1'] = '''n = int(input("Quantos numeros voce vai digitar? "))
+vetor = []
+for i in range(n):
+    vetor.append(int(input("Digite um numero: ")))
+print()
+print("NUMEROS NEGATIVOS:")
+for x in vetor:
+    if x < 0:
+        print(x)
+'''
+SOLUTIONS['vetores/2'] = '''n = int(input("Quantos numeros voce vai digitar? "))
+vetor = []
+for i in range(n):
+    vetor.append(float(input("Digite um numero: ")))
+soma = sum(vetor)
+media = soma / n
+print()
+print("VALORES = " + " ".join(str(x) for x in vetor))
+print(f"SOMA = {soma:.2f}")
+print(f"MEDIA = {media:.2f}")
+'''
+SOLUTIONS['vetores/3'] = '''n = int(input("Quantas pessoas serao digitadas? "))
+nomes = []
+idades = []
+alturas = []
+for i in range(n):
+    print(f"Dados da {i + 1}a pessoa:")
+    nomes.append(input("Nome: "))
+    idades.append(int(input("Idade: ")))
+    alturas.append(float(input("Altura: ")))
+media = sum(alturas) / n
+menores = 0
+for idade in idades:
+    if idade < 16:
+        menores += 1
+print()
+print(f"Altura media: {media:.2f}")
+print(f"Pessoas com menos de 16 anos: {menores * 100 / n:.1f}%")
+for i in range(n):
+    if idades[i] < 16:
+        print(nomes[i])
+'''
+SOLUTIONS['vetores/4'] = '''n = int(input("Quantos numeros voce vai digitar? "))
+vetor = []
+for i in range(n):
+    vetor.append(int(input("Digite um numero: ")))
+pares = 0
+print()
+for x in vetor:
+    if x % 2 == 0:
+        pares += 1
+if pares == 0:
+    print("NENHUM NUMERO PAR")
+else:
+    print("NUMEROS PARES:")
+    for x in vetor:
+        if x % 2 == 0:
+            print(x, end="  ")
+    print()
+    print(f"QUANTIDADE DE PARES = {pares}")
+'''
+SOLUTIONS['vetores/5'] = '''n = int(input("Quantos numeros voce vai digitar? "))
+vetor = []
+for i in range(n):
+    vetor.append(float(input("Digite um numero: ")))
+posicao = 0
+for i in range(1, n):
+    if vetor[i] > vetor[posicao]:
+        posicao = i
+print()
+print(f"MAIOR VALOR = {vetor[posicao]:.1f}")
+print(f"POSICAO DO MAIOR VALOR = {posicao}")
+'''
+SOLUTIONS['vetores/6'] = '''n = int(input("Quantos valores vai ter cada vetor? "))
+a = []
+b = []
+c = []
+print("Digite os valores do vetor A:")
+for i in range(n):
+    a.append(int(input()))
+print("Digite os valores do vetor B:")
+for i in range(n):
+    b.append(int(input()))
+for i in range(n):
+    c.append(a[i] + b[i])
+print()
+print("VETOR RESULTANTE:")
+for x in c:
+    print(x)
+'''
+SOLUTIONS['vetores/7'] = '''n = int(input("Quantos elementos vai ter o vetor? "))
+vetor = []
+for i in range(n):
+    vetor.append(float(input("Digite um numero: ")))
+media = sum(vetor) / n
+print()
+print(f"MEDIA DO VETOR = {media:.3f}")
+print("ELEMENTOS ABAIXO DA MEDIA:")
+for x in vetor:
+    if x < media:
+        print(f"{x:.1f}")
+'''
+SOLUTIONS['vetores/8'] = '''n = int(input("Quantos elementos vai ter o vetor? "))
+vetor = []
+for i in range(n):
+    vetor.append(int(input("Digite um numero: ")))
+soma = 0
+quantidade = 0
+for x in vetor:
+    if x % 2 == 0:
+        soma += x
+        quantidade += 1
+print()
+if quantidade == 0:
+    print("NENHUM NUMERO PAR")
+else:
+    print(f"MEDIA DOS PARES = {soma / quantidade:.1f}")
+'''
+SOLUTIONS['vetores/9'] = '''n = int(input("Quantas pessoas voce vai digitar? "))
+nomes = []
+idades = []
+for i in range(n):
+    print(f"Dados da {i + 1}a pessoa:")
+    nomes.append(input("Nome: "))
+    idades.append(int(input("Idade: ")))
+mais_velho = 0
+for i in range(n):
+    if idades[i] > idades[mais_velho]:
+        mais_velho = i
+print()
+print(f"PESSOA MAIS VELHA: {nomes[mais_velho]}")
+'''
+SOLUTIONS['vetores/10'] = '''n = int(input("Quantos alunos serao digitados? "))
+nomes = []
+medias = []
+for i in range(n):
+    print(f"Digite nome, primeira e segunda nota do {i + 1}o aluno:")
+    nomes.append(input())
+    nota1 = float(input())
+    nota2 = float(input())
+    medias.append((nota1 + nota2) / 2)
+print()
+print("Alunos aprovados:")
+for i in range(n):
+    if medias[i] >= 6.0:
+        print(nomes[i])
+'''
+SOLUTIONS['matrizes/1'] = '''n = int(input("Qual a ordem da matriz? "))
+matriz = []
+for i in range(n):
+    linha = []
+    for j in range(n):
+        linha.append(int(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+print()
+print("DIAGONAL PRINCIPAL:")
+print(" ".join(str(matriz[i][i]) for i in range(n)))
+negativos = 0
+for i in range(n):
+    for j in range(n):
+        if matriz[i][j] < 0:
+            negativos += 1
+print(f"QUANTIDADE DE NEGATIVOS = {negativos}")
+'''
+SOLUTIONS['matrizes/2'] = '''m = int(input("Qual a quantidade de linhas da matriz? "))
+n = int(input("Qual a quantidade de colunas da matriz? "))
+matriz = []
+for i in range(m):
+    linha = []
+    for j in range(n):
+        linha.append(int(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+print()
+print("MAIOR ELEMENTO DE CADA LINHA:")
+for linha in matriz:
+    print(max(linha))
+'''
+SOLUTIONS['matrizes/3'] = '''m = int(input("Qual a quantidade de linhas da matriz? "))
+n = int(input("Qual a quantidade de colunas da matriz? "))
+matriz = []
+for i in range(m):
+    linha = []
+    for j in range(n):
+        linha.append(float(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+vetor = [sum(linha) for linha in matriz]
+print()
+print("VETOR GERADO:")
+for x in vetor:
+    print(f"{x:.1f}")
+'''
+SOLUTIONS['matrizes/4'] = '''n = int(input("Qual a ordem da matriz? "))
+matriz = []
+for i in range(n):
+    linha = []
+    for j in range(n):
+        linha.append(int(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+soma = 0
+for i in range(n):
+    for j in range(n):
+        if i < j:
+            soma += matriz[i][j]
+print()
+print(f"SOMA DOS ELEMENTOS ACIMA DA DIAGONAL PRINCIPAL = {soma}")
+'''
+SOLUTIONS['matrizes/5'] = '''n = int(input("Qual a ordem da matriz? "))
+matriz = []
+for i in range(n):
+    linha = []
+    for j in range(n):
+        linha.append(float(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+soma = 0.0
+for i in range(n):
+    for j in range(n):
+        if matriz[i][j] > 0:
+            soma += matriz[i][j]
+print()
+print(f"SOMA DOS POSITIVOS: {soma:.1f}")
+print()
+l = int(input("Escolha uma linha: "))
+print("LINHA ESCOLHIDA: " + " ".join(f"{x:.1f}" for x in matriz[l]))
+print()
+c = int(input("Escolha uma coluna: "))
+print("COLUNA ESCOLHIDA: " + " ".join(f"{matriz[i][c]:.1f}" for i in range(n)))
+print()
+print("DIAGONAL PRINCIPAL: " + " ".join(f"{matriz[i][i]:.1f}" for i in range(n)))
+for i in range(n):
+    for j in range(n):
+        if matriz[i][j] < 0:
+            matriz[i][j] = matriz[i][j] ** 2
+print()
+print("MATRIZ ALTERADA:")
+for linha in matriz:
+    print(" ".join(f"{x:.1f}" for x in linha))
+'''
+SOLUTIONS['matrizes/6'] = '''m = int(input("Qual a quantidade de linhas da matriz? "))
+n = int(input("Qual a quantidade de colunas da matriz? "))
+negativos = 0
+for i in range(m):
+    for j in range(n):
+        valor = int(input(f"Elemento [{i},{j}]: "))
+        if valor < 0:
+            negativos += 1
+print()
+print(f"QUANTIDADE DE NEGATIVOS = {negativos}")
+'''
+SOLUTIONS['matrizes/7'] = '''m = int(input("Quantas linhas vai ter cada matriz? "))
+n = int(input("Quantas colunas vai ter cada matriz? "))
+a = []
+b = []
+print()
+print("Digite os valores da matriz A:")
+for i in range(m):
+    a.append([int(input(f"Elemento [{i},{j}]: ")) for j in range(n)])
+print()
+print("Digite os valores da matriz B:")
+for i in range(m):
+    b.append([int(input(f"Elemento [{i},{j}]: ")) for j in range(n)])
+print()
+print("MATRIZ SOMA:")
+for i in range(m):
+    print(" ".join(str(a[i][j] + b[i][j]) for j in range(n)))
+'''
+SOLUTIONS['matrizes/8'] = '''n = int(input("Qual a ordem da matriz? "))
+matriz = []
+for i in range(n):
+    linha = []
+    for j in range(n):
+        linha.append(int(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+print()
+print("MATRIZ TRANSPOSTA:")
+for i in range(n):
+    print(" ".join(str(matriz[j][i]) for j in range(n)))
+'''
+SOLUTIONS['matrizes/9'] = '''m = int(input("Qual a quantidade de linhas da matriz? "))
+n = int(input("Qual a quantidade de colunas da matriz? "))
+matriz = []
+for i in range(m):
+    linha = []
+    for j in range(n):
+        linha.append(int(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+print()
+print("MAIOR ELEMENTO DE CADA LINHA:")
+for i in range(m):
+    posicao = 0
+    for j in range(n):
+        if matriz[i][j] > matriz[i][posicao]:
+            posicao = j
+    print(f"{matriz[i][posicao]}, POSICAO: {posicao}")
+'''
+SOLUTIONS['matrizes/10'] = '''n = int(input("Qual a ordem da matriz? "))
+matriz = []
+for i in range(n):
+    linha = []
+    for j in range(n):
+        linha.append(float(input(f"Elemento [{i},{j}]: ")))
+    matriz.append(linha)
+soma = 0.0
+acima = 0.0
+positivos = negativos = zeros = 0
+maior = menor = matriz[0][0]
+for i in range(n):
+    for j in range(n):
+        valor = matriz[i][j]
+        soma += valor
+        if valor > maior:
+            maior = valor
+        if valor < menor:
+            menor = valor
+        if valor > 0:
+            positivos += 1
+        elif valor < 0:
+            negativos += 1
+        else:
+            zeros += 1
+        if i < j:
+            acima += valor
+print()
+print("RELATORIO DA MATRIZ:")
+print()
+print(f"SOMA TOTAL: {soma:.1f}")
+print(f"MEDIA: {soma / (n * n):.1f}")
+print(f"MAIOR VALOR: {maior:.1f}")
+print(f"MENOR VALOR: {menor:.1f}")
+print(f"POSITIVOS: {positivos}")
+print(f"NEGATIVOS: {negativos}")
+print(f"ZEROS: {zeros}")
+print()
+print("DIAGONAL PRINCIPAL: " + " ".join(f"{matriz[i][i]:.1f}" for i in range(n)))
+print(f"SOMA ACIMA DA DIAGONAL: {acima:.1f}")
+'''
@@ -0,0 +1,264 @@
+"""
+Firestore em memória para testes de concorrência (sem rede nem credenciais)
+Implementa o subconjunto usado por utils/progress_store.py: referências de
+coleção/documento, get (com field_paths), set (com merge), create, update,
+get_all, list_documents, batch e transações, com ArrayUnion e SERVER_TIMESTAMP do
+firebase_admin. Cada chamada ao "servidor" espera uma latência configurável
+e é contada (assim como os documentos lidos), para comparar quantas idas ao
+Firestore cada rota faz.
+
+Como nas bibliotecas de servidor do Firestore, os documentos lidos em uma
+transação ficam travados até o commit: transações concorrentes sobre os mesmos
+documentos esperam umas pelas outras em vez de falhar.
+"""
+
+import time
+import threading
+from collections import Counter
+
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+
+
+class TransactionConflict(Exception):
+    """Algum documento lido pela transação mudou antes do commit"""
+
+
+class MemoryFirestore:
+    """Cliente Firestore em memória, thread-safe"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.rpcs = Counter()
+        self._docs = {}  # caminho -> (dados, versão)
+        self._lock = threading.Lock()
+        self._version = 0
+        self._doc_locks = {}  # caminho -> trava usada pelas transações
+
+    # ------------------------------------------------------------------
+    # API do cliente
+    # ------------------------------------------------------------------
+    def collection(self, name):
+        return MemoryCollection(self, (name,))
+
+    def get_all(self, references, field_paths=None):
+        references = list(references)
+        self._rpc('get_all', documents=len(references))
+        return [self._snapshot(ref, field_paths) for ref in references]
+
+    def batch(self):
+        return MemoryWriteBatch(self)
+
+    def transaction(self):
+        return MemoryTransaction(self)
+
+    @staticmethod
+    def transactional(function, max_attempts=5):
+        """Equivalente a firestore.transactional: repete a função se houver conflito"""
+        def run(transaction, *args, **kwargs):
+            for attempt in range(max_attempts):
+                transaction._begin()
+                try:
+                    result = function(transaction, *args, **kwargs)
+                    transaction._commit()
+                    return result
+                except TransactionConflict:
+                    if attempt + 1 == max_attempts:
+                        raise
+                finally:
+                    transaction._release()
+        return run
+
+    def seed(self, path, data):
+        """Grava um documento sem contar como chamada (preparação dos cenários)"""
+        self._apply([('set', tuple(path), data, False)])
+
+    def document_data(self, path):
+        """Dados de um documento sem contar como chamada (para verificar o resultado)"""
+        with self._lock:
+            entry = self._docs.get(tuple(path))
+            return dict(entry[0]) if entry else None
+
+    def stats(self):
+        return dict(self.rpcs)
+
+    # ------------------------------------------------------------------
+    # "Servidor"
+    # ------------------------------------------------------------------
+    def _rpc(self, kind, documents=0):
+        with self._lock:
+            self.rpcs[kind] += 1
+            if documents:
+                self.rpcs['documents_read'] += documents
+        if self.latency:
+            time.sleep(self.latency)
+
+    def _doc_lock(self, path):
+        with self._lock:
+            return self._doc_locks.setdefault(path, threading.Lock())
+
+    def _snapshot(self, ref, field_paths=None):
+        with self._lock:
+            entry = self._docs.get(ref.path)
+        data, version = entry if entry else (None, 0)
+        if data is not None and field_paths is not None:
+            data = {field: value for field, value in data.items() if field in field_paths}
+        return MemorySnapshot(ref, data, version)
+
+    def _apply(self, writes, read_versions=None):
+        """Aplica as escritas atomicamente (após conferir as versões lidas)"""
+        with self._lock:
+            for path, version in (read_versions or {}).items():
+                current = self._docs.get(path)
+                if (current[1] if current else 0) != version:
+                    raise TransactionConflict(path)
+            for kind, path, data, merge in writes:
+                current = self._docs.get(path)
+                if kind == 'update' and current is None:
+                    raise ValueError(f"Documento inexistente: {'/'.join(path)}")
+                if kind == 'create' and current is not None:
+                    raise AlreadyExists(f"Documento já existe: {'/'.join(path)}")
+                base = dict(current[0]) if current and (merge or kind == 'update') else {}
+                for field, value in data.items():
+                    # set(merge=True) mescla os mapas aninhados; update os substitui
+                    base[field] = _resolve(base.get(field), value, deep=merge and kind == 'set')
+                self._version += 1
+                self._docs[path] = (base, self._version)
+
+    def list_paths(self, prefix):
+        """Caminhos de todos os documentos abaixo de prefix"""
+        with self._lock:
+            return [path for path in self._docs if path[:len(prefix)] == tuple(prefix)]
+
+
+def _resolve(current, value, deep=False):
+    """Resolve os valores especiais do Firestore no momento da escrita"""
+    if deep and isinstance(value, dict):
+        merged = dict(current) if isinstance(current, dict) else {}
+        for field, item in value.items():
+            merged[field] = _resolve(merged.get(field), item, deep=True)
+        return merged
+    if value is firestore.SERVER_TIMESTAMP:
+        return time.time()
+    if isinstance(value, firestore.ArrayUnion):
+        result = list(current) if isinstance(current, list) else []
+        result.extend(item for item in value.values if item not in result)
+        return result
+    return value
+
+
+class MemoryCollection:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.id = path[-1]
+
+    @property
+    def parent(self):
+        return MemoryDocumentReference(self._client, self.path[:-1]) if len(self.path) > 1 else None
+
+    def document(self, document_id):
+        return MemoryDocumentReference(self._client, self.path + (document_id,))
+
+    def list_documents(self, page_size=None):
+        """Documentos da coleção, inclusive os que só têm subcoleções (em ordem de id)"""
+        self._client._rpc('list_documents')
+        depth = len(self.path) + 1
+        ids = sorted({path[depth - 1] for path in self._client.list_paths(self.path) if len(path) >= depth})
+        return (self.document(document_id) for document_id in ids)
+
+
+class MemoryDocumentReference:
+    def __init__(self, client, path):
+        self._client = client
+        self.path = path
+        self.id = path[-1]
+
+    @property
+    def parent(self):
+        return MemoryCollection(self._client, self.path[:-1])
+
+    def collection(self, name):
+        return MemoryCollection(self._client, self.path + (name,))
+
+    def get(self, field_paths=None):
+        self._client._rpc('get', documents=1)
+        return self._client._snapshot(self, field_paths)
+
+    def create(self, data):
+        self._client._rpc('commit')
+        self._client._apply([('create', self.path, data, False)])
+
+    def set(self, data, merge=False):
+        self._client._rpc('commit')
+        self._client._apply([('set', self.path, data, merge)])
+
+    def update(self, data):
+        self._client._rpc('commit')
+        self._client._apply([('update', self.path, data, True)])
+
+
+class MemorySnapshot:
+    def __init__(self, reference, data, version):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        self._data = data
+        self._version = version
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+
+class MemoryWriteBatch:
+    def __init__(self, client):
+        self._client = client
+        self._writes = []
+
+    def set(self, reference, data, merge=False):
+        self._writes.append(('set', reference.path, data, merge))
+
+    def update(self, reference, data):
+        self._writes.append(('update', reference.path, data, True))
+
+    def commit(self):
+        self._client._rpc('commit')
+        self._client._apply(self._writes)
+
+
+class MemoryTransaction(MemoryWriteBatch):
+    """Transação: trava os documentos lidos e confere as versões no commit"""
+
+    def __init__(self, client):
+        super().__init__(client)
+        self._read_versions = {}
+        self._held = {}
+
+    def _begin(self):
+        self._client._rpc('begin_transaction')
+        self._writes = []
+        self._read_versions = {}
+
+    def get_all(self, references):
+        # Ordem fixa de aquisição: transações sobre os mesmos documentos não se travam mutuamente
+        for path in sorted(ref.path for ref in references):
+            if path not in self._held:
+                lock = self._client._doc_lock(path)
+                lock.acquire()
+                self._held[path] = lock
+        snapshots = self._client.get_all(references)
+        for snapshot in snapshots:
+            self._read_versions[snapshot.reference.path] = snapshot._version
+        return snapshots
+
+    def get(self, reference):
+        return iter(self.get_all([reference]))
+
+    def _commit(self):
+        self._client._rpc('commit')
+        self._client._apply(self._writes, self._read_versions)
+
+    def _release(self):
+        for lock in self._held.values():
+            lock.release()
+        self._held = {}
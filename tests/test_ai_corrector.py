@@ -0,0 +1,93 @@
+"""
+Orçamento de tempo e circuito da correção por IA (utils/ai_corrector.py)
+A OpenAI é substituída pelo cliente falso de tests/fake_chat.py.
+"""
+
+import time
+
+import pytest
+
+from utils.ai_corrector import AICorrector
+from utils.circuit_breaker import CLOSED
+from tests.fake_chat import CORRECTION, FakeChatClient, FakeCompletions
+
+CODE = 'x = int(input("X: "))\ny = int(input("Y: "))\nprint(f"SOMA = {x + y}")\n'
+
+
+@pytest.fixture
+def make_corrector(monkeypatch):
+    monkeypatch.setenv('AI_CORRECTOR_MOCK', '0')
+    monkeypatch.setenv('OPENAI_API_KEY', 'teste')
+    monkeypatch.setenv('AI_CORRECTION_BUDGET', '0.1')
+
+    def make(completions, **client_options):
+        corrector = AICorrector()
+        corrector.client = FakeChatClient(completions, **client_options)
+        return corrector
+
+    return make
+
+
+def wait_for(condition, timeout=2.0):
+    ends_at = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < ends_at, 'condição não atingida a tempo'
+        time.sleep(0.01)
+
+
+def stream_result(corrector):
+    events = list(corrector.correct_exercise_stream(CODE, 'Some X e Y', 5, 'sequencial/5'))
+    assert events[-1][0] == 'result'
+    return events, events[-1][1]
+
+
+def test_stream_within_budget_is_cached(make_corrector):
+    corrector = make_corrector(FakeCompletions())
+    events, result = stream_result(corrector)
+    assert ('verdict', {'correct': True, 'score': 95}) in events
+    assert result['feedback'] == CORRECTION['feedback']
+
+    _, again = stream_result(corrector)
+    assert again == result
+    assert corrector.client.completions.calls == 1
+
+
+def test_stream_budget_miss_caches_late_answer_for_retry(make_corrector):
+    corrector = make_corrector(FakeCompletions(delay=0.3))
+    _, result = stream_result(corrector)
+    # Sem resposta no orçamento: o aluno recebe a correção local
+    assert result['feedback'] != CORRECTION['feedback']
+    assert corrector.stats()['budget_exceeded'] == 1
+
+    wait_for(lambda: corrector.stats()['late_cached'] == 1)
+    _, retry = stream_result(corrector)
+    assert retry['feedback'] == CORRECTION['feedback']
+    assert corrector.client.completions.calls == 1
+
+
+def test_stream_budget_miss_is_not_a_breaker_failure(make_corrector, monkeypatch):
+    monkeypatch.setenv('OPENAI_BREAKER_FAILURES', '1')
+    corrector = make_corrector(FakeCompletions(delay=0.3))
+    stream_result(corrector)
+    assert corrector.breaker.stats()['state'] == CLOSED
+    wait_for(lambda: corrector.stats()['late_cached'] == 1)
+    assert corrector.breaker.stats()['consecutive_failures'] == 0
+
+
+def test_stream_has_an_overall_deadline():
+    client = FakeChatClient(FakeCompletions(chunk_delay=0.2))
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        for _ in client.stream(first_chunk_timeout=1, deadline=0.3):
+            pass
+    assert time.monotonic() - started < 1
+
+
+def test_non_streaming_budget_miss_caches_late_answer(make_corrector):
+    corrector = make_corrector(FakeCompletions(delay=0.3))
+    result = corrector.correct_exercise(CODE, 'Some X e Y', 5, 'sequencial/5')
+    assert result['feedback'] != CORRECTION['feedback']
+
+    wait_for(lambda: corrector.stats()['late_cached'] == 1)
+    retry = corrector.correct_exercise(CODE, 'Some X e Y', 5, 'sequencial/5')
+    assert retry['feedback'] == CORRECTION['feedback']
@@ -0,0 +1,72 @@
+"""
+Corpus e agregação do benchmark do executor (benchmarks/)
+"""
+
+import pytest
+
+from benchmarks.corpus import MODULES, load_corpus
+from benchmarks.executor_bench import percentile, run_target, summarize
+from utils.executor import CodeExecutor
+
+
+@pytest.fixture(scope='module')
+def executor():
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv('EXECUTOR_BACKEND', 'inline')
+        yield CodeExecutor()
+
+
+def test_corpus_covers_every_module():
+    corpus = load_corpus()
+    assert {program['module'] for program in corpus} == set(MODULES) | {'patologico'}
+    assert all(program['module'] != 'patologico' for program in load_corpus(include_pathological=False))
+    assert len({program['name'] for program in corpus}) == len(corpus)
+
+
+@pytest.mark.parametrize('program', load_corpus(include_pathological=False),
+                         ids=lambda program: program['name'])
+def test_lesson_programs_run_with_their_inputs(executor, program):
+    result = executor.execute_python_code(program['code'], program['inputs'])
+    assert result['success'] is True, result['error']
+    assert result['output']
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 0.50) == 50
+    assert percentile(values, 0.99) == 99
+    assert percentile([7], 0.95) == 7
+    assert percentile([], 0.5) is None
+
+
+def test_summarize_reports_latencies_in_milliseconds():
+    samples = [{'latency': 0.010, 'success': True},
+               {'latency': 0.030, 'success': False},
+               {'latency': 0.020, 'success': True}]
+    summary = summarize(samples, 1.5)
+
+    assert summary['jobs'] == 3
+    assert summary['errors'] == 1
+    assert summary['jobs_per_second'] == 2.0
+    assert summary['p50_ms'] == 20.0
+    assert summary['max_ms'] == 30.0
+
+
+def test_run_target_groups_samples_by_module_and_program():
+    corpus = [
+        {'name': 'a/1', 'module': 'a', 'code': '', 'inputs': []},
+        {'name': 'b/1', 'module': 'b', 'code': '', 'inputs': []},
+    ]
+
+    def run(program):
+        if program['module'] == 'b':
+            return {'success': False, 'limits_hit': ['time']}
+        return {'success': True, 'usage': {'worker_peak_rss_kb': 1000}}
+
+    report = run_target(run, corpus, rounds=3, concurrency=2)
+
+    assert report['overall']['jobs'] == 6
+    assert report['overall']['errors'] == 3
+    assert report['modules']['a']['jobs'] == 3
+    assert report['programs']['b/1']['limits_hit'] == ['time']
+    assert report['worker_peak_rss_kb'] == 1000
@@ -0,0 +1,84 @@
+"""
+Cache LRU (utils/cache.py) e cache de código compilado do executor
+"""
+
+import time
+
+import pytest
+
+from utils.cache import LRUCache
+from utils.executor import CompiledCodeCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'b' passa a ser a menos usada
+    cache.set('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+
+def test_size_limit_evicts_until_it_fits():
+    cache = LRUCache(max_entries=10, max_bytes=10, sizeof=len)
+    cache.set('a', 'xxxx')
+    cache.set('b', 'xxxx')
+    cache.set('c', 'xxxx')
+
+    assert 'a' not in cache
+    assert cache.stats()['bytes'] == 8
+    # Maior que o cache inteiro: não é guardado nem despeja os demais
+    cache.set('d', 'x' * 11)
+    assert 'd' not in cache
+    assert len(cache) == 2
+
+
+def test_expired_entries_are_misses():
+    cache = LRUCache(ttl=0.05)
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=10)
+    assert cache.get('a') == 1
+    time.sleep(0.1)
+
+    assert cache.get('a') is None
+    assert cache.get('b') == 2
+    stats = cache.stats()
+    assert stats['expirations'] == 1
+    assert (stats['hits'], stats['misses']) == (2, 1)
+
+
+def test_peek_does_not_change_order_or_counters():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.peek('a') == 1
+    cache.set('c', 3)
+
+    assert 'a' not in cache
+    assert cache.stats()['hits'] == 0
+
+
+# ----------------------------------------------------------------------
+# Código compilado
+# ----------------------------------------------------------------------
+
+def test_same_source_is_compiled_once():
+    cache = CompiledCodeCache()
+    first = cache.compile('print(1)')
+    assert cache.compile('print(1)') is first
+    assert cache.compile('print(2)') is not first
+
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses']) == (1, 2)
+
+
+def test_syntax_errors_are_cached_too():
+    cache = CompiledCodeCache()
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            cache.compile('print(')
+    assert cache.stats()['hits'] == 1
@@ -0,0 +1,73 @@
+"""
+Disjuntor das chamadas à IA (utils/circuit_breaker.py)
+"""
+
+import time
+
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+def open_breaker(reset_timeout=0.05):
+    breaker = CircuitBreaker('teste', failure_threshold=3, reset_timeout=reset_timeout)
+    for _ in range(3):
+        assert breaker.allow()
+        breaker.record_failure()
+    return breaker
+
+
+def test_opens_after_consecutive_failures():
+    breaker = CircuitBreaker('teste', failure_threshold=3, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_failure()
+    breaker.record_success()  # sucesso zera a sequência
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()['rejected'] == 1
+
+
+def test_single_probe_after_the_reset_timeout():
+    breaker = open_breaker()
+    time.sleep(0.1)
+
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    # Enquanto o teste não termina, as demais chamadas são puladas
+    assert breaker.allow() is False
+    assert breaker.stats()['probes'] == 1
+
+
+def test_successful_probe_closes_the_circuit():
+    breaker = open_breaker()
+    time.sleep(0.1)
+    breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == CLOSED
+    assert breaker.allow() is True
+    assert breaker.stats()['consecutive_failures'] == 0
+
+
+def test_failed_probe_opens_it_again():
+    breaker = open_breaker()
+    time.sleep(0.1)
+    breaker.allow()
+    breaker.record_failure()
+
+    assert breaker.state == OPEN
+    assert breaker.allow() is False
+    assert breaker.stats()['opened'] == 2
+
+
+def test_released_probe_lets_another_one_through():
+    breaker = open_breaker()
+    time.sleep(0.1)
+    assert breaker.allow() is True
+    breaker.release()
+
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is True
@@ -0,0 +1,78 @@
+"""
+Cache de correções por exercício (utils/correction_cache.py)
+"""
+
+import time
+
+from utils.correction_cache import CorrectionCache, ast_fingerprint
+
+SOLUTION = '''
+import math
+# Área do círculo
+raio = float(input("Raio: "))
+area = math.pi * raio ** 2
+print(f"A={area:.4f}")
+'''
+
+RENAMED = '''
+import math
+r = float(input("Raio: "))   # outro aluno
+a = math.pi * r ** 2
+print(f"A={a:.4f}")
+'''
+
+RESULT = {'correct': True, 'score': 90, 'feedback': 'Boa solução.'}
+
+
+def test_names_comments_and_spaces_do_not_change_the_fingerprint():
+    assert ast_fingerprint(SOLUTION) == ast_fingerprint(RENAMED)
+
+
+def test_different_logic_changes_the_fingerprint():
+    assert ast_fingerprint(SOLUTION) != ast_fingerprint(SOLUTION.replace('** 2', '* 2'))
+    # Literais e nomes de builtins fazem parte do significado
+    assert ast_fingerprint('print(1)') != ast_fingerprint('print(2)')
+    assert ast_fingerprint('print(x)') != ast_fingerprint('len(x)')
+
+
+def test_imported_module_names_are_preserved():
+    assert ast_fingerprint('import math\nprint(math.pi)') != ast_fingerprint('import cmath\nprint(cmath.pi)')
+
+
+def test_key_includes_exercise_and_description():
+    key = CorrectionCache.make_key(SOLUTION, 'sequencial/1', 'Área do círculo')
+    assert key == CorrectionCache.make_key(RENAMED, 'sequencial/1', 'Área do círculo')
+    assert key != CorrectionCache.make_key(SOLUTION, 'sequencial/2', 'Área do círculo')
+    assert key != CorrectionCache.make_key(SOLUTION, 'sequencial/1', 'Perímetro do círculo')
+    assert CorrectionCache.make_key('print(', 'sequencial/1') is None
+
+
+def test_equivalent_solution_reuses_the_correction():
+    cache = CorrectionCache(max_entries=10, path='')
+    cache.set(CorrectionCache.make_key(SOLUTION, 'sequencial/1'), RESULT)
+
+    cached = cache.get(CorrectionCache.make_key(RENAMED, 'sequencial/1'))
+    assert cached == RESULT
+    # Cópia: alterar o resultado devolvido não altera o cache
+    cached['score'] = 0
+    assert cache.get(CorrectionCache.make_key(SOLUTION, 'sequencial/1')) == RESULT
+
+
+def test_corrections_expire():
+    cache = CorrectionCache(ttl=0.05, path='')
+    key = CorrectionCache.make_key(SOLUTION, 'sequencial/1')
+    cache.set(key, RESULT)
+    time.sleep(0.1)
+    assert cache.get(key) is None
+
+
+def test_corrections_survive_a_restart(tmp_path):
+    path = str(tmp_path / 'correcoes.json')
+    key = CorrectionCache.make_key(SOLUTION, 'sequencial/1')
+    cache = CorrectionCache(path=path)
+    cache.set(key, RESULT)
+    cache.save()
+
+    reloaded = CorrectionCache(path=path)
+    assert reloaded.loaded == 1
+    assert reloaded.get(key) == RESULT
@@ -0,0 +1,72 @@
+"""
+Parser incremental da correção em streaming (utils/correction_stream.py)
+"""
+
+import json
+
+import pytest
+
+from utils.correction_stream import CorrectionStreamParser
+
+REPLY = json.dumps({
+    'correct': True,
+    'score': 87,
+    'feedback': 'Ótimo! Use "f-strings"\npara formatar 🎉 a saída.',
+    'suggestions': ['Teste com valores negativos'],
+})
+
+
+def feed_all(parser, chunks):
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    return events
+
+
+@pytest.mark.parametrize('size', [1, 3, 7, len(REPLY)])
+def test_feedback_is_decoded_whatever_the_chunk_size(size):
+    parser = CorrectionStreamParser()
+    events = feed_all(parser, [REPLY[i:i + size] for i in range(0, len(REPLY), size)])
+
+    verdicts = [data for name, data in events if name == 'verdict']
+    deltas = [data['delta'] for name, data in events if name == 'feedback']
+    assert verdicts == [{'correct': True, 'score': 87}]
+    assert ''.join(deltas) == json.loads(REPLY)['feedback']
+    assert parser.feedback == json.loads(REPLY)['feedback']
+    assert parser.text == REPLY
+
+
+def test_score_waits_for_the_separator():
+    parser = CorrectionStreamParser()
+    assert parser.feed('{"correct": false, "score": 8') == []
+    assert parser.feed('7, ') == [('verdict', {'correct': False, 'score': 87})]
+
+
+def test_verdict_comes_before_the_feedback_text():
+    parser = CorrectionStreamParser()
+    events = parser.feed('{"correct": true, "score": 100, "feedback": "Certo')
+    assert events == [('verdict', {'correct': True, 'score': 100}),
+                      ('feedback', {'delta': 'Certo'})]
+
+
+def test_score_is_clamped_and_null_correct_is_false():
+    parser = CorrectionStreamParser()
+    parser.feed('{"correct": null, "score": 140}')
+    assert parser.verdict == {'correct': False, 'score': 100}
+
+
+def test_split_escape_sequences_wait_for_the_rest():
+    parser = CorrectionStreamParser()
+    parser.feed('{"feedback": "a\\')
+    assert parser.feedback == 'a'
+    parser.feed('u00e9\\ud83c')
+    assert parser.feedback == 'aé'
+    parser.feed('\\udf89"')
+    assert parser.feedback == 'aé🎉'
+
+
+def test_text_after_the_feedback_is_not_emitted():
+    parser = CorrectionStreamParser()
+    parser.feed('{"feedback": "fim", ')
+    assert parser.feed('"suggestions": ["mais"]}') == []
+    assert parser.feedback == 'fim'
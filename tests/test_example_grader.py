@@ -0,0 +1,69 @@
+"""
+Correção pelos exemplos dos templates (utils/example_grader.py)
+A solução típica de cada aula precisa passar em todos os exemplos do exercício.
+"""
+
+import pytest
+
+from utils.example_grader import ExampleGrader, compare_output
+from utils.executor import CodeExecutor
+from tests.lesson_solutions import SOLUTIONS
+
+
+@pytest.fixture(scope='module')
+def grader():
+    return ExampleGrader()
+
+
+@pytest.fixture(scope='module')
+def executor():
+    # Execução no próprio processo: os testes não dependem do pool de workers
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setenv('EXECUTOR_BACKEND', 'inline')
+        return CodeExecutor()
+
+
+SUITE_IDS = sorted(f'{module}/{lesson}' for module, lesson in ExampleGrader().suites)
+
+
+@pytest.mark.parametrize('exercise_id', SUITE_IDS)
+def test_typical_solution_passes_examples(grader, executor, exercise_id):
+    module, lesson = exercise_id.split('/')
+    result = grader.grade(SOLUTIONS[exercise_id], module, int(lesson), executor)
+    assert result is not None
+    assert result['correct'], result['feedback']
+
+
+def test_wrong_answer_is_rejected(grader, executor):
+    code = SOLUTIONS['sequencial/5'].replace('soma = x + y', 'soma = x * y')
+    result = grader.grade(code, 'sequencial', 5, executor)
+    assert result['correct'] is False
+    assert result['examples_passed'] < result['examples_total']
+
+
+def test_misaligned_inputs_defer_to_rules(grader, executor):
+    # Lê mais valores do que o exemplo fornece: o corretor não decide
+    code = 'for _ in range(50):\n    input()\nprint("fim")'
+    assert grader.grade(code, 'sequencial', 5, executor) is None
+
+
+def test_prompt_wording_is_free_on_input_lines():
+    expected = ['Digite o valor de X: 3', 'SOMA = 3']
+    ok, _ = compare_output(expected, 'x? 3\nSOMA = 3\n', inputs=[[0, '3']])
+    assert ok
+
+
+def test_label_and_values_may_share_a_line():
+    expected = ['DIAGONAL PRINCIPAL:', '5.0 8.0 -4.0', 'FIM']
+    assert compare_output(expected, 'DIAGONAL PRINCIPAL:\n5.0 8.0 -4.0 \nFIM')[0]
+    assert compare_output(expected, 'DIAGONAL PRINCIPAL: 5.0 8.0 -4.0\nFIM')[0]
+
+    ok, mismatch = compare_output(expected, 'DIAGONAL PRINCIPAL: 5.0 8.0 4.0\nFIM')
+    assert not ok
+    assert mismatch['line'] == 1
+
+
+def test_extra_output_line_is_reported():
+    ok, mismatch = compare_output(['SOMA = 3'], 'SOMA = 3\nSOMA = 3')
+    assert not ok
+    assert mismatch == {'line': 2, 'expected': None, 'actual': 'SOMA = 3'}
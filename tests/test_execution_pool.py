@@ -0,0 +1,181 @@
+"""
+Pool de processos de execução (utils/execution_pool.py) com workers reais
+"""
+
+import time
+import threading
+
+import pytest
+
+from utils import execution_pool
+from utils.execution_pool import ExecutionPool, worker_environment
+
+
+def wait_for(condition, timeout=5.0):
+    ends_at = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < ends_at, 'condição não atingida a tempo'
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def make(**options):
+        options.setdefault('size', 1)
+        pool = ExecutionPool(**options)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.shutdown()
+
+
+def test_jobs_reuse_prestarted_workers(make_pool):
+    pool = make_pool(size=2)
+    for value in range(4):
+        result = pool.run(f'print({value} * 2)')
+        assert result['success'] is True
+        assert result['output'] == f'{value * 2}\n'
+
+    stats = pool.stats()
+    assert stats['spawned'] == 2
+    assert stats['completed'] == 4
+    assert stats['idle'] == 2
+
+
+def test_timeout_kills_and_replaces_the_worker(make_pool):
+    pool = make_pool(timeout=1)
+    result = pool.run('while True:\n    pass')
+
+    assert result['success'] is False
+    assert result['limits_hit'] == ['time']
+    assert pool.stats()['timeouts'] == 1
+    # O worker substituto atende o próximo job
+    assert pool.run('print("ok")')['output'] == 'ok\n'
+    assert pool.stats()['idle'] == 1
+
+
+def test_full_queue_rejects_instead_of_waiting(make_pool):
+    pool = make_pool(queue_depth=0, timeout=2)
+    pool.start()
+    # O único worker fica ocupado com um loop até o timeout
+    busy = threading.Thread(target=pool.run, args=('while True:\n    pass',))
+    busy.start()
+    wait_for(lambda: pool.stats()['busy'] == 1)
+
+    started = time.monotonic()
+    rejected = pool.run('print("outro")')
+    assert time.monotonic() - started < 1
+    assert rejected['success'] is False
+    assert 'ocupado' in rejected['error']
+    assert pool.stats()['rejected'] == 1
+    busy.join(10)
+
+
+def test_lost_slot_is_refilled_on_the_next_job(make_pool, monkeypatch):
+    pool = make_pool(timeout=1)
+    pool.start()
+
+    real_spawn = pool._spawn
+    failures = [OSError('sem processos')]
+
+    def flaky_spawn():
+        if failures:
+            raise failures.pop()
+        return real_spawn()
+
+    monkeypatch.setattr(pool, '_spawn', flaky_spawn)
+    # O worker morre e a substituição falha: a vaga fica vazia
+    pool.run('while True:\n    pass')
+    assert pool.stats()['idle'] == 0
+
+    result = pool.run('print("de volta")')
+    assert result['output'] == 'de volta\n'
+    assert pool.stats()['idle'] == 1
+
+
+def test_worker_environment_has_no_server_secrets(monkeypatch):
+    monkeypatch.setenv('OPENAI_API_KEY', 'sk-segredo')
+    monkeypatch.setenv('FIREBASE_CREDENTIALS', '{"private_key": "x"}')
+    monkeypatch.setenv('EXECUTOR_MAX_MEMORY_MB', '128')
+
+    env = worker_environment()
+
+    assert 'OPENAI_API_KEY' not in env
+    assert 'FIREBASE_CREDENTIALS' not in env
+    assert env['EXECUTOR_MAX_MEMORY_MB'] == '128'
+    assert env['EXECUTOR_BACKEND'] == 'inline'
+    assert env.get('PATH') == execution_pool.os.environ.get('PATH')
+
+
+# ----------------------------------------------------------------------
+# Limites por execução
+# ----------------------------------------------------------------------
+
+def test_output_limit_truncates_and_stops(make_pool):
+    pool = make_pool()
+    result = pool.run('while True:\n    print("x" * 100)', limits={'max_output_bytes': 1024})
+
+    assert result['success'] is False
+    assert result['truncated'] is True
+    assert result['limits_hit'] == ['output']
+    assert len(result['output'].encode('utf-8')) == 1024
+
+
+def test_cpu_limit_kills_the_worker(make_pool):
+    pool = make_pool(timeout=15)
+    result = pool.run('while True:\n    pass', limits={'cpu_seconds': 1})
+
+    assert result['success'] is False
+    assert result['limits_hit'] == ['cpu']
+    assert pool.run('print(1)')['output'] == '1\n'
+
+
+def test_memory_limit_stops_the_program(make_pool):
+    pool = make_pool()
+    result = pool.run('dados = [0] * (10 ** 9)', limits={'max_memory_mb': 64})
+
+    assert result['success'] is False
+    assert result['limits_hit'] == ['memory']
+
+
+def test_line_budget_stops_long_loops(make_pool):
+    pool = make_pool()
+    result = pool.run('while True:\n    pass', limits={'max_line_events': 1000})
+
+    assert result['success'] is False
+    assert result['limits_hit'] == ['instructions']
+    assert result['usage']['line_events'] == 1001
+
+
+# ----------------------------------------------------------------------
+# Saída em streaming
+# ----------------------------------------------------------------------
+
+SLOW_PRINTS = 'for i in range(3):\n    print(i)\n    total = sum(range(2000000))'
+
+
+def test_run_stream_sends_output_before_the_result(make_pool):
+    pool = make_pool()
+    events = list(pool.run_stream(SLOW_PRINTS))
+
+    chunks = [payload['data'] for event, payload in events if event == 'output']
+    assert len(chunks) > 1
+    assert ''.join(chunks) == '0\n1\n2\n'
+    assert events[-1][0] == 'result'
+    assert events[-1][1]['output'] == '0\n1\n2\n'
+
+
+def test_closing_the_stream_kills_the_worker(make_pool):
+    pool = make_pool()
+    stream = pool.run_stream('while True:\n    print("x")\n    total = sum(range(100000))')
+    assert next(stream)[0] == 'output'
+    stream.close()
+
+    stats = pool.stats()
+    assert stats['cancelled'] == 1
+    assert stats['busy'] == 0
+    assert pool.run('print("ok")')['output'] == 'ok\n'
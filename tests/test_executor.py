@@ -0,0 +1,177 @@
+"""
+Executor de código dos alunos (utils/executor.py) no modo inline
+O pool de processos tem os próprios testes em test_execution_pool.py.
+"""
+
+import pytest
+
+from utils.executor import CodeExecutor, normalize_source
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setenv('EXECUTOR_BACKEND', 'inline')
+    return CodeExecutor()
+
+
+# ----------------------------------------------------------------------
+# Cache de resultados
+# ----------------------------------------------------------------------
+
+def test_normalize_source_ignores_trailing_spaces_and_line_endings():
+    assert normalize_source('x = 1   \r\nprint(x)\t\r\n\n') == 'x = 1\nprint(x)'
+
+
+def test_normalize_source_keeps_spaces_inside_multiline_strings():
+    spaced = 's = """a   \nb"""\nprint(s)\n'
+    plain = 's = """a\nb"""\nprint(s)\n'
+    assert normalize_source(spaced) != normalize_source(plain)
+    assert normalize_source(spaced + '   ') == normalize_source(spaced)
+
+
+def test_normalize_source_leaves_invalid_code_alone():
+    # Espaços depois da barra de continuação: erro de sintaxe que o rstrip esconderia
+    code = 'x = 1 + \\   \n2\nprint(x)'
+    assert normalize_source(code) == code
+
+
+def test_deterministic_result_is_reused(executor):
+    first = executor.execute_python_code('print(2 + 3)')
+    second = executor.execute_python_code('print(2 + 3)   \n')
+    assert first['output'] == second['output'] == '5\n'
+    assert 'cached' not in first
+    assert second['cached'] is True
+
+
+def test_inputs_are_part_of_the_key(executor):
+    code = 'print(int(input()) * 2)'
+    assert executor.execute_python_code(code, ['2'])['output'].endswith('4\n')
+    result = executor.execute_python_code(code, ['3'])
+    assert result['output'].endswith('6\n')
+    assert 'cached' not in result
+    assert executor.execute_python_code(code, [3])['cached'] is True
+
+
+def test_multiline_strings_with_different_spaces_are_not_shared(executor):
+    spaced = executor.execute_python_code('print("""a   \nb""")')
+    plain = executor.execute_python_code('print("""a\nb""")')
+    assert spaced['output'] == 'a   \nb\n'
+    assert plain['output'] == 'a\nb\n'
+
+
+def test_nondeterministic_code_is_not_cached(executor):
+    code = 'import random\nprint(random.random())'
+    executor.execute_python_code(code)
+    assert 'cached' not in executor.execute_python_code(code)
+
+
+# ----------------------------------------------------------------------
+# Código compilado
+# ----------------------------------------------------------------------
+
+def test_validation_and_execution_compile_once(executor):
+    code = 'total = sum(range(10))\nprint(total)'
+    assert executor.validate_code(code)['valid'] is True
+    assert executor.execute_python_code(code)['output'] == '45\n'
+
+    stats = executor.code_cache.stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] >= 1
+
+
+# ----------------------------------------------------------------------
+# Execução em lote
+# ----------------------------------------------------------------------
+
+DOUBLE = 'n = int(input("n: "))\nprint(n * 2)'
+
+
+def test_batch_runs_each_input_vector(executor):
+    results = executor.execute_batch(DOUBLE, [['1'], ['5'], ['x']])
+
+    assert [result['case'] for result in results] == [0, 1, 2]
+    assert results[0]['output'].endswith('2\n')
+    assert results[1]['output'].endswith('10\n')
+    assert results[2]['success'] is False
+    assert 'ValueError' in results[2]['error']
+
+
+def test_batch_is_capped(executor, monkeypatch):
+    monkeypatch.setattr(executor, 'max_batch_cases', 3)
+    assert len(executor.execute_batch(DOUBLE, [[str(n)] for n in range(10)])) == 3
+
+
+def test_batch_with_invalid_code_fails_every_case_without_running(executor):
+    results = executor.execute_batch('import os\nprint(1)', [[], []])
+    assert [result['case'] for result in results] == [0, 1]
+    assert all("'os'" in result['error'] for result in results)
+    assert all(result['output'] == '' for result in results)
+
+
+def test_batch_spreads_cases_over_the_pool(monkeypatch):
+    monkeypatch.setenv('EXECUTOR_BACKEND', 'pool')
+    monkeypatch.setenv('EXECUTOR_POOL_SIZE', '2')
+    executor = CodeExecutor()
+    try:
+        results = executor.execute_batch(DOUBLE, [[str(n)] for n in range(6)])
+        assert [result['output'].splitlines()[-1] for result in results] == ['0', '2', '4', '6', '8', '10']
+        assert executor.pool.stats()['completed'] == 6
+    finally:
+        executor.pool.shutdown()
+
+
+# ----------------------------------------------------------------------
+# Streaming
+# ----------------------------------------------------------------------
+
+def test_inline_stream_sends_output_then_result(executor):
+    events = list(executor.execute_stream('print("a")\nprint("b")'))
+    assert events[0] == ('output', {'data': 'a\nb\n'})
+    assert events[-1][0] == 'result'
+    assert events[-1][1]['success'] is True
+
+
+def test_stream_reports_missing_inputs_without_output(executor):
+    events = list(executor.execute_stream('x = input("Valor: ")'))
+    assert len(events) == 1
+    assert events[0][1]['input_needed'] is True
+
+
+# ----------------------------------------------------------------------
+# Perfil da execução
+# ----------------------------------------------------------------------
+
+LOOP = 'total = 0\nfor i in range(50):\n    total += i\nprint(total)'
+
+
+def test_profile_counts_line_executions(executor):
+    result = executor.execute_python_code(LOOP, profile=True)
+    profile = result['profile']
+
+    counts = dict(profile['line_counts'])
+    assert counts[3] == 50
+    assert counts[4] == 1
+    # O cabeçalho do for roda uma vez a mais que o corpo
+    assert profile['hot_lines'][:2] == [[2, 51], [3, 50]]
+    assert profile['line_events'] == sum(counts.values())
+    assert profile['peak_memory_kb'] >= 0
+
+
+def test_profiled_runs_skip_the_result_cache(executor):
+    executor.execute_python_code(LOOP)
+    result = executor.execute_python_code(LOOP, profile=True)
+    assert 'cached' not in result
+    assert 'profile' in result
+    assert 'profile' not in executor.execute_python_code(LOOP)
+
+
+def test_pool_worker_returns_the_profile(monkeypatch):
+    monkeypatch.setenv('EXECUTOR_BACKEND', 'pool')
+    monkeypatch.setenv('EXECUTOR_POOL_SIZE', '1')
+    executor = CodeExecutor()
+    try:
+        result = executor.execute_python_code(LOOP, profile=True)
+        assert dict(result['profile']['line_counts'])[3] == 50
+        assert result['usage']['worker_peak_rss_kb'] > 0
+    finally:
+        executor.pool.shutdown()
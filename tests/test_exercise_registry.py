@@ -0,0 +1,71 @@
+"""
+Registro de exercícios montado a partir dos templates (utils/exercise_registry.py)
+"""
+
+from utils.exercise_registry import (
+    LESSONS, MODULES, ExerciseRegistry, extract_examples, html_to_text, parse_exercise, registry
+)
+
+TEMPLATE = '''{% extends "base_aula.html" %}
+{% block lesson_title %}Soma &amp; média{% endblock %}
+{% block exercise_description %}
+<p>Leia dois números e mostre a soma.</p>
+<h4>Exemplo 1 (inteiros):</h4>
+<pre><code>Primeiro: 2
+Segundo: 3
+SOMA = 5
+</code></pre>
+<h4>Exemplo 2:</h4>
+<pre><code>Primeiro: 1 &lt; 2
+SOMA = 3</code></pre>
+{% endblock %}
+{% block initial_code %}
+# escreva aqui
+{% endblock %}
+'''
+
+
+def test_every_lesson_is_registered():
+    assert len(registry) == len(MODULES) * len(LESSONS)
+    for exercise in registry:
+        assert exercise['id'] == f"{exercise['module']}/{exercise['lesson']}"
+        assert exercise['description']
+    # A primeira aula mostra só a saída esperada, sem transcrição de entrada/saída
+    without_examples = [exercise['id'] for exercise in registry if not exercise['examples']]
+    assert without_examples == ['sequencial/1']
+
+
+def test_examples_are_extracted_as_lines():
+    assert extract_examples(TEMPLATE) == [
+        ['Primeiro: 2', 'Segundo: 3', 'SOMA = 5'],
+        ['Primeiro: 1 < 2', 'SOMA = 3'],
+    ]
+    assert extract_examples('<p>sem bloco de descrição</p>') == []
+
+
+def test_description_html_becomes_text_with_code_blocks():
+    text = html_to_text('<p>Leia <b>dois</b> números.</p><pre><code>SOMA = 5\n</code></pre>')
+    assert text == 'Leia dois números.\n\n```\nSOMA = 5\n```'
+
+
+def test_parse_exercise_fills_every_field():
+    exercise = parse_exercise(TEMPLATE, 'sequencial', 3)
+
+    assert exercise['id'] == 'sequencial/3'
+    assert exercise['title'] == 'Soma & média'
+    assert exercise['description'].startswith('Leia dois números e mostre a soma.')
+    assert len(exercise['examples']) == 2
+    assert exercise['initial_code'] == '# escreva aqui'
+    assert parse_exercise('{% block lesson_title %}x{% endblock %}', 'sequencial', 3) is None
+
+
+def test_missing_templates_are_skipped(tmp_path):
+    lesson_dir = tmp_path / 'vetores'
+    lesson_dir.mkdir()
+    (lesson_dir / 'aula2.html').write_text(TEMPLATE, encoding='utf-8')
+
+    local = ExerciseRegistry(str(tmp_path))
+    assert len(local) == 1
+    assert local.get('vetores', 2)['title'] == 'Soma & média'
+    assert local.get('vetores', 1) is None
+    assert local.examples('vetores', 1) == []
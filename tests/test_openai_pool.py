@@ -0,0 +1,94 @@
+"""
+Cliente OpenAI assíncrono compartilhado (utils/openai_pool.py) com backend falso
+"""
+
+import json
+import threading
+from concurrent.futures import wait
+
+import pytest
+
+from tests.fake_chat import CORRECTION, FakeChatClient, FakeCompletions
+from utils.openai_pool import AsyncChatClient
+
+REQUEST = {'model': 'teste', 'messages': [{'role': 'user', 'content': 'corrija'}]}
+
+
+def test_identical_requests_share_one_call():
+    completions = FakeCompletions(delay=0.1)
+    client = FakeChatClient(completions)
+
+    futures = [client.submit('mesma-chave', **REQUEST) for _ in range(5)]
+    wait(futures, timeout=5)
+
+    assert {future.result() for future in futures} == {json.dumps(CORRECTION)}
+    assert completions.calls == 1
+    assert client.stats()['coalesced'] == 4
+    assert client.stats()['in_flight'] == 0
+
+
+def test_requests_without_key_are_not_coalesced():
+    completions = FakeCompletions(delay=0.05)
+    client = FakeChatClient(completions)
+    wait([client.submit(None, **REQUEST) for _ in range(3)], timeout=5)
+    assert completions.calls == 3
+
+
+def test_concurrency_is_limited():
+    completions = FakeCompletions(delay=0.05)
+    client = FakeChatClient(completions, max_concurrency=2)
+    wait([client.submit(f'chave-{index}', **REQUEST) for index in range(6)], timeout=5)
+
+    assert completions.calls == 6
+    assert completions.peak_active == 2
+
+
+def test_temporary_errors_are_retried():
+    completions = FakeCompletions(failures=[ConnectionError('queda'), ConnectionError('queda')])
+    client = FakeChatClient(completions, max_retries=2)
+
+    assert json.loads(client.complete('chave', **REQUEST)) == CORRECTION
+    stats = client.stats()
+    assert (stats['upstream_calls'], stats['retries'], stats['failures']) == (3, 2, 0)
+
+
+def test_retries_stop_at_the_limit_and_other_errors_fail_at_once():
+    client = FakeChatClient(FakeCompletions(failures=[ConnectionError('queda')] * 3), max_retries=1)
+    with pytest.raises(ConnectionError):
+        client.complete('chave', **REQUEST)
+    assert client.stats()['upstream_calls'] == 2
+
+    client = FakeChatClient(FakeCompletions(failures=[ValueError('requisição inválida')]), max_retries=2)
+    with pytest.raises(ValueError):
+        client.complete('chave', **REQUEST)
+    assert client.stats()['retries'] == 0
+
+
+def test_stream_yields_the_reply_in_chunks():
+    client = FakeChatClient(FakeCompletions())
+    chunks = list(client.stream(**REQUEST))
+    assert len(chunks) > 1
+    assert ''.join(chunks) == json.dumps(CORRECTION)
+
+
+def test_stream_without_first_chunk_times_out():
+    client = FakeChatClient(FakeCompletions(delay=1))
+    with pytest.raises(TimeoutError):
+        list(client.stream(first_chunk_timeout=0.05, **REQUEST))
+
+
+def test_failed_start_does_not_leave_the_loop_thread():
+    class BrokenClient(AsyncChatClient):
+        async def _create_client(self):
+            raise RuntimeError('sem cliente')
+
+    def loop_threads():
+        return [thread for thread in threading.enumerate() if thread.name == 'openai-loop']
+
+    before = len(loop_threads())
+    client = BrokenClient(api_key='teste')
+    with pytest.raises(RuntimeError):
+        client.start()
+
+    assert len(loop_threads()) == before
+    assert client._loop is None
@@ -0,0 +1,94 @@
+"""
+Análise estática do código do aluno (utils/preflight.py)
+"""
+
+import pytest
+
+from utils import preflight
+from utils.executor import CodeExecutor
+
+
+def test_counts_inputs_and_literal_prompts():
+    analysis, tree = preflight.analyze(
+        'nome = input("Nome: ")\nidade = int(input())\nprint(input(nome))'
+    )
+    assert tree is not None
+    assert analysis['valid'] is True
+    assert analysis['input_count'] == 3
+    # Prompt que não é literal fica como None
+    assert analysis['input_prompts'] == ['Nome: ', '', None]
+    assert analysis['input_unbounded'] is False
+
+
+def test_input_in_a_string_is_not_an_input_call():
+    analysis, _ = preflight.analyze('print("digite input() aqui")  # input()')
+    assert analysis['input_count'] == 0
+
+
+@pytest.mark.parametrize('code', [
+    'for _ in range(3):\n    x = input()',
+    'while True:\n    if input() == "fim":\n        break',
+    'valores = [input() for _ in range(3)]',
+    'def ler():\n    return input()\nler()',
+])
+def test_inputs_inside_loops_or_functions_are_unbounded(code):
+    analysis, _ = preflight.analyze(code)
+    assert analysis['input_unbounded'] is True
+
+
+@pytest.mark.parametrize('code, construct', [
+    ('import os', 'import'),
+    ('from subprocess import run', 'import'),
+    ('print(().__class__)', 'dunder_attribute'),
+    ('__import__("os")', 'blocked_name'),
+])
+def test_disallowed_constructs_make_the_code_invalid(code, construct):
+    analysis, _ = preflight.analyze(code)
+    assert analysis['valid'] is False
+    assert analysis['disallowed'][0]['construct'] == construct
+    assert analysis['error'].startswith('Linha 1:')
+
+
+def test_allowed_module_passes():
+    analysis, _ = preflight.analyze('import math\nprint(math.sqrt(16))')
+    assert analysis['valid'] is True
+
+
+def test_syntax_error_is_reported_without_a_tree():
+    analysis, tree = preflight.analyze('print(')
+    assert tree is None
+    assert analysis['valid'] is False
+    assert 'linha 1' in analysis['error']
+
+
+@pytest.mark.parametrize('code, deterministic', [
+    ('print(sum([1, 2, 3]))', True),
+    ('print({"a", "b"})', False),
+    ('print(set("abc"))', False),
+    ('class Ponto:\n    pass\nprint(Ponto())', False),
+    ('print(id(1))', False),
+])
+def test_deterministic_flag(code, deterministic):
+    analysis, _ = preflight.analyze(code)
+    assert analysis['deterministic'] is deterministic
+
+
+def test_executor_preflight_is_cached_and_compiles_once(monkeypatch):
+    monkeypatch.setenv('EXECUTOR_BACKEND', 'inline')
+    executor = CodeExecutor()
+    code = 'print(input("x: "))'
+
+    first = executor.preflight(code)
+    assert executor.preflight(code) is first
+    assert executor.preflight_cache.stats()['hits'] == 1
+    assert executor.code_cache.stats()['entries'] == 1
+
+
+def test_missing_inputs_are_reported_before_running(monkeypatch):
+    monkeypatch.setenv('EXECUTOR_BACKEND', 'inline')
+    result = CodeExecutor().execute_python_code('for _ in range(2):\n    x = input("a: ")')
+
+    assert result['input_needed'] is True
+    assert result['input_prompts'] == ['a: ']
+    assert result['input_unbounded'] is True
+    assert result['output'] == ''
@@ -0,0 +1,123 @@
+"""
+Conclusão de aulas concorrente (ProgressStore.complete_lesson) contra o Firestore em memória
+Cada cenário dispara as conclusões em threads liberadas juntas, com latência por
+chamada para que as transações se sobreponham.
+"""
+
+import threading
+
+import pytest
+
+from tests.memory_firestore import MemoryFirestore
+from utils.progress_store import ProgressStore, MODULE_ORDER, TOTAL_LESSONS, new_module_document
+
+LATENCY = 0.002
+
+
+def module_path(user_id, module):
+    return ('usuarios', user_id, 'conteudo', module)
+
+
+def run_concurrently(calls):
+    """Executa as chamadas em threads liberadas juntas; retorna os resultados (ou exceções)"""
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+
+    def worker(index, call):
+        barrier.wait()
+        try:
+            results[index] = call()
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(index, call)) for index, call in enumerate(calls)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.fixture
+def db():
+    return MemoryFirestore(latency=LATENCY)
+
+
+@pytest.fixture
+def store(db):
+    # Sem cache: cada conclusão lê do Firestore, como em vários processos
+    return ProgressStore(db, cache_entries=0, transactional=db.transactional, layout='modules')
+
+
+def test_double_click_records_lesson_once(db, store):
+    db.seed(module_path('aluno', 'sequencial'), new_module_document('sequencial'))
+
+    results = run_concurrently([lambda: store.complete_lesson('aluno', 'sequencial', 1)] * 4)
+
+    assert not [result for result in results if isinstance(result, Exception)]
+    data = db.document_data(module_path('aluno', 'sequencial'))
+    assert data['aulas_concluidas'] == [1]
+    assert sorted(data['aulas_liberadas']) == [1, 2]
+
+
+def test_parallel_completions_all_survive(db, store):
+    lessons = list(range(1, TOTAL_LESSONS + 1))
+    db.seed(module_path('aluno', 'sequencial'), new_module_document('sequencial', lessons))
+
+    results = run_concurrently([
+        (lambda lesson=lesson: store.complete_lesson('aluno', 'sequencial', lesson)) for lesson in lessons
+    ])
+
+    assert not [result for result in results if isinstance(result, Exception)]
+    data = db.document_data(module_path('aluno', 'sequencial'))
+    assert sorted(data['aulas_concluidas']) == lessons
+
+
+def test_parallel_completions_unlock_next_module(db, store):
+    lessons = list(range(1, TOTAL_LESSONS + 1))
+    db.seed(module_path('aluno', 'sequencial'), new_module_document('sequencial', lessons))
+
+    run_concurrently([
+        (lambda lesson=lesson: store.complete_lesson('aluno', 'sequencial', lesson)) for lesson in lessons
+    ])
+
+    next_module = MODULE_ORDER[1]
+    next_data = db.document_data(module_path('aluno', next_module))
+    assert next_data is not None
+    assert 1 in next_data['aulas_liberadas']
+    assert next_module in db.document_data(('usuarios', 'aluno'))['modulos_liberados']
+    assert store.check_access('aluno', next_module)[0] is True
+
+
+def test_locked_lesson_is_not_completed(db, store):
+    db.seed(module_path('aluno', 'sequencial'), new_module_document('sequencial'))
+
+    assert store.complete_lesson('aluno', 'sequencial', 5) is None
+    assert db.document_data(module_path('aluno', 'sequencial'))['aulas_concluidas'] == []
+
+
+def test_module_page_is_served_from_cache_after_completion(db):
+    # Com cache: a conclusão atualiza a cópia em memória e a página do módulo não lê o Firestore
+    store = ProgressStore(db, cache_entries=16, transactional=db.transactional, layout='modules')
+    db.seed(module_path('aluno', 'sequencial'), new_module_document('sequencial'))
+    store.get_modules('aluno')
+
+    store.complete_lesson('aluno', 'sequencial', 1)
+    reads = db.stats()['documents_read']
+    data = store.get_module('aluno', 'sequencial')
+
+    assert db.stats()['documents_read'] == reads
+    assert data['aulas_concluidas'] == [1]
+    assert sorted(data['aulas_liberadas']) == [1, 2]
+
+
+def test_all_progress_access_matches_check_access(db, store):
+    lessons = list(range(1, TOTAL_LESSONS + 1))
+    db.seed(module_path('aluno', 'sequencial'), new_module_document('sequencial', lessons))
+    for lesson in lessons:
+        store.complete_lesson('aluno', 'sequencial', lesson)
+
+    access = store.check_access_all('aluno')
+
+    assert [module for module in MODULE_ORDER if access[module][0]] == MODULE_ORDER[:2]
+    assert access == {module: store.check_access('aluno', module) for module in MODULE_ORDER}
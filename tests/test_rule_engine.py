@@ -0,0 +1,52 @@
+"""
+Regras de correção local (utils/correction_rules.json) aplicadas a todas as aulas
+Cada aula precisa aceitar uma solução típica e recusar submissões incorretas.
+"""
+
+import pytest
+
+from utils.rule_engine import RuleEngine, LessonChecker
+from utils.exercise_registry import MODULES, LESSONS
+from tests.lesson_solutions import SOLUTIONS
+
+EXERCISE_IDS = [f'{module}/{lesson}' for module in MODULES for lesson in LESSONS]
+
+INCORRECT = [
+    'print("oi")',
+    'valor = input("Digite um valor: ")\nprint(valor)',
+]
+
+
+@pytest.fixture(scope='module')
+def engine():
+    return RuleEngine()
+
+
+def test_rules_cover_every_lesson(engine):
+    assert sorted(engine.checkers) == sorted(EXERCISE_IDS)
+
+
+@pytest.mark.parametrize('exercise_id', EXERCISE_IDS)
+def test_typical_solution_is_accepted(engine, exercise_id):
+    result = engine.check(exercise_id, SOLUTIONS[exercise_id])
+    assert result['correct'], result['feedback']
+    assert result['checks_passed'] == result['checks_total']
+
+
+@pytest.mark.parametrize('exercise_id', EXERCISE_IDS)
+@pytest.mark.parametrize('code', INCORRECT)
+def test_incorrect_submission_is_rejected(engine, exercise_id, code):
+    result = engine.check(exercise_id, code)
+    assert not result['correct']
+    assert result['checks_passed'] < result['checks_total']
+
+
+def test_overlapping_patterns_match_in_one_scan():
+    specs = [
+        {'pattern': r'ab', 'feedback': 'ab'},
+        {'pattern': r'abc', 'feedback': 'abc'},
+        {'pattern': r'b', 'feedback': 'b'},
+        {'pattern': r'zzz', 'feedback': 'zzz'},
+    ]
+    checker = LessonChecker('teste/1', specs, {})
+    assert checker._match_patterns({'source': 'xabc', 'strings': ''}) == {'p0', 'p1', 'p2'}
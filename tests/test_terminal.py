@@ -0,0 +1,265 @@
+"""
+Terminal interativo (utils/terminal_executor.py e utils/terminal_sessions.py)
+O Socket.IO é substituído por FakeSocketIO, que só registra os eventos emitidos.
+"""
+
+import time
+import threading
+
+import pytest
+
+from utils.terminal_executor import CoalescedOutput, InteractiveExecutor
+from utils.terminal_sessions import TerminalSessionManager
+
+
+class FakeSocketIO:
+    def __init__(self):
+        self.events = []
+        self._lock = threading.Lock()
+
+    def emit(self, event, data=None, room=None, **kwargs):
+        with self._lock:
+            self.events.append((event, data, room))
+
+    def emitted(self, name, room=None):
+        with self._lock:
+            return [data for event, data, target in self.events
+                    if event == name and (room is None or target == room)]
+
+    def output(self, room=None):
+        return ''.join(frame['data'] for frame in self.emitted('output', room))
+
+
+@pytest.fixture
+def socketio():
+    return FakeSocketIO()
+
+
+@pytest.fixture
+def make_manager(socketio):
+    managers = []
+
+    def make(**options):
+        manager = TerminalSessionManager(socketio, **options)
+        managers.append(manager)
+        return manager
+
+    yield make
+    # Encerra os processos que ainda aguardam input
+    for manager in managers:
+        for token in list(manager._sessions):
+            manager.remove(token)
+
+
+def wait_for(condition, timeout=5.0):
+    ends_at = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < ends_at, 'condição não atingida a tempo'
+        time.sleep(0.01)
+
+
+# ----------------------------------------------------------------------
+# Execução em processo filho
+# ----------------------------------------------------------------------
+
+def test_interactive_run_uses_the_provided_input(socketio):
+    executor = InteractiveExecutor(socketio, 'sessao-1')
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(
+        executor.execute('nome = input("Nome: ")\nprint(f"Oi, {nome}")')
+    ))
+    thread.start()
+    wait_for(lambda: socketio.emitted('request_input'))
+    executor.provide_input('Ana')
+    thread.join(10)
+
+    assert result['success'] is True
+    assert socketio.emitted('request_input')[0] == {'prompt': 'Nome: '}
+    assert 'Oi, Ana' in socketio.output()
+
+
+def test_input_wait_stops_at_the_run_deadline(socketio):
+    executor = InteractiveExecutor(socketio, 'sessao-1', input_timeout=30)
+    executor.max_seconds = 1
+    started = time.monotonic()
+    result = executor.execute('input("Valor: ")')
+
+    assert time.monotonic() - started < 5
+    assert result['success'] is False
+    assert result['limits_hit'] == ['time']
+
+
+# ----------------------------------------------------------------------
+# Fila de execuções
+# ----------------------------------------------------------------------
+
+WAITS_FOR_INPUT = 'valor = input("Valor: ")\nprint(valor)'
+
+
+def test_sessions_beyond_the_limit_wait_in_line(socketio, make_manager):
+    manager = make_manager(max_concurrent=1)
+    first, second = manager.open_session('sid-1'), manager.open_session('sid-2')
+
+    assert manager.submit(first, WAITS_FOR_INPUT) == {'queued': True, 'position': 1}
+    wait_for(lambda: manager.stats()['running'] == 1)
+    assert manager.submit(second, 'print("segundo")') == {'queued': True, 'position': 1}
+    assert manager.stats()['queued'] == 1
+
+    wait_for(lambda: socketio.emitted('request_input', first))
+    manager.provide_input(first, '7')
+    wait_for(lambda: socketio.emitted('execution_complete', second))
+
+    assert socketio.emitted('execution_complete', first)[0]['success'] is True
+    assert 'segundo' in socketio.output(second)
+    assert manager.stats()['executed'] == 2
+
+
+def test_full_queue_and_busy_session_are_refused(make_manager):
+    manager = make_manager(max_concurrent=1, max_queued=1)
+    tokens = [manager.open_session(f'sid-{index}') for index in range(3)]
+
+    manager.submit(tokens[0], WAITS_FOR_INPUT)
+    wait_for(lambda: manager.stats()['running'] == 1)
+    assert 'andamento' in manager.submit(tokens[0], 'print(1)')['error']
+    assert manager.submit(tokens[1], 'print(1)')['queued'] is True
+
+    refused = manager.submit(tokens[2], 'print(1)')
+    assert refused['queued'] is False
+    assert 'ocupado' in refused['error']
+    assert manager.stats()['rejected'] == 1
+
+
+def test_cancelling_a_queued_session_moves_the_line(socketio, make_manager):
+    manager = make_manager(max_concurrent=1)
+    tokens = [manager.open_session(f'sid-{index}') for index in range(3)]
+
+    manager.submit(tokens[0], WAITS_FOR_INPUT)
+    wait_for(lambda: manager.stats()['running'] == 1)
+    manager.submit(tokens[1], 'print(1)')
+    assert manager.submit(tokens[2], 'print(2)')['position'] == 2
+
+    manager.cancel(tokens[1])
+
+    assert 'cancelada' in socketio.emitted('execution_complete', tokens[1])[0]['error']
+    assert socketio.emitted('execution_queued', tokens[2])[-1] == {'position': 1}
+    assert manager.stats()['queued'] == 1
+
+
+# ----------------------------------------------------------------------
+# Saída agrupada em frames
+# ----------------------------------------------------------------------
+
+def test_small_writes_wait_for_flush(socketio):
+    output = CoalescedOutput(socketio, 'sessao-1', max_bytes=1024, interval=10)
+    for index in range(5):
+        output.write(f'{index}\n')
+    assert socketio.emitted('output') == []
+
+    output.flush()
+    assert socketio.emitted('output') == [{'data': '0\n1\n2\n3\n4\n', 'seq': 1}]
+    assert (output.frames, output.bytes) == (1, 10)
+
+
+def test_full_buffer_is_sent_at_once(socketio):
+    output = CoalescedOutput(socketio, 'sessao-1', max_bytes=8, interval=10)
+    output.write('abcd')
+    output.write('efgh')
+    output.write('i')
+    assert [frame['data'] for frame in socketio.emitted('output')] == ['abcdefgh']
+
+
+def test_flush_thread_sends_after_the_interval(socketio):
+    output = CoalescedOutput(socketio, 'sessao-1', max_bytes=1024, interval=0.01)
+    output.start()
+    output.write('oi\n')
+    wait_for(lambda: socketio.emitted('output'))
+    output.stop()
+    assert socketio.output() == 'oi\n'
+
+
+def test_many_prints_become_few_frames(socketio):
+    executor = InteractiveExecutor(socketio, 'sessao-1')
+    result = executor.execute('for i in range(500):\n    print(i)')
+
+    assert result['success'] is True
+    assert socketio.output() == ''.join(f'{i}\r\n' for i in range(500))
+    assert len(socketio.emitted('output')) < 50
+
+
+# ----------------------------------------------------------------------
+# Reconexão e reenvio da saída
+# ----------------------------------------------------------------------
+
+def test_replay_returns_frames_after_the_last_seen(socketio):
+    output = CoalescedOutput(socketio, 'sessao-1', interval=10)
+    for text in ('a', 'b', 'c'):
+        output.write(text)
+        output.flush()
+
+    frames, lost = output.replay(1)
+    assert frames == [{'seq': 2, 'data': 'b'}, {'seq': 3, 'data': 'c'}]
+    assert lost is False
+
+
+def test_replay_reports_output_dropped_from_history(socketio):
+    output = CoalescedOutput(socketio, 'sessao-1', interval=10, history_bytes=4)
+    for text in ('aaa', 'bbb', 'ccc'):
+        output.write(text)
+        output.flush()
+
+    frames, lost = output.replay(0)
+    assert frames == [{'seq': 3, 'data': 'ccc'}]
+    assert lost is True
+
+
+def test_new_run_clears_history_without_reporting_loss(socketio):
+    output = CoalescedOutput(socketio, 'sessao-1', interval=10)
+    output.write('execução anterior')
+    output.flush()
+    output.start()
+    output.write('nova')
+    output.stop()
+
+    assert output.replay(0) == ([{'seq': 2, 'data': 'nova'}], False)
+
+
+def test_client_resumes_a_running_session(socketio, make_manager):
+    manager = make_manager()
+    token = manager.open_session('sid-1')
+    manager.submit(token, 'print("inicio")\n' + WAITS_FOR_INPUT)
+    wait_for(lambda: socketio.emitted('request_input', token))
+
+    manager.detach('sid-1')
+    assert manager.stats()['orphaned'] == 1
+    resumed = manager.resume_session(token, 'sid-2', last_seq=0)
+
+    assert resumed['state'] == 'running'
+    assert resumed['pending_prompt'] == 'Valor: '
+    assert resumed['truncated'] is False
+    assert 'inicio' in ''.join(frame['data'] for frame in resumed['replay'])
+    assert manager.token_for('sid-2') == token
+
+    manager.provide_input(token, 'ok')
+    wait_for(lambda: socketio.emitted('execution_complete', token))
+    assert socketio.emitted('execution_complete', token)[0]['success'] is True
+
+
+def test_unknown_token_cannot_be_resumed(make_manager):
+    assert make_manager().resume_session('token-inexistente', 'sid-1') is None
+
+
+def test_orphans_are_reaped_after_the_grace_period(socketio, make_manager):
+    manager = make_manager(resume_grace=0.05, reap_interval=60)
+    token = manager.open_session('sid-1')
+    manager.submit(token, WAITS_FOR_INPUT)
+    wait_for(lambda: socketio.emitted('request_input', token))
+
+    manager.detach('sid-1')
+    time.sleep(0.1)
+    manager._reap_orphans()
+
+    stats = manager.stats()
+    assert stats['sessions'] == 0
+    assert stats['orphans_reaped'] == 1
+    wait_for(lambda: manager.stats()['running'] == 0)
+    assert manager.resume_session(token, 'sid-2') is None
@@ -0,0 +1,138 @@
+"""
+Cache LRU em memória, thread-safe, com limite de entradas, de tamanho e de validade
+"""
+
+import sys
+import time
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Cache LRU com contadores de acerto/erro e despejo por tamanho"""
+
+    def __init__(self, max_entries=256, max_bytes=0, sizeof=None, ttl=0):
+        """
+        Args:
+            max_entries: número máximo de entradas
+            max_bytes: tamanho total máximo (0 = sem limite)
+            sizeof: função que estima o tamanho de um valor em bytes
+            ttl: validade de cada entrada em segundos (0 = sem expiração)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof or sys.getsizeof
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._expires = {}
+        self._total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                if self.ttl and self._expires[key] <= time.monotonic():
+                    self._remove(key)
+                    self.expirations += 1
+                    self.misses += 1
+                    return default
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def peek(self, key, default=None):
+        """Como get, mas sem contar acerto/erro nem alterar a ordem LRU"""
+        with self._lock:
+            if key in self._data and (not self.ttl or self._expires[key] > time.monotonic()):
+                return self._data[key]
+            return default
+
+    def set(self, key, value, ttl=None):
+        """ttl: validade desta entrada (padrão: a do cache)"""
+        size = self.sizeof(value)
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+
+            # Valores maiores que o cache inteiro não são armazenados
+            if self.max_bytes and size > self.max_bytes:
+                return
+
+            self._data[key] = value
+            self._sizes[key] = size
+            self._total_bytes += size
+            if self.ttl:
+                self._expires[key] = time.monotonic() + ttl
+            self._evict()
+
+    def pop(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            return self._remove(key)
+
+    def items(self):
+        """Entradas válidas, da menos para a mais recente (não altera a ordem LRU)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value) for key, value in self._data.items()
+                if not self.ttl or self._expires[key] > now
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._expires.clear()
+            self._total_bytes = 0
+
+    def _remove(self, key):
+        self._total_bytes -= self._sizes.pop(key)
+        self._expires.pop(key, None)
+        return self._data.pop(key)
+
+    def _evict(self):
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_bytes and self._total_bytes > self.max_bytes)
+        ):
+            key = next(iter(self._data))
+            self._remove(key)
+            self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            if key not in self._data:
+                return False
+            return not self.ttl or self._expires[key] > time.monotonic()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._data),
+                'bytes': self._total_bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'ttl': self.ttl,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,84 @@
+"""
+Disjuntor (circuit breaker) para dependências externas
+Depois de várias falhas seguidas o circuito abre e as chamadas são puladas;
+passado o tempo de espera, uma única chamada de teste (half-open) decide se
+o circuito fecha de novo ou volta a abrir.
+"""
+
+import time
+import logging
+import threading
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Disjuntor thread-safe: allow() antes da chamada, record_*() com o resultado"""
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        """
+        Args:
+            name: nome usado nos logs
+            failure_threshold: falhas seguidas que abrem o circuito
+            reset_timeout: segundos com o circuito aberto até a chamada de teste
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._counters = {'rejected': 0, 'opened': 0, 'probes': 0}
+
+    def allow(self):
+        """Indica se a chamada pode ser feita agora"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                # Apenas uma chamada de teste por vez
+                self._probe_in_flight = True
+                self._counters['probes'] += 1
+                return True
+            self._counters['rejected'] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logging.info(f"✅ Circuito '{self.name}' fechado: dependência respondeu")
+            self.state = CLOSED
+            self._failures = 0
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._counters['opened'] += 1
+                logging.warning(f"⛔ Circuito '{self.name}' aberto após {self._failures} falha(s); "
+                                f"nova tentativa em {self.reset_timeout:.0f}s")
+
+    def release(self):
+        """Chamada abandonada sem resultado (ex.: cliente desconectou): libera o teste"""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self._failures,
+                'failure_threshold': self.failure_threshold,
+                'reset_timeout': self.reset_timeout,
+                **self._counters
+            }
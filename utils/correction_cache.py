@@ -0,0 +1,201 @@
+"""
+Cache de correções por exercício
+A chave combina o exercício com a impressão digital da AST do código do aluno:
+comentários, espaços e nomes de variáveis não alteram a chave, então soluções
+equivalentes de alunos diferentes reaproveitam a mesma correção.
+"""
+
+import os
+import ast
+import json
+import time
+import atexit
+import builtins
+import hashlib
+import logging
+import threading
+
+from utils.cache import LRUCache
+
+_BUILTIN_NAMES = set(dir(builtins))
+
+
+class _Canonicalizer(ast.NodeTransformer):
+    """Renomeia variáveis, funções e parâmetros para v0, v1... na ordem de aparição"""
+
+    def __init__(self):
+        self.names = {}
+        self.preserved = set()
+
+    def _canonical(self, name):
+        if name in _BUILTIN_NAMES or name in self.preserved:
+            return name
+        if name not in self.names:
+            self.names[name] = f'v{len(self.names)}'
+        return self.names[name]
+
+    def visit_Import(self, node):
+        # Nomes de módulos (ex.: math) fazem parte do significado do código
+        for alias in node.names:
+            self.preserved.add((alias.asname or alias.name).split('.')[0])
+        return node
+
+    def visit_ImportFrom(self, node):
+        for alias in node.names:
+            self.preserved.add(alias.asname or alias.name)
+        return node
+
+    def visit_Name(self, node):
+        node.id = self._canonical(node.id)
+        return node
+
+    def visit_arg(self, node):
+        node.arg = self._canonical(node.arg)
+        node.annotation = None
+        return node
+
+    def visit_FunctionDef(self, node):
+        node.name = self._canonical(node.name)
+        self._drop_docstring(node)
+        self.generic_visit(node)
+        return node
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        node.name = self._canonical(node.name)
+        self._drop_docstring(node)
+        self.generic_visit(node)
+        return node
+
+    def visit_Global(self, node):
+        node.names = [self._canonical(name) for name in node.names]
+        return node
+
+    visit_Nonlocal = visit_Global
+
+    @staticmethod
+    def _drop_docstring(node):
+        body = node.body
+        if len(body) > 1 and isinstance(body[0], ast.Expr) \
+                and isinstance(body[0].value, ast.Constant) and isinstance(body[0].value.value, str):
+            node.body = body[1:]
+
+
+def ast_fingerprint(code):
+    """
+    Impressão digital do código independente de comentários, espaços e nomes
+    Retorna: hash hexadecimal ou None se o código tiver erro de sintaxe
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    canonicalizer = _Canonicalizer()
+    # Imports primeiro: um módulo usado antes do import ainda é preservado
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            canonicalizer.visit(node)
+    canonicalizer.visit(tree)
+
+    dump = ast.dump(tree, annotate_fields=False, include_attributes=False)
+    return hashlib.sha256(dump.encode('utf-8')).hexdigest()
+
+
+class CorrectionCache:
+    """
+    Cache LRU com validade das correções, com persistência opcional em disco
+    Chave: (exercício, hash da descrição, impressão digital da AST)
+    """
+
+    def __init__(self, max_entries=None, ttl=None, path=None, save_interval=30):
+        """
+        Args:
+            max_entries: número máximo de correções em memória
+            ttl: validade de cada correção em segundos
+            path: arquivo JSON para manter o cache entre reinicializações (None = só memória)
+            save_interval: intervalo mínimo entre gravações no disco (segundos)
+        """
+        self.ttl = ttl or float(os.getenv('CORRECTION_CACHE_TTL', str(7 * 24 * 3600)))
+        self.path = path if path is not None else os.getenv('CORRECTION_CACHE_PATH') or None
+        self.save_interval = save_interval
+
+        self._cache = LRUCache(
+            max_entries=max_entries or int(os.getenv('CORRECTION_CACHE_ENTRIES', '2048')),
+            sizeof=lambda entry: len(json.dumps(entry['result'])),
+            ttl=self.ttl
+        )
+        self._save_lock = threading.Lock()
+        self._last_save = time.monotonic()
+        self._dirty = False
+        self.loaded = 0
+
+        if self.path:
+            self.load()
+            atexit.register(self.save)
+
+    @staticmethod
+    def make_key(code, exercise_id, exercise_description=''):
+        """Chave do cache ou None se o código não puder ser analisado"""
+        fingerprint = ast_fingerprint(code)
+        if fingerprint is None:
+            return None
+        description_hash = hashlib.sha256(exercise_description.encode('utf-8')).hexdigest()[:16]
+        return f'{exercise_id}:{description_hash}:{fingerprint}'
+
+    def get(self, key):
+        if key is None:
+            return None
+        entry = self._cache.get(key)
+        return dict(entry['result']) if entry else None
+
+    def set(self, key, result):
+        if key is None:
+            return
+        self._cache.set(key, {'result': result, 'stored_at': time.time()})
+        self._dirty = True
+        if self.path and time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+
+    def load(self):
+        """Carrega as correções ainda válidas do arquivo"""
+        try:
+            with open(self.path, encoding='utf-8') as cache_file:
+                entries = json.load(cache_file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logging.warning(f"Não foi possível carregar o cache de correções: {e}")
+            return
+
+        now = time.time()
+        for key, entry in entries.items():
+            remaining = self.ttl - (now - entry.get('stored_at', 0))
+            if remaining > 0:
+                self._cache.set(key, entry, ttl=remaining)
+                self.loaded += 1
+        logging.info(f"📦 Cache de correções: {self.loaded} correção(ões) carregada(s) de {self.path}")
+
+    def save(self):
+        """Grava o cache no disco (escrita atômica via arquivo temporário)"""
+        if not self.path or not self._dirty:
+            return
+        with self._save_lock:
+            self._dirty = False
+            self._last_save = time.monotonic()
+            temp_path = f'{self.path}.tmp'
+            try:
+                with open(temp_path, 'w', encoding='utf-8') as cache_file:
+                    json.dump(dict(self._cache.items()), cache_file, ensure_ascii=False)
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                self._dirty = True
+                logging.warning(f"Não foi possível gravar o cache de correções: {e}")
+
+    def stats(self):
+        return {
+            **self._cache.stats(),
+            'path': self.path,
+            'loaded': self.loaded,
+        }
@@ -0,0 +1,119 @@
+"""
+Leitura incremental da correção da IA durante o streaming
+O modelo responde um objeto JSON {"correct", "score", "feedback", "suggestions"};
+à medida que os trechos chegam, o parser emite o veredito (correct e score) assim
+que ambos aparecem e o texto do feedback caractere a caractere, já decodificado.
+O JSON completo é validado no final pelo AICorrector.
+"""
+
+import re
+import json
+
+_CORRECT_RE = re.compile(r'"correct"\s*:\s*(true|false|null)')
+# O número só é lido depois do separador: "score": 8 pode ainda virar 87
+_SCORE_RE = re.compile(r'"score"\s*:\s*(-?\d+(?:\.\d+)?)\s*[,}]')
+_FEEDBACK_RE = re.compile(r'"feedback"\s*:\s*"')
+
+_SIMPLE_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+class CorrectionStreamParser:
+    """Parser incremental da resposta da IA (um por correção)"""
+
+    def __init__(self):
+        self.text = ''
+        self.verdict = None
+        self.feedback = ''
+        self._correct = None
+        self._score = None
+        self._feedback_pos = None  # posição do próximo caractere do feedback em self.text
+        self._feedback_done = False
+
+    def feed(self, chunk):
+        """
+        Acrescenta um trecho da resposta
+        Retorna: lista de eventos (nome, dados): ('verdict', {correct, score})
+                 e ('feedback', {delta})
+        """
+        self.text += chunk
+        events = []
+
+        if self.verdict is None:
+            if self._correct is None:
+                match = _CORRECT_RE.search(self.text)
+                if match:
+                    self._correct = json.loads(match.group(1))
+                    if self._correct is None:
+                        self._correct = False
+            if self._score is None:
+                match = _SCORE_RE.search(self.text)
+                if match:
+                    self._score = max(0, min(100, int(float(match.group(1)))))
+            if self._correct is not None and self._score is not None:
+                self.verdict = {'correct': bool(self._correct), 'score': self._score}
+                events.append(('verdict', dict(self.verdict)))
+
+        if not self._feedback_done:
+            if self._feedback_pos is None:
+                match = _FEEDBACK_RE.search(self.text)
+                if match:
+                    self._feedback_pos = match.end()
+            if self._feedback_pos is not None:
+                delta = self._decode_feedback()
+                if delta:
+                    self.feedback += delta
+                    events.append(('feedback', {'delta': delta}))
+
+        return events
+
+    def _decode_feedback(self):
+        """Decodifica o feedback até o fim do texto recebido (ou até a aspa final)"""
+        text = self.text
+        pos = self._feedback_pos
+        decoded = []
+        while pos < len(text):
+            char = text[pos]
+            if char == '"':
+                self._feedback_done = True
+                pos += 1
+                break
+            if char != '\\':
+                decoded.append(char)
+                pos += 1
+                continue
+
+            # Sequência de escape: espera o restante chegar se estiver incompleta
+            if pos + 1 >= len(text):
+                break
+            kind = text[pos + 1]
+            if kind in _SIMPLE_ESCAPES:
+                decoded.append(_SIMPLE_ESCAPES[kind])
+                pos += 2
+                continue
+            if kind != 'u':
+                # Escape inválido: mantém o texto como veio (a validação final decide)
+                decoded.append(kind)
+                pos += 2
+                continue
+            if pos + 6 > len(text):
+                break
+            code = int(text[pos + 2:pos + 6], 16) if _is_hex(text[pos + 2:pos + 6]) else 0xFFFD
+            if 0xD800 <= code <= 0xDBFF:
+                # Par substituto (ex.: emoji): decodifica as duas metades juntas
+                if pos + 12 > len(text):
+                    break
+                low = text[pos + 8:pos + 12] if text[pos + 6:pos + 8] == '\\u' else ''
+                if _is_hex(low):
+                    code = 0x10000 + ((code - 0xD800) << 10) + (int(low, 16) - 0xDC00)
+                    pos += 6
+                else:
+                    code = 0xFFFD
+            decoded.append(chr(code))
+            pos += 6
+
+        self._feedback_pos = pos
+        return ''.join(decoded)
+
+
+def _is_hex(value):
+    return len(value) == 4 and all(char in '0123456789abcdefABCDEF' for char in value)
@@ -0,0 +1,199 @@
+"""
+Correção determinística baseada nos exemplos dos exercícios
+Os blocos "Exemplo" de cada template (lidos pelo registro de exercícios) viram casos de teste;
+o código do aluno é executado contra eles e a saída é comparada de forma tolerante.
+Cada input() recebe o valor da linha do exemplo na mesma posição, e nas linhas de
+entrada só o valor é comparado (o texto do prompt fica livre). Quando as entradas
+não se alinham com o exemplo o corretor não decide e a correção segue pelas regras/IA.
+"""
+
+import re
+import logging
+import unicodedata
+
+from utils.exercise_registry import registry as exercise_registry
+
+_TOKEN_RE = re.compile(r'-?\d+(?:\.\d+)?|\S')
+
+
+def _normalize_line(line):
+    """Remove acentos e caixa para comparar textos de forma tolerante"""
+    decomposed = unicodedata.normalize('NFKD', line.strip())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def _tokens(line):
+    # Espaços são ignorados: 'MEDIA=9' e 'MEDIA = 9' geram os mesmos tokens
+    return _TOKEN_RE.findall(_normalize_line(line))
+
+
+def _numbers_match(expected, actual):
+    """Compara números com a precisão exibida no exemplo (9.00 == 9.0, 12.987 != 12.99)"""
+    decimals = len(expected.split('.')[1]) if '.' in expected else 0
+    tolerance = 0.5 * 10 ** -decimals + 1e-9
+    return abs(float(expected) - float(actual)) <= tolerance
+
+
+def lines_match(expected, actual):
+    return _tokens_match(_tokens(expected), _tokens(actual))
+
+
+def value_matches(value, actual):
+    """Linha de entrada: a linha exibida termina com o valor digitado"""
+    value_tokens = _tokens(value)
+    actual_tokens = _tokens(actual)
+    if not value_tokens or len(actual_tokens) < len(value_tokens):
+        return False
+    return _tokens_match(value_tokens, actual_tokens[-len(value_tokens):])
+
+
+def _tokens_match(expected_tokens, actual_tokens):
+    if len(expected_tokens) != len(actual_tokens):
+        return False
+
+    for exp, act in zip(expected_tokens, actual_tokens):
+        if exp == act:
+            continue
+        if exp[-1:].isdigit() and act[-1:].isdigit():
+            if _numbers_match(exp, act):
+                continue
+        return False
+    return True
+
+
+def _label_only(line):
+    """Linha que é só um rótulo ('DIAGONAL PRINCIPAL:'), com os valores na linha seguinte"""
+    return line.strip().endswith(':')
+
+
+def compare_output(expected_lines, output, inputs=None):
+    """
+    Compara a saída com a transcrição esperada (linhas em branco são ignoradas)
+    Um rótulo terminado em ':' e os valores da linha seguinte podem vir numa linha só.
+    inputs: [posição, valor] das linhas de entrada (transcript_inputs da execução)
+    Retorna: (bool, dict com a primeira divergência ou None)
+    """
+    expected = [line for line in expected_lines if line.strip()]
+    actual = [line for line in output.split('\n') if line.strip()]
+    input_values = {position: value for position, value in (inputs or [])}
+
+    index = 0  # linha do exemplo
+    position = 0  # linha da saída (posição usada pelas entradas)
+    while index < len(expected):
+        expected_line = expected[index]
+        if position >= len(actual):
+            return False, {'line': index + 1, 'expected': expected_line.strip(), 'actual': None}
+        if position in input_values:
+            matches = value_matches(input_values[position], actual[position])
+        else:
+            matches = lines_match(expected_line, actual[position])
+            if (not matches and _label_only(expected_line) and index + 1 < len(expected)
+                    and lines_match(f'{expected_line} {expected[index + 1]}', actual[position])):
+                # Rótulo e valores do exemplo exibidos na mesma linha
+                index += 1
+                matches = True
+        if not matches:
+            return False, {'line': index + 1, 'expected': expected_line.strip(), 'actual': actual[position].strip()}
+        index += 1
+        position += 1
+
+    if len(actual) > position:
+        return False, {'line': index + 1, 'expected': None, 'actual': actual[position].strip()}
+    return True, None
+
+
+class ExampleGrader:
+    """Corrige exercícios executando o código contra os exemplos da aula"""
+
+    def __init__(self, registry=None):
+        registry = registry or exercise_registry
+        # Casos de teste de cada aula: {(modulo, aula): [transcrições]}
+        self.suites = {
+            (exercise['module'], exercise['lesson']): exercise['examples']
+            for exercise in registry if exercise['examples']
+        }
+        logging.info(f"📚 Casos de teste carregados para {len(self.suites)} aulas")
+
+    def has_suite(self, module, lesson_number):
+        return (module, lesson_number) in self.suites
+
+    def grade(self, code, module, lesson_number, executor):
+        """
+        Executa o código contra todos os exemplos da aula
+        Retorna: dict no formato do AICorrector (correct, feedback, score, suggestions)
+                 ou None se a aula não possui exemplos ou as entradas do programa não
+                 se alinham com eles (a correção segue pelas regras/IA)
+        """
+        examples = self.suites.get((module, lesson_number))
+        if not examples:
+            return None
+
+        results = executor.execute_transcripts(code, examples)
+        if any(result.get('transcript_misaligned') for result in results):
+            logging.info(f"↪️ Entradas fora do formato dos exemplos de {module}/{lesson_number}; correção sem exemplos")
+            return None
+
+        failures = []
+        for index, (example, result) in enumerate(zip(examples, results), start=1):
+            if not result['success']:
+                error = (result.get('error') or '').strip().split('\n')[0]
+                failures.append({'example': index, 'error': error})
+                continue
+            ok, mismatch = compare_output(example, result['output'], result.get('transcript_inputs'))
+            if not ok:
+                failures.append({'example': index, 'mismatch': mismatch})
+
+        total = len(examples)
+        passed = total - len(failures)
+
+        if not failures:
+            return {
+                "correct": True,
+                "feedback": f"Excelente! Seu programa produziu a saída esperada em todos os {total} exemplo(s) do exercício.",
+                "score": 100,
+                "suggestions": [
+                    "Teste também com outros valores de entrada",
+                    "Revise se seus nomes de variáveis são claros",
+                    "Você está pronto para a próxima aula"
+                ],
+                "examples_passed": passed,
+                "examples_total": total
+            }
+
+        return {
+            "correct": False,
+            "feedback": f"Seu programa passou em {passed} de {total} exemplo(s). " + self._describe_failure(failures[0]),
+            "score": round(100 * passed / total * 0.9),
+            "suggestions": self._suggestions(failures[0]),
+            "examples_passed": passed,
+            "examples_total": total
+        }
+
+    def _describe_failure(self, failure):
+        if 'error' in failure:
+            return f"No Exemplo {failure['example']} a execução falhou: {failure['error']}"
+
+        mismatch = failure['mismatch']
+        if mismatch['actual'] is None:
+            return f"No Exemplo {failure['example']} faltou exibir a linha \"{mismatch['expected']}\"."
+        if mismatch['expected'] is None:
+            return f"No Exemplo {failure['example']} seu programa exibiu uma linha a mais: \"{mismatch['actual']}\"."
+        return (f"No Exemplo {failure['example']}, linha {mismatch['line']}, era esperado "
+                f"\"{mismatch['expected']}\" mas seu programa exibiu \"{mismatch['actual']}\".")
+
+    def _suggestions(self, failure):
+        if 'error' in failure:
+            return [
+                "Execute seu código com os valores do exemplo e leia a mensagem de erro",
+                "Confira se você lê a quantidade certa de valores com input()",
+                "Verifique se não há loops infinitos"
+            ]
+        return [
+            "Compare sua saída com o exemplo linha por linha",
+            "Confira as mensagens dos input() e dos print()",
+            "Verifique a formatação das casas decimais (ex.: f\"{valor:.2f}\")"
+        ]
+
+
+# Instância global do corretor por exemplos
+grader = ExampleGrader()
@@ -0,0 +1,396 @@
+"""
+Pool de processos pré-iniciados para execução de código dos alunos
+Cada job roda fora do worker do Flask/gunicorn, com limite de tempo real e de CPU.
+Workers que estouram o limite são encerrados e substituídos automaticamente; se a
+substituição falhar, a vaga é preenchida no próximo job. Os workers recebem um
+ambiente mínimo, sem as credenciais do servidor.
+"""
+
+import os
+import sys
+import json
+import signal
+import logging
+import threading
+import subprocess
+import time
+import types
+import base64
+import marshal
+from queue import Queue, Empty, Full
+
+# Raiz do projeto (necessária para o worker importar o pacote utils)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Variáveis de ambiente repassadas ao worker; as demais (OPENAI_API_KEY,
+# FIREBASE_CREDENTIALS...) não chegam ao processo que roda o código do aluno
+WORKER_ENV = ('PATH', 'PYTHONPATH', 'PYTHONHOME', 'LANG', 'LANGUAGE', 'TZ',
+              'SYSTEMROOT', 'TEMP', 'TMP', 'TMPDIR')
+WORKER_ENV_PREFIXES = ('LC_', 'EXECUTOR_')
+
+
+def worker_environment():
+    """Ambiente mínimo do worker: caminhos, locale e a configuração do executor"""
+    env = {
+        name: value for name, value in os.environ.items()
+        if name in WORKER_ENV or name.startswith(WORKER_ENV_PREFIXES)
+    }
+    env['PYTHONIOENCODING'] = 'utf-8'
+    env['PYTHONDONTWRITEBYTECODE'] = '1'
+    # O worker importa utils.executor: evita que ele tente criar outro pool
+    env['EXECUTOR_BACKEND'] = 'inline'
+    return env
+
+
+class SandboxProcess:
+    """
+    Processo Python pré-aquecido que executa um job por vez
+    Usado pelo pool e, um por execução, pelo terminal interativo
+    """
+
+    def __init__(self, worker_id):
+        self.worker_id = worker_id
+        self.jobs_done = 0
+
+        self.process = subprocess.Popen(
+            [sys.executable, '-u', '-m', 'utils.sandbox_worker'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=ROOT,
+            env=worker_environment(),
+            start_new_session=(os.name == 'posix')
+        )
+
+        # Thread leitora: permite esperar respostas com timeout em qualquer SO.
+        # A fila é limitada: se ninguém consome a saída, o pipe enche e o worker
+        # fica bloqueado ao escrever (backpressure no modo streaming)
+        self.closed = False
+        self.responses = Queue(maxsize=64)
+        self.reader = threading.Thread(target=self._read_loop, daemon=True)
+        self.reader.start()
+
+    def _read_loop(self):
+        for line in self.process.stdout:
+            try:
+                self._put(json.loads(line.decode('utf-8')))
+            except ValueError:
+                continue
+        # EOF: o processo terminou (ex.: morto por SIGXCPU ou falta de memória)
+        self._put(None)
+
+    def _put(self, message):
+        while not self.closed:
+            try:
+                self.responses.put(message, timeout=0.5)
+                return
+            except Full:
+                continue
+        # Processo encerrado por kill(): entrega sem bloquear para quem ainda aguarda
+        try:
+            self.responses.put_nowait(message)
+        except Full:
+            pass
+
+    def wait_ready(self, timeout):
+        message = self.responses.get(timeout=timeout)
+        return bool(message and message.get('ready'))
+
+    def send(self, job):
+        self.process.stdin.write((json.dumps(job) + '\n').encode('utf-8'))
+        self.process.stdin.flush()
+
+    def receive(self, timeout):
+        return self.responses.get(timeout=timeout)
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def exit_reason(self):
+        """Identifica qual limite derrubou o processo, se possível"""
+        try:
+            returncode = self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            return None
+        if hasattr(signal, 'SIGXCPU') and returncode == -signal.SIGXCPU:
+            return 'cpu'
+        if returncode in (-signal.SIGKILL, -getattr(signal, 'SIGSEGV', 11)):
+            # Normalmente o kernel mata o processo por falta de memória
+            return 'memory'
+        return None
+
+    def kill(self):
+        """Encerra o processo (e o grupo de processos, quando suportado)"""
+        self.closed = True
+        try:
+            if os.name == 'posix':
+                os.killpg(self.process.pid, signal.SIGKILL)
+            else:
+                self.process.kill()
+        except (ProcessLookupError, PermissionError, OSError):
+            pass
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            pass
+        try:
+            self.process.stdin.close()
+        except OSError:
+            pass
+
+
+class ExecutionPool:
+    """Pool de workers com fila limitada e deadline por job"""
+
+    def __init__(self, size=2, queue_depth=16, timeout=10,
+                 max_jobs_per_worker=200, startup_timeout=10):
+        self.size = max(1, size)
+        self.queue_depth = max(0, queue_depth)
+        self.timeout = timeout
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.startup_timeout = startup_timeout
+
+        self._lock = threading.Condition()
+        self._idle = []
+        self._busy = 0
+        self._waiting = 0
+        self._started = False
+
+        self._counters = {
+            'completed': 0,
+            'timeouts': 0,
+            'crashed': 0,
+            'killed': 0,
+            'rejected': 0,
+            'cancelled': 0,
+            'spawned': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Inicia os workers (chamado automaticamente no primeiro job)"""
+        with self._lock:
+            if self._started:
+                return
+            for _ in range(self.size):
+                self._idle.append(self._spawn())
+            self._started = True
+
+    def shutdown(self):
+        """Encerra todos os workers ociosos"""
+        with self._lock:
+            for worker in self._idle:
+                worker.kill()
+            self._idle = []
+            self._started = False
+
+    def _spawn(self):
+        with self._lock:
+            self._counters['spawned'] += 1
+            worker_id = self._counters['spawned']
+        worker = SandboxProcess(worker_id)
+        try:
+            ready = worker.wait_ready(self.startup_timeout)
+        except Empty:
+            worker.kill()
+            raise OSError("Timeout ao iniciar worker de execução")
+        if not ready:
+            worker.kill()
+            raise OSError("Worker de execução não iniciou corretamente")
+        return worker
+
+    # ------------------------------------------------------------------
+    # Despacho de jobs
+    # ------------------------------------------------------------------
+
+    def _vacant(self):
+        """Há vaga de um worker que não pôde ser substituído (chamar com a trava)"""
+        return self._started and len(self._idle) + self._busy < self.size
+
+    def _acquire(self, deadline):
+        with self._lock:
+            if not self._idle and not self._vacant() and self._waiting >= self.queue_depth:
+                self._counters['rejected'] += 1
+                return None
+
+            self._waiting += 1
+            try:
+                while not self._idle:
+                    if self._vacant():
+                        # A vaga fica reservada (busy) enquanto o worker é recriado
+                        self._busy += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._counters['rejected'] += 1
+                        return None
+                    self._lock.wait(remaining)
+                else:
+                    self._busy += 1
+                    return self._idle.pop()
+            finally:
+                self._waiting -= 1
+
+        # Recria fora da trava: iniciar um processo leva centenas de milissegundos
+        try:
+            return self._spawn()
+        except OSError as e:
+            logging.error(f"Falha ao recriar worker de execução: {e}")
+            with self._lock:
+                self._busy -= 1
+                self._counters['rejected'] += 1
+                self._lock.notify()
+            return None
+
+    def _release(self, worker, healthy):
+        replacement = None
+        if not healthy or worker.jobs_done >= self.max_jobs_per_worker:
+            worker.kill()
+            try:
+                replacement = self._spawn()
+            except OSError as e:
+                # A vaga é preenchida no próximo _acquire
+                logging.error(f"Falha ao substituir worker de execução: {e}")
+        else:
+            replacement = worker
+
+        with self._lock:
+            self._busy -= 1
+            if replacement is not None:
+                self._idle.append(replacement)
+            self._lock.notify()
+
+    def run(self, code, inputs=None, limits=None, timeout=None, transcript=None, profile=False):
+        """
+        Executa o código em um worker do pool
+        Args:
+            code: fonte (str) ou objeto de código compilado, enviado via marshal
+            limits: dict de limites (cpu_seconds, max_memory_mb, max_output_bytes...)
+            profile: pede ao worker o perfil da execução (memória e linhas)
+        Retorna o mesmo dict de CodeExecutor.execute_python_code
+        """
+        result = None
+        for event, payload in self.run_stream(code, inputs, limits, timeout, transcript,
+                                              stream=False, profile=profile):
+            if event == 'result':
+                result = payload
+        return result
+
+    def run_stream(self, code, inputs=None, limits=None, timeout=None, transcript=None,
+                   stream=True, profile=False):
+        """
+        Executa o código em um worker do pool, repassando a saída em trechos
+        Gera ('output', {'data': trecho}) durante a execução e ('result', dict) no final.
+        Se o consumidor parar de ler, a fila limitada segura o worker (backpressure);
+        se o gerador for fechado antes do fim, o worker é encerrado.
+        """
+        self.start()
+
+        timeout = timeout or self.timeout
+        # O tempo de espera na fila também conta para o deadline total
+        started = time.monotonic()
+        deadline = started + timeout
+
+        worker = self._acquire(deadline)
+        if worker is None:
+            yield 'result', self._failure(
+                started, 'Servidor ocupado: muitas execuções simultâneas. Tente novamente em instantes.'
+            )
+            return
+
+        healthy = False
+        try:
+            job = {
+                'inputs': inputs,
+                'limits': limits or {},
+                'transcript': transcript,
+                'stream': stream,
+                'profile': profile,
+            }
+            if isinstance(code, types.CodeType):
+                # O worker usa o bytecode direto, sem compilar de novo
+                job['bytecode'] = base64.b64encode(marshal.dumps(code)).decode('ascii')
+            else:
+                job['code'] = code
+            worker.send(job)
+
+            while True:
+                frame = worker.receive(max(0, deadline - time.monotonic()))
+
+                if frame is None:
+                    # Worker morreu durante o job (limite de CPU ou memória)
+                    worker.jobs_done += 1
+                    reason = worker.exit_reason()
+                    with self._lock:
+                        self._counters['crashed'] += 1
+                        self._counters['killed'] += 1
+                    messages = {
+                        'cpu': 'Execução interrompida: limite de tempo de CPU excedido.',
+                        'memory': 'Execução interrompida: limite de memória excedido.',
+                    }
+                    yield 'result', self._failure(
+                        started,
+                        messages.get(reason, 'Execução interrompida: limite de recursos excedido.'),
+                        [reason] if reason else []
+                    )
+                    return
+
+                if frame.get('event') == 'output':
+                    yield 'output', {'data': frame['data']}
+                    continue
+
+                worker.jobs_done += 1
+                healthy = True
+                with self._lock:
+                    self._counters['completed'] += 1
+                yield 'result', frame
+                return
+
+        except Empty:
+            with self._lock:
+                self._counters['timeouts'] += 1
+                self._counters['killed'] += 1
+            yield 'result', self._failure(
+                started,
+                f'Tempo limite de execução excedido ({timeout:g}s). Verifique se há loops infinitos.',
+                ['time']
+            )
+        except (OSError, ValueError) as e:
+            logging.error(f"Erro de comunicação com worker de execução: {e}")
+            yield 'result', self._failure(started, 'Erro interno ao executar o código')
+        except GeneratorExit:
+            # Cliente desconectou no meio da execução: o worker é descartado
+            with self._lock:
+                self._counters['cancelled'] += 1
+                self._counters['killed'] += 1
+            raise
+        finally:
+            self._release(worker, healthy and worker.is_alive())
+
+    @staticmethod
+    def _failure(started, error, limits_hit=None):
+        return {
+            'success': False,
+            'output': '',
+            'error': error,
+            'input_needed': False,
+            'truncated': False,
+            'limits_hit': limits_hit or [],
+            'usage': {'wall_seconds': round(time.monotonic() - started, 4)}
+        }
+
+    def stats(self):
+        """Estatísticas do pool (ocupados, ociosos, fila, encerrados...)"""
+        with self._lock:
+            return {
+                'size': self.size,
+                'busy': self._busy,
+                'idle': len(self._idle),
+                'queued': self._waiting,
+                'queue_depth': self.queue_depth,
+                'timeout': self.timeout,
+                **self._counters
+            }
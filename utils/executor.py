@@ -1,116 +1,674 @@
 import sys
 import io
+import re
 import traceback
 import subprocess
 import tempfile
 import os
+import logging
+import time
+import hashlib
+import tokenize
+import types
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+import marshal
 from contextlib import redirect_stdout, redirect_stderr
 
+from utils.cache import LRUCache
+from utils import preflight
+
+# Builtins liberados para o código do aluno
+SAFE_BUILTINS = {
+    'print': print,
+    'len': len,
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': bool,
+    'list': list,
+    'dict': dict,
+    'tuple': tuple,
+    'set': set,
+    'range': range,
+    'enumerate': enumerate,
+    'zip': zip,
+    'sum': sum,
+    'max': max,
+    'min': min,
+    'abs': abs,
+    'round': round,
+    'sorted': sorted,
+    'reversed': reversed,
+    'type': type,
+    'isinstance': isinstance,
+}
+
+
+def _safe_import(name, globals=None, locals=None, fromlist=(), level=0):
+    """Import restrito aos módulos liberados no preflight"""
+    if level or name not in preflight.ALLOWED_MODULES:
+        raise ImportError(f"Importar '{name}' não é permitido")
+    module = __import__(name)
+    # Cópia por execução: alterações do aluno (ex.: math.pi = 3) não vazam para a próxima
+    return types.SimpleNamespace(**{
+        attr: value for attr, value in vars(module).items() if not attr.startswith('_')
+    })
+
+
+SAFE_BUILTINS['__import__'] = _safe_import
+
+
+# Limites padrão por execução (0 desativa o limite)
+DEFAULT_LIMITS = {
+    'max_output_bytes': int(os.getenv('EXECUTOR_MAX_OUTPUT_BYTES', str(64 * 1024))),
+    'max_memory_mb': int(os.getenv('EXECUTOR_MAX_MEMORY_MB', '256')),
+    'cpu_seconds': float(os.getenv('EXECUTOR_CPU_SECONDS', os.getenv('EXECUTOR_TIMEOUT', '10'))),
+    'max_line_events': int(os.getenv('EXECUTOR_MAX_LINE_EVENTS', '0')),
+}
+
+
+class LimitExceeded(BaseException):
+    """
+    Interrompe a execução quando um limite é atingido
+    Herda de BaseException para que um 'except Exception' do aluno não a capture
+    """
+
+    def __init__(self, limit, message):
+        super().__init__(message)
+        self.limit = limit
+        self.message = message
+
+
+class BoundedOutput(io.TextIOBase):
+    """Buffer de saída que trunca ao atingir o limite de bytes"""
+
+    def __init__(self, max_bytes=0, on_write=None):
+        """
+        Args:
+            max_bytes: limite de bytes (0 = sem limite)
+            on_write: callback chamado com cada trecho aceito (saída em streaming)
+        """
+        self.max_bytes = max_bytes
+        self.on_write = on_write
+        self.size = 0
+        self.truncated = False
+        self._parts = []
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        if self.truncated:
+            raise LimitExceeded('output', self._limit_message())
+
+        size = len(text.encode('utf-8'))
+        if self.max_bytes and self.size + size > self.max_bytes:
+            # Guarda apenas o que cabe e interrompe o programa
+            remaining = self.max_bytes - self.size
+            self._append(text.encode('utf-8')[:remaining].decode('utf-8', 'ignore'))
+            self.size = self.max_bytes
+            self.truncated = True
+            raise LimitExceeded('output', self._limit_message())
+
+        self._append(text)
+        self.size += size
+        return len(text)
+
+    def _append(self, text):
+        self._parts.append(text)
+        if self.on_write and text:
+            self.on_write(text)
+
+    def getvalue(self):
+        return ''.join(self._parts)
+
+    def _limit_message(self):
+        return f"Limite de saída excedido ({self.max_bytes // 1024} KB). A saída foi truncada."
+
+
+def _make_line_tracer(max_events, counter, line_counts=None):
+    """
+    Cria um tracer que conta eventos de linha do código do aluno
+    line_counts: dict {linha: execuções} preenchido no modo de perfil
+    """
+
+    def local_trace(frame, event, arg):
+        if event == 'line':
+            counter[0] += 1
+            if line_counts is not None:
+                line_counts[frame.f_lineno] = line_counts.get(frame.f_lineno, 0) + 1
+            if max_events and counter[0] > max_events:
+                raise LimitExceeded(
+                    'instructions',
+                    f"Limite de instruções excedido ({max_events} linhas executadas). Verifique se há loops muito longos."
+                )
+        return local_trace
+
+    def global_trace(frame, event, arg):
+        # Só instrumenta frames do código do aluno
+        if frame.f_code.co_filename == '<string>':
+            return local_trace
+        return None
+
+    return global_trace
+
+
+class TranscriptMisaligned(BaseException):
+    """
+    As entradas do programa não se alinham com a transcrição do exemplo
+    Herda de BaseException para que um 'except Exception' do aluno não a capture
+    """
+
+
+# Linha de entrada na transcrição: prompt terminado em ':' ou '?' seguido do valor digitado
+_TRANSCRIPT_INPUT_RE = re.compile(r'^.*[:?]\s+(\S.*)$')
+
+
+def _transcript_input_value(transcript, printed, prompt):
+    """
+    Valor de entrada pela posição: a linha da transcrição na posição em que o programa
+    está (linhas já exibidas, sem contar as em branco) traz o valor após o último ':'
+    ou '?' ou, sem separador, na linha inteira. O texto do prompt não é comparado:
+    o aluno pode escrevê-lo com outras palavras ou omiti-lo
+    Retorna: (posição da linha, valor) ou None se não há valor nessa posição
+    """
+    expected = [line.strip() for line in transcript if line.strip()]
+    lines = (printed + prompt).split('\n')
+    position = sum(1 for line in lines[:-1] if line.strip())
+    if position >= len(expected):
+        return None
+
+    line = expected[position]
+    match = _TRANSCRIPT_INPUT_RE.match(line)
+    if match:
+        return position, match.group(1)
+    if line.endswith((':', '?')):
+        # Linha só com o prompt: no exemplo o valor vem em outra linha
+        return None
+    return position, line
+
+
+def _build_profile(wall_seconds, cpu_seconds, peak_memory, line_counts):
+    """Resumo compacto do perfil de uma execução"""
+    hot_lines = sorted(line_counts.items(), key=lambda item: item[1], reverse=True)[:5]
+    return {
+        'wall_seconds': wall_seconds,
+        'cpu_seconds': cpu_seconds,
+        'peak_memory_kb': round(peak_memory / 1024, 1),
+        'line_events': sum(line_counts.values()),
+        # Listas [linha, execuções]: chaves int não sobrevivem ao JSON
+        'line_counts': sorted([line, count] for line, count in line_counts.items()),
+        'hot_lines': [[line, count] for line, count in hot_lines],
+    }
+
+
+def run_sandboxed(code, inputs=None, limits=None, transcript=None, on_output=None, profile=False,
+                  input_provider=None):
+    """
+    Executa o código no processo atual com builtins restritos
+    Usado diretamente pelo modo inline e pelos workers do pool
+    code pode ser o fonte (str) ou um objeto de código já compilado
+    transcript: linhas de um exemplo (entrada + saída); quando informado, cada
+                input() recebe o valor da linha na mesma posição da transcrição e o
+                resultado ganha 'transcript_inputs' ([posição, valor] de cada entrada)
+    on_output: callback chamado com cada trecho escrito no stdout (streaming)
+    profile: mede memória (tracemalloc) e execuções por linha; o resultado ganha 'profile'
+    input_provider: função (prompt) -> valor para input() interativo (terminal)
+    Retorna: dict com success, output, error, input_needed, limits_hit e usage
+    """
+    limits = {**DEFAULT_LIMITS, **(limits or {})}
+
+    # Captura stdout e stderr
+    stdout_capture = BoundedOutput(limits['max_output_bytes'], on_output)
+    stderr_capture = BoundedOutput(limits['max_output_bytes'])
+    line_events = [0]
+    line_counts = {} if profile else None
+    limits_hit = []
+    transcript_inputs = []
+
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+
+    try:
+        # Cria um iterador para os inputs
+        input_iterator = iter(inputs if inputs else [])
+
+        def mock_input(prompt=""):
+            """Input simulado que usa valores pré-fornecidos"""
+            if input_provider is not None:
+                # Terminal interativo: o prompt e o valor já aparecem no terminal do aluno
+                return str(input_provider(str(prompt)))
+            try:
+                if transcript is not None:
+                    aligned = _transcript_input_value(transcript, stdout_capture.getvalue(), str(prompt))
+                    if aligned is None:
+                        raise TranscriptMisaligned("A leitura de entrada não corresponde a um valor do exemplo")
+                    position, value = aligned
+                    transcript_inputs.append([position, value])
+                else:
+                    value = next(input_iterator)
+                # Imprime o prompt e o valor fornecido
+                print(f"{prompt}{value}")
+                return str(value)
+            except StopIteration:
+                raise RuntimeError("Não há valores de entrada suficientes fornecidos")
+
+        # Cria um namespace limpo para execução
+        namespace = {
+            '__builtins__': {**SAFE_BUILTINS, 'input': mock_input}
+        }
+
+        tracer = None
+        if limits['max_line_events'] or profile:
+            tracer = _make_line_tracer(limits['max_line_events'], line_events, line_counts)
+
+        if profile:
+            tracemalloc.start()
+
+        with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
+            if tracer:
+                sys.settrace(tracer)
+            try:
+                exec(code, namespace)
+            finally:
+                if tracer:
+                    sys.settrace(None)
+
+        output = stdout_capture.getvalue()
+        error = stderr_capture.getvalue()
+
+        result = {
+            'success': True,
+            'output': output,
+            'error': error if error else None,
+            'input_needed': False
+        }
+
+    except LimitExceeded as e:
+        limits_hit.append(e.limit)
+        result = {
+            'success': False,
+            'output': stdout_capture.getvalue(),
+            'error': e.message,
+            'input_needed': False
+        }
+
+    except TranscriptMisaligned as e:
+        result = {
+            'success': False,
+            'output': stdout_capture.getvalue(),
+            'error': str(e),
+            'input_needed': False,
+            'transcript_misaligned': True
+        }
+
+    except MemoryError:
+        limits_hit.append('memory')
+        result = {
+            'success': False,
+            'output': stdout_capture.getvalue(),
+            'error': f"Limite de memória excedido ({limits['max_memory_mb']} MB).",
+            'input_needed': False
+        }
+
+    except Exception as e:
+        result = {
+            'success': False,
+            'output': '',
+            'error': str(e) + '\n' + traceback.format_exc(),
+            'input_needed': False
+        }
+
+    wall_seconds = round(time.perf_counter() - start_wall, 4)
+    cpu_seconds = round(time.process_time() - start_cpu, 4)
+
+    result['truncated'] = stdout_capture.truncated or stderr_capture.truncated
+    if transcript is not None:
+        result['transcript_inputs'] = transcript_inputs
+    result['limits_hit'] = limits_hit
+    result['usage'] = {
+        'wall_seconds': wall_seconds,
+        'cpu_seconds': cpu_seconds,
+        'output_bytes': stdout_capture.size,
+        'line_events': line_events[0] if limits['max_line_events'] else None,
+    }
+
+    if profile:
+        peak_memory = 0
+        if tracemalloc.is_tracing():
+            _, peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        result['profile'] = _build_profile(wall_seconds, cpu_seconds, peak_memory, line_counts)
+    return result
+
+
+def source_hash(code):
+    """Hash do código-fonte usado como chave dos caches"""
+    return hashlib.sha256(code.encode('utf-8')).hexdigest()
+
+
+def normalize_source(code):
+    """
+    Normaliza quebras de linha e espaços no fim das linhas
+    Preserva a numeração das linhas, que aparece nas mensagens de erro, e os espaços
+    dentro de strings de várias linhas (fazem parte da saída do programa)
+    """
+    lines = code.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+    if not any(line != line.rstrip() for line in lines):
+        return '\n'.join(lines).rstrip('\n')
+
+    # Linhas cujo final está dentro de um token (string com aspas triplas ou continuada)
+    inside = set()
+    try:
+        for token in tokenize.generate_tokens(io.StringIO('\n'.join(lines)).readline):
+            if token.type == tokenize.ERRORTOKEN:
+                raise tokenize.TokenError(token.string, token.start)
+            inside.update(range(token.start[0], token.end[0]))
+    except (tokenize.TokenError, SyntaxError):
+        # Código inválido: só as quebras de linha são normalizadas
+        return '\n'.join(lines)
+    return '\n'.join(
+        line if number in inside else line.rstrip() for number, line in enumerate(lines, start=1)
+    ).rstrip('\n')
+
+
+def _result_size(result):
+    # Estimativa do tamanho de um resultado em cache (saída e erro dominam)
+    return 512 + len(result.get('output') or '') + len(result.get('error') or '')
+
+
+class CompiledCodeCache:
+    """
+    Cache LRU de objetos de código compilados, indexado pelo hash do fonte
+    Erros de sintaxe também são guardados para não recompilar código inválido
+    """
+
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024):
+        self._cache = LRUCache(max_entries, max_bytes, sizeof=lambda entry: entry[2])
+
+    def compile(self, code, tree=None):
+        """
+        Retorna o objeto de código compilado (ou levanta SyntaxError)
+        tree: AST já construída pelo preflight, evita um segundo parse
+        """
+        key = source_hash(code)
+        entry = self._cache.get(key)
+
+        if entry is None:
+            try:
+                compiled = compile(tree if tree is not None else code, '<string>', 'exec')
+                entry = (compiled, None, len(code) + len(marshal.dumps(compiled)))
+            except SyntaxError as e:
+                entry = (None, e, len(code))
+            self._cache.set(key, entry)
+
+        compiled, error, _ = entry
+        if error is not None:
+            raise error.with_traceback(None)
+        return compiled
+
+    def stats(self):
+        return self._cache.stats()
+
+
 class CodeExecutor:
     def __init__(self):
-        self.timeout = 10  # timeout em segundos
-    
-    def execute_python_code(self, code, inputs=None):
+        self.timeout = float(os.getenv('EXECUTOR_TIMEOUT', '10'))  # timeout em segundos
+        self.limits = dict(DEFAULT_LIMITS)
+        self.code_cache = CompiledCodeCache(
+            max_entries=int(os.getenv('EXECUTOR_CODE_CACHE_ENTRIES', '512'))
+        )
+        self.preflight_cache = LRUCache(
+            max_entries=int(os.getenv('EXECUTOR_CODE_CACHE_ENTRIES', '512'))
+        )
+
+        # Resultados de execuções determinísticas: (hash do fonte normalizado, entradas)
+        self.result_cache = LRUCache(
+            max_entries=int(os.getenv('EXECUTOR_RESULT_CACHE_ENTRIES', '2048')),
+            max_bytes=int(os.getenv('EXECUTOR_RESULT_CACHE_MB', '32')) * 1024 * 1024,
+            sizeof=_result_size,
+            ttl=float(os.getenv('EXECUTOR_RESULT_CACHE_TTL', '600'))
+        )
+        self.saved_wall_seconds = 0.0
+
+        self.max_batch_cases = int(os.getenv('EXECUTOR_MAX_BATCH_CASES', '20'))
+
+        # 'pool' executa em processos separados; 'inline' executa no próprio worker
+        self.backend = os.getenv('EXECUTOR_BACKEND', 'pool')
+        self.pool = None
+
+        if self.backend == 'pool':
+            from utils.execution_pool import ExecutionPool
+            self.pool = ExecutionPool(
+                size=int(os.getenv('EXECUTOR_POOL_SIZE', '2')),
+                queue_depth=int(os.getenv('EXECUTOR_QUEUE_DEPTH', '16')),
+                timeout=self.timeout
+            )
+            # Uma thread por worker do pool para os casos em lote; criada aqui (e não
+            # no primeiro lote) para que requisições simultâneas não criem várias.
+            # As threads só sobem quando o primeiro lote é executado
+            self._batch_threads = ThreadPoolExecutor(
+                max_workers=self.pool.size, thread_name_prefix='batch-exec'
+            )
+
+    def execute_python_code(self, code, inputs=None, transcript=None, profile=False):
         """
         Executa código Python de forma segura
         Args:
             code: Código Python a ser executado
             inputs: Lista de valores de entrada para input() ou None
-        Retorna: dict com success, output, error, input_needed
+            transcript: Linhas de um exemplo esperado; as entradas são lidas dele
+            profile: inclui 'profile' (tempos, pico de memória e execuções por linha)
+        Retorna: dict com success, output, error, input_needed,
+                 truncated, limits_hit e usage (consumo medido)
         """
-        try:
-            # Se não foram fornecidos inputs, detecta se o código precisa deles
-            if inputs is None:
-                input_count = code.count('input(')
-                if input_count > 0:
-                    return {
-                        'success': False,
-                        'output': '',
-                        'error': None,
-                        'input_needed': True,
-                        'input_count': input_count,
-                        'message': f'Este código precisa de {input_count} valor(es) de entrada. Por favor, forneça os valores.'
-                    }
-            
-            # Captura stdout e stderr
-            stdout_capture = io.StringIO()
-            stderr_capture = io.StringIO()
-            
-            # Cria um iterador para os inputs
-            input_iterator = iter(inputs if inputs else [])
-            
-            def mock_input(prompt=""):
-                """Input simulado que usa valores pré-fornecidos"""
-                try:
-                    value = next(input_iterator)
-                    # Imprime o prompt e o valor fornecido
-                    print(f"{prompt}{value}")
-                    return str(value)
-                except StopIteration:
-                    raise RuntimeError("Não há valores de entrada suficientes fornecidos")
-            
-            # Cria um namespace limpo para execução
-            namespace = {
-                '__builtins__': {
-                    'print': print,
-                    'input': mock_input,  # input simulado
-                    'len': len,
-                    'str': str,
-                    'int': int,
-                    'float': float,
-                    'bool': bool,
-                    'list': list,
-                    'dict': dict,
-                    'tuple': tuple,
-                    'set': set,
-                    'range': range,
-                    'enumerate': enumerate,
-                    'zip': zip,
-                    'sum': sum,
-                    'max': max,
-                    'min': min,
-                    'abs': abs,
-                    'round': round,
-                    'sorted': sorted,
-                    'reversed': reversed,
-                    'type': type,
-                    'isinstance': isinstance,
-                }
-            }
-            
-            with redirect_stdout(stdout_capture), redirect_stderr(stderr_capture):
-                exec(code, namespace)
-            
-            output = stdout_capture.getvalue()
-            error = stderr_capture.getvalue()
-            
+        early_result, compiled = self._prepare(code, inputs, transcript)
+        if early_result is not None:
+            return early_result
+
+        # Execuções com perfil sempre rodam de fato (o tracer altera os tempos)
+        key = None if profile else self._result_key(code, inputs, transcript)
+        cached = self._cached_result(key)
+        if cached is not None:
+            return cached
+
+        result = None
+        if self.pool is not None:
+            try:
+                result = self.pool.run(compiled, inputs, self.limits, transcript=transcript, profile=profile)
+            except OSError as e:
+                # Não foi possível criar processos (ex.: ambiente serverless restrito)
+                logging.warning(f"Pool de execução indisponível, usando modo inline: {e}")
+                self.pool = None
+
+        if result is None:
+            result = run_sandboxed(compiled, inputs, self.limits, transcript, profile=profile)
+
+        self._store_result(key, result)
+        return result
+
+    def execute_stream(self, code, inputs=None):
+        """
+        Executa o código emitindo a saída conforme é produzida
+        Gera tuplas (evento, dados): ('output', {'data': trecho}) e, ao final,
+        ('result', dict no mesmo formato de execute_python_code)
+        """
+        early_result, compiled = self._prepare(code, inputs, None)
+        if early_result is not None:
+            yield 'result', early_result
+            return
+
+        key = self._result_key(code, inputs, None)
+        result = self._cached_result(key)
+
+        if result is None and self.pool is not None:
+            try:
+                self.pool.start()
+            except OSError as e:
+                logging.warning(f"Pool de execução indisponível, usando modo inline: {e}")
+                self.pool = None
+
+        if result is None and self.pool is not None:
+            for event, payload in self.pool.run_stream(compiled, inputs, self.limits):
+                if event == 'result':
+                    self._store_result(key, payload)
+                yield event, payload
+            return
+
+        # Modo inline ou resultado em cache: a saída é enviada de uma vez
+        if result is None:
+            result = run_sandboxed(compiled, inputs, self.limits)
+            self._store_result(key, result)
+        if result['output']:
+            yield 'output', {'data': result['output']}
+        yield 'result', result
+
+    def _prepare(self, code, inputs, transcript):
+        """
+        Preflight comum às execuções
+        Retorna: (resultado antecipado ou None, objeto de código compilado)
+        """
+        analysis = self.preflight(code)
+        if not analysis['valid']:
             return {
-                'success': True,
-                'output': output,
-                'error': error if error else None,
+                'success': False,
+                'output': '',
+                'error': analysis['error'],
                 'input_needed': False
-            }
-            
-        except Exception as e:
+            }, None
+
+        # Se não foram fornecidos inputs, informa quantos o código precisa e seus prompts
+        if inputs is None and transcript is None and analysis['input_count'] > 0:
+            input_count = analysis['input_count']
             return {
                 'success': False,
                 'output': '',
-                'error': str(e) + '\n' + traceback.format_exc(),
+                'error': None,
+                'input_needed': True,
+                'input_count': input_count,
+                'input_prompts': analysis['input_prompts'],
+                'input_unbounded': analysis['input_unbounded'],
+                'message': f'Este código precisa de {input_count} valor(es) de entrada. Por favor, forneça os valores.'
+            }, None
+
+        # Reaproveita a compilação feita no preflight
+        return None, self.code_cache.compile(code)
+
+    def _result_key(self, code, inputs, transcript):
+        """
+        Chave do cache de resultados ou None se o código não for determinístico
+        """
+        if not self.preflight(code)['deterministic']:
+            return None
+        if transcript is not None:
+            values = ('transcript',) + tuple(transcript)
+        else:
+            # input() sempre entrega str, então 5 e "5" são a mesma entrada
+            values = tuple(str(value) for value in inputs) if inputs is not None else None
+        return (source_hash(normalize_source(code)), values)
+
+    def _cached_result(self, key):
+        if key is None:
+            return None
+        result = self.result_cache.get(key)
+        if result is None:
+            return None
+        self.saved_wall_seconds += result.get('usage', {}).get('wall_seconds', 0)
+        return {**result, 'cached': True}
+
+    def _store_result(self, key, result):
+        """
+        Guarda apenas resultados produzidos pela execução completa do programa;
+        limites atingidos, pool ocupado e workers encerrados dependem da carga do servidor
+        """
+        if key is None or result.get('limits_hit'):
+            return
+        if 'output_bytes' not in result.get('usage', {}):
+            return
+        self.result_cache.set(key, result)
+
+    def execute_batch(self, code, input_vectors):
+        """
+        Executa o mesmo programa com vários conjuntos de entrada em paralelo
+        Args:
+            code: Código Python a ser executado
+            input_vectors: lista de listas de inputs (um caso por item)
+        Retorna: lista de dicts (mesmo formato de execute_python_code) com 'case'
+        """
+        input_vectors = list(input_vectors)[:self.max_batch_cases]
+
+        analysis = self.preflight(code)
+        if not analysis['valid']:
+            return [{
+                'case': index,
+                'success': False,
+                'output': '',
+                'error': analysis['error'],
                 'input_needed': False
+            } for index in range(len(input_vectors))]
+
+        def run_case(index):
+            # Lista vazia em vez de None: cada caso sempre executa
+            result = self.execute_python_code(code, input_vectors[index] or [])
+            return {'case': index, **result}
+
+        return self._run_parallel(run_case, len(input_vectors))
+
+    def execute_transcripts(self, code, transcripts):
+        """
+        Executa o programa uma vez por transcrição de exemplo, em paralelo
+        As entradas de cada execução são extraídas da própria transcrição
+        """
+        def run_case(index):
+            result = self.execute_python_code(code, transcript=transcripts[index])
+            return {'case': index, **result}
+
+        return self._run_parallel(run_case, len(transcripts))
+
+    def _run_parallel(self, run_case, count):
+        """Distribui os casos entre os workers do pool (sequencial no modo inline)"""
+        if self.pool is None or count <= 1:
+            return [run_case(index) for index in range(count)]
+
+        # Uma thread por worker do pool: os casos são distribuídos entre os processos
+        return list(self._batch_threads.map(run_case, range(count)))
+
+    def get_stats(self):
+        """Retorna estatísticas do backend de execução"""
+        stats = {
+            'code_cache': self.code_cache.stats(),
+            'preflight_cache': self.preflight_cache.stats(),
+            'result_cache': {
+                **self.result_cache.stats(),
+                'saved_wall_seconds': round(self.saved_wall_seconds, 4)
             }
-    
+        }
+        if self.pool is None:
+            return {'backend': 'inline', **stats}
+        return {'backend': 'pool', **self.pool.stats(), **stats}
+
+    def preflight(self, code):
+        """
+        Análise estática do código (sintaxe, inputs e construções proibidas)
+        O resultado fica em cache pelo hash do fonte; a AST é compilada uma única vez
+        """
+        key = source_hash(code)
+        analysis = self.preflight_cache.get(key)
+        if analysis is None:
+            analysis, tree = preflight.analyze(code)
+            if tree is not None:
+                self.code_cache.compile(code, tree)
+            self.preflight_cache.set(key, analysis)
+        return analysis
+
     def validate_code(self, code):
         """
-        Valida se o código tem sintaxe válida
+        Valida se o código tem sintaxe válida e não usa construções proibidas
         """
         try:
-            compile(code, '<string>', 'exec')
-            return {'valid': True, 'error': None}
-        except SyntaxError as e:
-            return {
-                'valid': False, 
-                'error': f"Erro de sintaxe na linha {e.lineno}: {e.msg}"
-            }
+            analysis = self.preflight(code)
+            return {'valid': analysis['valid'], 'error': analysis['error']}
         except Exception as e:
             return {'valid': False, 'error': str(e)}
 
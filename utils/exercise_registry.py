@@ -0,0 +1,120 @@
+"""
+Registro dos exercícios das aulas, montado uma vez na inicialização
+Cada template templates/exercicios/<modulo>/aulaN.html é lido e vira uma entrada
+com título, descrição limpa, exemplos de entrada/saída e código inicial,
+indexada por (modulo, aula). Assim o frontend envia apenas modulo, aula e código.
+"""
+
+import os
+import re
+import html
+import logging
+
+# Raiz dos templates de exercícios
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'templates', 'exercicios'
+)
+
+MODULES = ['sequencial', 'comparativa', 'repetitiva', 'vetores', 'matrizes']
+LESSONS = range(1, 11)
+
+# Título "Exemplo:", "Exemplo 2:" ou "Exemplo 1 (troco):" seguido do bloco <pre><code>
+_EXAMPLE_RE = re.compile(
+    r'<h4>[^<]*?Exemplo(?:\s+\d+)?(?:\s*\([^)]*\))?\s*:\s*</h4>\s*<pre><code>(.*?)</code></pre>',
+    re.S
+)
+# Descrição em texto que cada template já escreve para a correção (extra_js)
+_JS_DESCRIPTION_RE = re.compile(r'function getExerciseDescription\(\)\s*\{\s*return `(.*?)`;', re.S)
+_CODE_BLOCK_RE = re.compile(r'<pre><code>(.*?)</code></pre>', re.S)
+_TAG_RE = re.compile(r'<[^>]+>')
+_BLANK_LINES_RE = re.compile(r'\n\s*\n+')
+
+
+def _block(template_source, name):
+    """Conteúdo de um {% block name %} do template ou None"""
+    match = re.search(r'{%\s*block ' + name + r'\s*%}(.*?){%\s*endblock\s*%}', template_source, re.S)
+    return match.group(1) if match else None
+
+
+def extract_examples(template_source):
+    """Extrai as transcrições (lista de linhas) dos exemplos de um template"""
+    description = _block(template_source, 'exercise_description')
+    if description is None:
+        return []
+    return [
+        html.unescape(body).strip('\n').split('\n')
+        for body in _EXAMPLE_RE.findall(description)
+    ]
+
+
+def html_to_text(fragment):
+    """Converte o HTML da descrição em texto, mantendo os exemplos como blocos de código"""
+    text = _CODE_BLOCK_RE.sub(lambda match: f'\n```\n{match.group(1).strip()}\n```\n', fragment)
+    text = re.sub(r'<(?:br|/p|/h\d|/li|/div)\s*/?>', '\n', text)
+    text = html.unescape(_TAG_RE.sub('', text))
+    lines = [line.strip() for line in text.split('\n')]
+    return _BLANK_LINES_RE.sub('\n\n', '\n'.join(lines)).strip()
+
+
+def parse_exercise(template_source, module, lesson):
+    """
+    Monta a entrada do registro a partir do código-fonte do template
+    Retorna: dict ou None se o template não possui descrição de exercício
+    """
+    description_html = _block(template_source, 'exercise_description')
+    if description_html is None:
+        return None
+
+    js_description = _JS_DESCRIPTION_RE.search(template_source)
+    if js_description:
+        description = js_description.group(1).strip()
+    else:
+        description = html_to_text(description_html)
+
+    title = _block(template_source, 'lesson_title')
+    initial_code = _block(template_source, 'initial_code')
+    return {
+        'id': f'{module}/{lesson}',
+        'module': module,
+        'lesson': lesson,
+        'title': html.unescape(title.strip()) if title else f'Aula {lesson}',
+        'description': description,
+        'examples': extract_examples(template_source),
+        'initial_code': initial_code.strip('\n') if initial_code else '',
+    }
+
+
+class ExerciseRegistry:
+    """Exercícios de todas as aulas indexados por (modulo, aula)"""
+
+    def __init__(self, templates_dir=TEMPLATES_DIR):
+        self.templates_dir = templates_dir
+        self.exercises = {}
+        for module in MODULES:
+            for lesson in LESSONS:
+                path = os.path.join(templates_dir, module, f'aula{lesson}.html')
+                try:
+                    with open(path, encoding='utf-8') as template:
+                        exercise = parse_exercise(template.read(), module, lesson)
+                except OSError:
+                    continue
+                if exercise:
+                    self.exercises[(module, lesson)] = exercise
+        logging.info(f"📚 Registro de exercícios: {len(self.exercises)} aulas carregadas")
+
+    def get(self, module, lesson):
+        return self.exercises.get((module, lesson))
+
+    def examples(self, module, lesson):
+        exercise = self.get(module, lesson)
+        return exercise['examples'] if exercise else []
+
+    def __len__(self):
+        return len(self.exercises)
+
+    def __iter__(self):
+        return iter(self.exercises.values())
+
+
+# Instância global do registro de exercícios
+registry = ExerciseRegistry()
@@ -0,0 +1,255 @@
+"""
+Cliente OpenAI assíncrono compartilhado pelas requisições do Flask
+Um event loop em thread própria mantém um pool de conexões HTTP; as rotas
+(síncronas) enviam as chamadas para ele e aguardam o resultado.
+- Limite global de chamadas simultâneas à API
+- Single-flight: requisições idênticas em andamento viram uma única chamada
+- Timeout por tentativa e novas tentativas com backoff exponencial e jitter
+- Respostas em streaming entregues trecho a trecho à thread chamadora
+"""
+
+import os
+import time
+import queue
+import random
+import asyncio
+import logging
+import threading
+
+# Marca o fim de um stream na fila de trechos
+_END = object()
+
+
+class AsyncChatClient:
+    """Pool de chamadas a chat.completions com concorrência limitada"""
+
+    def __init__(self, api_key=None, base_url=None, max_concurrency=None, timeout=None,
+                 max_retries=None, backoff=0.5):
+        """
+        Args:
+            api_key: chave da API (padrão: OPENAI_API_KEY)
+            base_url: URL de um servidor compatível (padrão: OPENAI_BASE_URL ou a API oficial)
+            max_concurrency: chamadas simultâneas à API (todas as threads do processo)
+            timeout: limite de cada tentativa (segundos)
+            max_retries: novas tentativas após erros temporários (timeout, 429, 5xx)
+            backoff: base do backoff exponencial (segundos)
+        """
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.base_url = base_url or os.getenv('OPENAI_BASE_URL') or None
+        self.max_concurrency = max_concurrency or int(os.getenv('OPENAI_MAX_CONCURRENCY', '8'))
+        self.timeout = timeout or float(os.getenv('OPENAI_TIMEOUT', '30'))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv('OPENAI_MAX_RETRIES', '2'))
+        self.backoff = backoff
+
+        self._loop = None
+        self._client = None
+        self._semaphore = None
+        self._inflight = {}  # acessado apenas pela thread do event loop
+        self._start_lock = threading.Lock()
+
+        self._counters = {
+            'requests': 0,
+            'streams': 0,
+            'upstream_calls': 0,
+            'coalesced': 0,
+            'retries': 0,
+            'failures': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def start(self):
+        """Inicia o event loop e o cliente HTTP (apenas na primeira chamada)"""
+        with self._start_lock:
+            if self._loop is not None:
+                return
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name='openai-loop', daemon=True)
+            thread.start()
+            try:
+                asyncio.run_coroutine_threadsafe(self._setup(), loop).result()
+            except BaseException:
+                # Sem cliente o loop não tem uso: encerra a thread em vez de deixá-la órfã
+                loop.call_soon_threadsafe(loop.stop)
+                thread.join()
+                loop.close()
+                raise
+            self._loop = loop
+        logging.info(f"🔌 Cliente OpenAI assíncrono: até {self.max_concurrency} chamadas simultâneas")
+
+    async def _setup(self):
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = await self._create_client()
+
+    async def _create_client(self):
+        from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+        # Cliente HTTP do próprio SDK (não depende de importar o httpx aqui); as
+        # conexões simultâneas já ficam limitadas pelo semáforo de max_concurrency
+        http_client = DefaultAsyncHttpxClient(timeout=self.timeout)
+        # As novas tentativas são feitas aqui, com jitter, e não pelo SDK
+        return AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.base_url,
+            http_client=http_client,
+            max_retries=0,
+            timeout=self.timeout
+        )
+
+    # ------------------------------------------------------------------
+    # Chamadas
+    # ------------------------------------------------------------------
+    @property
+    def deadline(self):
+        """Prazo total de uma chamada: todas as tentativas mais o backoff entre elas"""
+        return (self.timeout + self.backoff * 2 ** self.max_retries) * (self.max_retries + 1)
+
+    def complete(self, key, **request):
+        """
+        Executa chat.completions.create e retorna o texto da resposta
+        Bloqueia a thread chamadora; chamadas com a mesma key em andamento
+        compartilham uma única chamada à API
+        """
+        return self.submit(key, **request).result(timeout=self.deadline)
+
+    def submit(self, key, **request):
+        """
+        Como complete, mas sem bloquear: retorna um concurrent.futures.Future
+        A chamada continua mesmo se quem a pediu parar de esperar pelo resultado
+        """
+        self.start()
+        self._counters['requests'] += 1
+        return asyncio.run_coroutine_threadsafe(self._single_flight(key, request), self._loop)
+
+    async def _single_flight(self, key, request):
+        task = self._inflight.get(key) if key is not None else None
+        if task is not None:
+            self._counters['coalesced'] += 1
+        else:
+            task = asyncio.ensure_future(self._call_with_retries(request))
+            if key is not None:
+                self._inflight[key] = task
+                task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: o cancelamento de um chamador não cancela a chamada compartilhada
+        return await asyncio.shield(task)
+
+    async def _call_with_retries(self, request):
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self._counters['upstream_calls'] += 1
+                    response = await self._client.chat.completions.create(**request)
+                    return response.choices[0].message.content
+                except Exception as e:
+                    await self._retry_or_raise(e, attempt)
+
+    def stream(self, first_chunk_timeout=None, deadline=None, on_late=None, **request):
+        """
+        Executa chat.completions.create com stream=True
+        Retorna um gerador com os trechos de texto à medida que chegam; fechar o
+        gerador antes do fim cancela a chamada. Erros da API são lançados no gerador
+        e TimeoutError se nenhum trecho chegar em first_chunk_timeout segundos ou se
+        a resposta não terminar em deadline segundos (padrão: self.deadline)
+        on_late: com TimeoutError a chamada não é cancelada; ao terminar, on_late(texto, erro)
+                 recebe a resposta completa (ou o erro), chamado pela thread do event loop
+        """
+        self.start()
+        self._counters['streams'] += 1
+        chunks = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(self._stream_with_retries(request, chunks), self._loop)
+        # Sem nenhum trecho por um tempo limite inteiro: desiste da chamada
+        chunk_timeout = self.timeout + self.backoff * 2 ** self.max_retries
+        timeout = first_chunk_timeout or chunk_timeout
+        ends_at = time.monotonic() + (deadline or self.deadline)
+        received = []
+        detached = False
+        try:
+            while True:
+                remaining = ends_at - time.monotonic()
+                if remaining <= 0:
+                    raise queue.Empty
+                item = chunks.get(timeout=min(timeout, remaining))
+                if item is _END:
+                    break
+                timeout = chunk_timeout
+                received.append(item)
+                yield item
+            future.result()
+        except queue.Empty:
+            if on_late is not None:
+                detached = True
+                future.add_done_callback(lambda done: self._deliver_late(done, chunks, received, on_late))
+            raise TimeoutError("Tempo limite aguardando a resposta da OpenAI")
+        finally:
+            if not detached and not future.done():
+                future.cancel()
+
+    @staticmethod
+    def _deliver_late(future, chunks, received, on_late):
+        """Entrega a on_late a resposta de um stream que passou do prazo"""
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            on_late(None, error)
+            return
+        # _END é colocado na fila antes do Future terminar: todos os trechos já estão nela
+        parts = list(received)
+        while True:
+            try:
+                item = chunks.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _END:
+                parts.append(item)
+        on_late(''.join(parts), None)
+
+    async def _stream_with_retries(self, request, chunks):
+        try:
+            async with self._semaphore:
+                for attempt in range(self.max_retries + 1):
+                    started = False
+                    try:
+                        self._counters['upstream_calls'] += 1
+                        stream = await self._client.chat.completions.create(stream=True, **request)
+                        try:
+                            async for chunk in stream:
+                                delta = chunk.choices[0].delta.content if chunk.choices else None
+                                if delta:
+                                    started = True
+                                    chunks.put(delta)
+                        finally:
+                            await stream.close()
+                        return
+                    except Exception as e:
+                        # Depois do primeiro trecho a resposta não pode ser repetida
+                        await self._retry_or_raise(e, attempt, retry=not started)
+        finally:
+            chunks.put(_END)
+
+    async def _retry_or_raise(self, error, attempt, retry=True):
+        """Aguarda o backoff antes da próxima tentativa ou relança o erro"""
+        if not retry or attempt >= self.max_retries or not self._is_retryable(error):
+            self._counters['failures'] += 1
+            raise error
+        self._counters['retries'] += 1
+        # Backoff exponencial com jitter completo
+        delay = random.uniform(0, self.backoff * 2 ** attempt)
+        logging.warning(f"⚠️ Erro temporário na OpenAI ({type(error).__name__}), "
+                        f"nova tentativa em {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_retryable(error):
+        from openai import APIConnectionError, APITimeoutError, RateLimitError, InternalServerError
+        return isinstance(error, (APIConnectionError, APITimeoutError, RateLimitError, InternalServerError))
+
+    def stats(self):
+        return {
+            'max_concurrency': self.max_concurrency,
+            'timeout': self.timeout,
+            'max_retries': self.max_retries,
+            'in_flight': len(self._inflight),
+            **self._counters
+        }
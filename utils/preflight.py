@@ -0,0 +1,144 @@
+"""
+Análise estática (preflight) do código do aluno
+Uma única passada na AST retorna erros de sintaxe, chamadas de input() com seus
+prompts literais, se há input() dentro de loops, construções não permitidas e
+se a saída pode variar entre execuções com as mesmas entradas.
+"""
+
+import ast
+
+# Módulos que o aluno pode importar no ambiente de execução
+ALLOWED_MODULES = {'math'}
+
+# Nomes especiais que dariam acesso ao interpretador fora do sandbox
+BLOCKED_NAMES = {'__builtins__', '__import__', '__loader__', '__spec__'}
+
+# Nomes cujo resultado depende do processo (endereços, hash aleatório de str)
+NONDETERMINISTIC_NAMES = {'id', 'hash', 'object', 'set', 'frozenset'}
+
+_LOOP_NODES = (ast.For, ast.AsyncFor, ast.While,
+               ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp)
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)
+
+
+class _PreflightVisitor(ast.NodeVisitor):
+    """Percorre a AST uma vez coletando inputs e construções proibidas"""
+
+    def __init__(self):
+        self.input_calls = []
+        self.disallowed = []
+        self.nondeterministic = []
+        self._loop_depth = 0
+        self._function_depth = 0
+
+    def generic_visit(self, node):
+        is_loop = isinstance(node, _LOOP_NODES)
+        is_function = isinstance(node, _FUNCTION_NODES)
+        self._loop_depth += is_loop
+        self._function_depth += is_function
+        super().generic_visit(node)
+        self._loop_depth -= is_loop
+        self._function_depth -= is_function
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id == 'input':
+            prompt = None
+            if node.args and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str):
+                prompt = node.args[0].value
+            elif not node.args:
+                prompt = ''
+            self.input_calls.append({
+                'line': node.lineno,
+                'prompt': prompt,
+                # Dentro de loop ou função a quantidade de chamadas não é estática
+                'in_loop': self._loop_depth > 0 or self._function_depth > 0,
+            })
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self._check_module(node, alias.name)
+        self.generic_visit(node)
+
+    def visit_ImportFrom(self, node):
+        self._check_module(node, '.' * node.level + (node.module or ''))
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node):
+        if node.attr.startswith('__') and node.attr.endswith('__'):
+            self._add_disallowed(node, 'dunder_attribute',
+                                 f"Acesso a atributos especiais ('{node.attr}') não é permitido")
+        self.generic_visit(node)
+
+    def visit_Name(self, node):
+        if node.id in BLOCKED_NAMES:
+            self._add_disallowed(node, 'blocked_name', f"O nome '{node.id}' não é permitido")
+        if node.id in NONDETERMINISTIC_NAMES:
+            self.nondeterministic.append(node.lineno)
+        self.generic_visit(node)
+
+    # A ordem de iteração de conjuntos de str muda a cada processo (PYTHONHASHSEED)
+    def visit_Set(self, node):
+        self.nondeterministic.append(node.lineno)
+        self.generic_visit(node)
+
+    def visit_SetComp(self, node):
+        self.nondeterministic.append(node.lineno)
+        self.generic_visit(node)
+
+    def visit_ClassDef(self, node):
+        # O repr padrão de instâncias inclui o endereço de memória
+        self.nondeterministic.append(node.lineno)
+        self.generic_visit(node)
+
+    def _check_module(self, node, module):
+        if module.split('.')[0] not in ALLOWED_MODULES:
+            allowed = ', '.join(sorted(ALLOWED_MODULES))
+            self._add_disallowed(node, 'import',
+                                 f"Importar '{module}' não é permitido (permitidos: {allowed})")
+
+    def _add_disallowed(self, node, construct, message):
+        self.disallowed.append({
+            'line': node.lineno,
+            'construct': construct,
+            'message': message,
+        })
+
+
+def analyze(code):
+    """
+    Analisa o código em uma única passada
+    Retorna: (dict com a análise, árvore AST ou None se houver erro de sintaxe)
+    """
+    try:
+        tree = ast.parse(code, '<string>', 'exec')
+    except SyntaxError as e:
+        return {
+            'valid': False,
+            'error': f"Erro de sintaxe na linha {e.lineno}: {e.msg}",
+            'input_calls': [],
+            'input_count': 0,
+            'input_prompts': [],
+            'input_unbounded': False,
+            'disallowed': [],
+            'deterministic': True,
+        }, None
+
+    visitor = _PreflightVisitor()
+    visitor.visit(tree)
+
+    error = None
+    if visitor.disallowed:
+        first = visitor.disallowed[0]
+        error = f"Linha {first['line']}: {first['message']}"
+
+    return {
+        'valid': not visitor.disallowed,
+        'error': error,
+        'input_calls': visitor.input_calls,
+        'input_count': len(visitor.input_calls),
+        'input_prompts': [call['prompt'] for call in visitor.input_calls],
+        'input_unbounded': any(call['in_loop'] for call in visitor.input_calls),
+        'disallowed': visitor.disallowed,
+        'deterministic': not visitor.nondeterministic,
+    }, tree
@@ -0,0 +1,277 @@
+"""
+Migrações do progresso dos alunos
+Percorre os usuários em páginas, sem carregar a base inteira: os documentos de
+cada página são lidos em um único get_all. Ambas podem ser repetidas ou
+retomadas com --start-after.
+
+Documento compacto (progresso/{user_id}): criado para quem ainda não foi
+migrado. Um documento compacto existente nunca é sobrescrito (no período dual
+ele já recebe as escritas).
+    1. PROGRESS_LAYOUT=dual no servidor
+    2. python -m utils.progress_migration --dry-run
+    3. python -m utils.progress_migration --workers 8
+    4. python -m utils.progress_migration --verify
+    5. PROGRESS_LAYOUT=compact no servidor
+
+Módulos liberados (campo derivado modulos_liberados em usuarios/{user_id}):
+depois que todos os servidores rodam a versão que mantém o campo,
+    python -m utils.progress_migration --backfill-unlocked
+Usuários sem o campo também o recebem na primeira verificação de acesso.
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from firebase_admin import firestore
+
+from utils.progress_store import (
+    ProgressStore, MODULE_ORDER, COMPACT_COLLECTION, UNLOCK_FIELDS,
+    compact_document, expand_compact, unlocked_from_progress, unlocked_document
+)
+
+# Usuários com divergência listados no relatório
+MISMATCH_SAMPLE = 20
+# Escritas por batch do Firestore
+BATCH_LIMIT = 500
+
+
+def iter_user_pages(db, page_size, start_after=None):
+    """Ids dos usuários em páginas (inclui usuários que só têm a subcoleção conteudo)"""
+    page = []
+    skipping = start_after is not None
+    for ref in db.collection('usuarios').list_documents(page_size=page_size):
+        if skipping:
+            skipping = ref.id != start_after
+            continue
+        page.append(ref.id)
+        if len(page) >= page_size:
+            yield page
+            page = []
+    if page:
+        yield page
+
+
+def read_page(db, user_ids, with_users=False):
+    """
+    Documentos por módulo, compactos e (com with_users) dos usuários de uma página (um get_all)
+    Retorna: ({user_id: {modulo: dict ou None}}, {user_id: compacto ou None}, {user_id: usuário ou None})
+    """
+    refs = [
+        db.collection('usuarios').document(user_id).collection('conteudo').document(module)
+        for user_id in user_ids for module in MODULE_ORDER
+    ] + [db.collection(COMPACT_COLLECTION).document(user_id) for user_id in user_ids]
+    if with_users:
+        refs += [db.collection('usuarios').document(user_id) for user_id in user_ids]
+
+    legacy = {user_id: {module: None for module in MODULE_ORDER} for user_id in user_ids}
+    compact = {user_id: None for user_id in user_ids}
+    users = {user_id: None for user_id in user_ids}
+    for snapshot in db.get_all(refs):
+        if not snapshot.exists:
+            continue
+        reference = snapshot.reference
+        if reference.parent.id == COMPACT_COLLECTION:
+            compact[snapshot.id] = snapshot.to_dict() or {}
+        elif reference.parent.id == 'usuarios':
+            users[snapshot.id] = snapshot.to_dict() or {}
+        else:
+            legacy[reference.parent.parent.id][snapshot.id] = snapshot.to_dict() or {}
+    return legacy, compact, users
+
+
+def document_size(path, data):
+    """Tamanho armazenado de um documento pelas regras de cálculo do Firestore (bytes)"""
+    return sum(len(segment.encode('utf-8')) + 1 for segment in path) + 16 + _value_size(data) + 32
+
+
+def _value_size(value):
+    if isinstance(value, dict):
+        return sum(len(key.encode('utf-8')) + 1 + _value_size(item) for key, item in value.items())
+    if isinstance(value, list):
+        return sum(_value_size(item) for item in value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8')) + 1
+    if value is None or isinstance(value, bool):
+        return 1
+    # Números, datas e sentinelas de data (SERVER_TIMESTAMP)
+    return 8
+
+
+def compare(legacy, compact):
+    """
+    Compara os dois formatos de um usuário
+    Retorna: (aulas concluídas iguais, aulas liberadas iguais nos módulos existentes)
+    """
+    expanded = expand_compact(compact)
+    same_completed = True
+    same_unlocked = True
+    for module in MODULE_ORDER:
+        data = legacy[module] or {}
+        if sorted(data.get('aulas_concluidas', [])) != expanded[module]['aulas_concluidas']:
+            same_completed = False
+        if legacy[module] is not None and sorted(data.get('aulas_liberadas', [])) != expanded[module]['aulas_liberadas']:
+            same_unlocked = False
+    return same_completed, same_unlocked
+
+
+def migrate(db, page_size=100, workers=4, start_after=None, dry_run=False, verify=False):
+    """
+    Migra (ou, com verify, confere) todos os usuários
+    Retorna: relatório com contagens e tamanhos armazenados nos dois formatos
+    """
+    store = ProgressStore(db, cache_entries=0, layout='dual')
+    report = {
+        'users': 0,
+        'migrated': 0,
+        'already_migrated': 0,
+        'without_progress': 0,
+        'legacy_documents': 0,
+        'legacy_bytes': 0,
+        'compact_bytes': 0,
+        'mismatches': 0,
+        'unlocked_differences': 0,
+        'mismatch_sample': [],
+        'last_user': None,
+    }
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for page in iter_user_pages(db, page_size, start_after):
+            legacy, compact, _ = read_page(db, page)
+            pending = []
+            for user_id in page:
+                modules = legacy[user_id]
+                existing = [module for module in MODULE_ORDER if modules[module] is not None]
+                report['users'] += 1
+                report['legacy_documents'] += len(existing)
+                report['legacy_bytes'] += sum(
+                    document_size(('usuarios', user_id, 'conteudo', module), modules[module]) for module in existing
+                )
+
+                document = compact[user_id]
+                if document is None:
+                    document = compact_document(modules)
+                    document['criado_em'] = document['ultima_atualizacao'] = datetime.now()
+                report['compact_bytes'] += document_size((COMPACT_COLLECTION, user_id), document)
+
+                if compact[user_id] is not None:
+                    report['already_migrated'] += 1
+                    if verify:
+                        same_completed, same_unlocked = compare(modules, compact[user_id])
+                        report['unlocked_differences'] += not same_unlocked
+                        if not same_completed:
+                            report['mismatches'] += 1
+                            if len(report['mismatch_sample']) < MISMATCH_SAMPLE:
+                                report['mismatch_sample'].append(user_id)
+                elif not existing:
+                    report['without_progress'] += 1
+                elif not (dry_run or verify):
+                    pending.append(user_id)
+
+            # Cada criação é independente: uma falha não desfaz as outras
+            created = pool.map(lambda user_id: store.migrate_user(user_id, legacy[user_id]), pending)
+            for user_id, was_created in zip(pending, created):
+                report['migrated' if was_created else 'already_migrated'] += 1
+
+            report['last_user'] = page[-1]
+            logging.info(f"📦 {report['users']} usuários processados (retomar com --start-after {page[-1]})")
+
+    if verify:
+        # Quem tem progresso e ainda não tem o documento compacto
+        report['not_migrated'] = report['users'] - report['already_migrated'] - report['without_progress']
+    return report
+
+
+def backfill_unlocked(db, page_size=100, start_after=None, dry_run=False):
+    """
+    Grava o campo derivado modulos_liberados de todos os usuários
+    O progresso vem do documento compacto quando existe (senão, dos documentos por
+    módulo); usuários com o campo completo são pulados
+    """
+    report = {'users': 0, 'backfilled': 0, 'already_complete': 0, 'unlocked_modules': {}, 'last_user': None}
+
+    for page in iter_user_pages(db, page_size, start_after):
+        legacy, compact, users = read_page(db, page, with_users=True)
+        writes = []
+        for user_id in page:
+            report['users'] += 1
+            if (users[user_id] or {}).get(UNLOCK_FIELDS[1]):
+                report['already_complete'] += 1
+                continue
+            progress = expand_compact(compact[user_id]) if compact[user_id] is not None else legacy[user_id]
+            unlocked = unlocked_from_progress(progress)
+            count = str(len(unlocked))
+            report['unlocked_modules'][count] = report['unlocked_modules'].get(count, 0) + 1
+            writes.append((db.collection('usuarios').document(user_id), unlocked_document(unlocked)))
+
+        if not dry_run:
+            for start in range(0, len(writes), BATCH_LIMIT):
+                batch = db.batch()
+                for reference, document in writes[start:start + BATCH_LIMIT]:
+                    batch.set(reference, document, merge=True)
+                batch.commit()
+        report['backfilled'] += len(writes)
+        report['last_user'] = page[-1]
+        logging.info(f"🔓 {report['users']} usuários processados (retomar com --start-after {page[-1]})")
+
+    return report
+
+
+def firestore_client():
+    """Cliente Firestore com as mesmas credenciais do app.py"""
+    import firebase_admin
+    from firebase_admin import credentials
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    firebase_credentials = os.getenv('FIREBASE_CREDENTIALS')
+    if firebase_credentials:
+        cred = credentials.Certificate(json.loads(firebase_credentials))
+    else:
+        cred = credentials.Certificate(os.path.join(os.path.dirname(os.path.dirname(__file__)), 'chave_firebase.json'))
+    firebase_admin.initialize_app(cred)
+    return firestore.client()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Migração do progresso para o documento compacto')
+    parser.add_argument('--page-size', type=int, default=100, help='usuários lidos por get_all')
+    parser.add_argument('--workers', type=int, default=4, help='documentos compactos criados em paralelo')
+    parser.add_argument('--start-after', help='retoma depois deste user_id')
+    parser.add_argument('--dry-run', action='store_true', help='apenas conta e estima os tamanhos')
+    parser.add_argument('--verify', action='store_true',
+                        help='compara os dois formatos dos usuários já migrados (não grava)')
+    parser.add_argument('--backfill-unlocked', action='store_true',
+                        help='grava o campo derivado modulos_liberados (em vez da migração compacta)')
+    parser.add_argument('--output', help='arquivo para gravar o relatório JSON (padrão: stdout)')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    args = parse_args(argv)
+    if args.backfill_unlocked:
+        report = backfill_unlocked(
+            firestore_client(), page_size=args.page_size, start_after=args.start_after, dry_run=args.dry_run
+        )
+    else:
+        report = migrate(
+            firestore_client(), page_size=args.page_size, workers=args.workers,
+            start_after=args.start_after, dry_run=args.dry_run, verify=args.verify
+        )
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 1 if report.get('mismatches') else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
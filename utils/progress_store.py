@@ -0,0 +1,836 @@
+"""
+Acesso ao progresso dos alunos no Firestore
+Estrutura: usuarios/{user_id}/conteudo/{modulo}. Leituras de vários módulos
+são feitas com um único get_all (uma ida ao servidor) e com máscara de campos,
+trazendo apenas o que as rotas usam; a criação dos documentos iniciais vai
+em um único batch.
+
+O progresso de cada usuário (todos os módulos) fica em um cache LRU com
+validade: as leituras usam o cache e as escritas feitas por este processo
+atualizam a cópia em memória logo após gravar no Firestore. O cache supõe um
+único processo servindo o aluno: escritas de outros processos só aparecem após
+a validade. Por isso ele começa desativado com WEB_CONCURRENCY > 1 (salvo
+PROGRESS_CACHE_ENTRIES explícito), e as verificações de acesso leem do
+Firestore quando o cache diz "bloqueado".
+
+Layout compacto (PROGRESS_LAYOUT): um único documento por usuário,
+progresso/{user_id}, com as aulas concluídas de cada módulo em um bitmask; as
+aulas liberadas não são gravadas, são derivadas das concluídas. As rotas
+continuam recebendo os dados no formato dos documentos por módulo.
+    modules  um documento por módulo (padrão)
+    dual     período de migração: lê o documento compacto (ou os documentos por
+             módulo de quem ainda não foi migrado) e grava nos dois formatos
+    compact  apenas o documento compacto
+A migração dos usuários existentes é feita por utils/progress_migration.py.
+
+O conjunto de módulos liberados é um campo derivado em usuarios/{user_id}
+(modulos_liberados), atualizado quando um módulo é concluído ou pulado: a
+verificação de acesso lê um documento (ou nenhum, com o cache) em vez do
+progresso do módulo anterior.
+"""
+
+import os
+import copy
+import logging
+import threading
+from firebase_admin import firestore
+from google.api_core.exceptions import AlreadyExists
+
+from utils.cache import LRUCache
+
+# Ordem de dependência dos módulos
+MODULE_ORDER = ['sequencial', 'comparativa', 'repetitiva', 'vetores', 'matrizes']
+
+MODULE_NAMES = {
+    'sequencial': 'Programação Sequencial',
+    'comparativa': 'Estruturas Comparativas',
+    'repetitiva': 'Estruturas Repetitivas',
+    'vetores': 'Vetores',
+    'matrizes': 'Matrizes'
+}
+
+TOTAL_LESSONS = 10
+
+# Campos usados pelas respostas de progresso
+PROGRESS_FIELDS = ['aulas_concluidas', 'aulas_liberadas', 'total_aulas', 'nome_modulo']
+# Campos usados para verificar se um módulo foi concluído
+COMPLETION_FIELDS = ['aulas_concluidas', 'total_aulas']
+
+# Campo derivado em usuarios/{user_id}; "completo" indica que já passou pelo backfill
+UNLOCK_FIELDS = ['modulos_liberados', 'modulos_liberados_completo']
+
+LAYOUTS = ('modules', 'dual', 'compact')
+COMPACT_COLLECTION = 'progresso'
+COMPACT_VERSION = 1
+
+# Usuários com o progresso em cache quando PROGRESS_CACHE_ENTRIES não é definido
+DEFAULT_CACHE_ENTRIES = 1024
+
+
+def default_cache_entries():
+    """
+    Tamanho padrão do cache de progresso: desativado com vários processos
+    (WEB_CONCURRENCY > 1), pois cada um só enxerga as próprias escritas
+    """
+    configured = os.getenv('PROGRESS_CACHE_ENTRIES')
+    if configured is not None:
+        return int(configured)
+    try:
+        workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+    except ValueError:
+        workers = 1
+    if workers > 1:
+        logging.info(f"ℹ️ WEB_CONCURRENCY={workers}: cache de progresso desativado")
+        return 0
+    return DEFAULT_CACHE_ENTRIES
+
+
+def new_module_document(module, aulas_liberadas=None):
+    """Documento inicial de um módulo (só o sequencial começa com a aula 1 liberada)"""
+    if aulas_liberadas is None:
+        aulas_liberadas = [1] if module == 'sequencial' else []
+    return {
+        'aulas_concluidas': [],
+        'aulas_liberadas': aulas_liberadas,
+        'criado_em': firestore.SERVER_TIMESTAMP,
+        'ultima_atualizacao': firestore.SERVER_TIMESTAMP,
+        'total_aulas': TOTAL_LESSONS,
+        'nome_modulo': MODULE_NAMES.get(module, module.title())
+    }
+
+
+def module_access(target_module, previous_data):
+    """
+    Verifica se o módulo pode ser acessado a partir dos dados do módulo anterior
+    Retorna: (pode_acessar, mensagem)
+    """
+    if target_module == 'sequencial':
+        return True, "Módulo inicial sempre liberado"
+
+    if target_module not in MODULE_ORDER:
+        return False, "Módulo inválido"
+
+    previous_module = MODULE_ORDER[MODULE_ORDER.index(target_module) - 1]
+    if previous_data is None:
+        return False, f"Módulo anterior ({previous_module}) não encontrado"
+
+    completed = len(previous_data.get('aulas_concluidas', []))
+    total_aulas = previous_data.get('total_aulas', TOTAL_LESSONS)
+    if completed >= total_aulas:
+        return True, f"Módulo {previous_module} completado"
+    return False, (f"Complete todas as {total_aulas} aulas de {previous_module} primeiro "
+                   f"(concluídas: {completed}/{total_aulas})")
+
+
+def unlocked_from_progress(modules_data):
+    """Módulos liberados a partir do progresso ({modulo: dict ou None})"""
+    return {
+        module for index, module in enumerate(MODULE_ORDER)
+        if module_access(module, modules_data.get(MODULE_ORDER[index - 1]) if index > 0 else None)[0]
+    }
+
+
+def unlocked_document(unlocked):
+    """
+    Campo derivado completo (backfill) para usuarios/{user_id}
+    ArrayUnion: liberações gravadas ao mesmo tempo por outras requisições não se perdem
+    """
+    return {
+        'modulos_liberados': firestore.ArrayUnion(sorted(unlocked, key=MODULE_ORDER.index)),
+        'modulos_liberados_completo': True
+    }
+
+
+def lessons_to_mask(lessons):
+    """Aulas como bitmask (bit 0 = aula 1)"""
+    mask = 0
+    for lesson in lessons:
+        if isinstance(lesson, int) and 1 <= lesson <= 63:
+            mask |= 1 << (lesson - 1)
+    return mask
+
+
+def mask_to_lessons(mask):
+    """Lista ordenada das aulas de um bitmask"""
+    return [bit + 1 for bit in range(mask.bit_length()) if mask >> bit & 1]
+
+
+def compact_document(modules_data):
+    """Documento compacto a partir dos dados por módulo ({modulo: dict ou None})"""
+    document = {'versao': COMPACT_VERSION, 'concluidas': {}}
+    for module in MODULE_ORDER:
+        data = modules_data.get(module)
+        if data is None:
+            continue
+        document['concluidas'][module] = lessons_to_mask(data.get('aulas_concluidas', []))
+        # Só grava o que foge do padrão
+        total_aulas = data.get('total_aulas', TOTAL_LESSONS)
+        if total_aulas != TOTAL_LESSONS:
+            document.setdefault('total_aulas', {})[module] = total_aulas
+        if data.get('pulado'):
+            document.setdefault('pulados', {})[module] = True
+    return document
+
+
+def expand_compact(document):
+    """
+    Dados de cada módulo (no formato dos documentos por módulo) a partir do documento compacto
+    Aulas liberadas: as concluídas, a seguinte a cada concluída e a aula 1 se o
+    módulo anterior foi concluído (o primeiro módulo está sempre liberado)
+    """
+    masks = document.get('concluidas') or {}
+    totals = document.get('total_aulas') or {}
+    modules = {}
+    previous_completed = True
+    for module in MODULE_ORDER:
+        total_aulas = totals.get(module, TOTAL_LESSONS)
+        aulas_concluidas = mask_to_lessons(masks.get(module, 0))
+        aulas_liberadas = set(aulas_concluidas) | {lesson + 1 for lesson in aulas_concluidas if lesson < total_aulas}
+        if previous_completed:
+            aulas_liberadas.add(1)
+        modules[module] = {
+            'aulas_concluidas': aulas_concluidas,
+            'aulas_liberadas': sorted(aulas_liberadas),
+            'total_aulas': total_aulas,
+            'nome_modulo': MODULE_NAMES[module]
+        }
+        previous_completed = len(aulas_concluidas) >= total_aulas
+    return modules
+
+
+def compact_changes(module, data, replace=False):
+    """Alteração no documento compacto equivalente a gravar data no documento do módulo"""
+    changes = {}
+    aulas_concluidas = data.get('aulas_concluidas', [] if replace else None)
+    if aulas_concluidas is not None:
+        if not isinstance(aulas_concluidas, list):
+            raise ValueError("aulas_concluidas precisa ser uma lista no layout compacto")
+        changes['concluidas'] = {module: lessons_to_mask(aulas_concluidas)}
+    total_aulas = data.get('total_aulas')
+    if isinstance(total_aulas, int) and total_aulas != TOTAL_LESSONS:
+        changes['total_aulas'] = {module: total_aulas}
+    if data.get('pulado'):
+        changes['pulados'] = {module: True}
+    # aulas_liberadas é ignorado: no layout compacto é derivado das concluídas
+    if changes:
+        changes['ultima_atualizacao'] = firestore.SERVER_TIMESTAMP
+    return changes
+
+
+def _merge_maps(base, changes):
+    """Mesmo resultado de set(changes, merge=True) sobre base (mapas aninhados são mesclados)"""
+    merged = dict(base)
+    for key, value in changes.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge_maps(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def _select(data, fields):
+    if data is None or fields is None:
+        return data
+    return {field: value for field, value in data.items() if field in fields}
+
+
+def module_summary(module, data, can_access=True):
+    """Resumo do progresso de um módulo no formato das respostas da API"""
+    if data is not None:
+        aulas_concluidas = data.get('aulas_concluidas', [])
+        aulas_liberadas = data.get('aulas_liberadas', [])
+        total_aulas = data.get('total_aulas', TOTAL_LESSONS)
+        nome_modulo = data.get('nome_modulo', MODULE_NAMES.get(module, module.title()))
+    else:
+        aulas_concluidas = []
+        aulas_liberadas = [1]
+        total_aulas = TOTAL_LESSONS
+        nome_modulo = MODULE_NAMES.get(module, module.title())
+
+    # Sem acesso ao módulo nenhuma aula fica liberada
+    if not can_access:
+        aulas_liberadas = []
+
+    total_completed = len(aulas_concluidas)
+
+    # Próxima aula disponível
+    next_lesson = None
+    for lesson in range(1, total_aulas + 1):
+        if lesson in aulas_liberadas and lesson not in aulas_concluidas:
+            next_lesson = lesson
+            break
+
+    return {
+        "nome_modulo": nome_modulo,
+        "aulas_concluidas": aulas_concluidas,
+        "aulas_liberadas": aulas_liberadas,
+        "total_completed": total_completed,
+        "total_lessons": total_aulas,
+        "progress_percentage": (total_completed / total_aulas) * 100 if total_aulas else 0,
+        "next_lesson": next_lesson,
+        "can_access": can_access
+    }
+
+
+class ProgressStore:
+    """Leituras e escritas dos documentos de progresso de cada módulo"""
+
+    def __init__(self, db=None, cache_entries=None, cache_ttl=None, transactional=None, layout=None):
+        """
+        Args:
+            db: cliente Firestore
+            cache_entries: usuários com o progresso em cache (0 = sem cache;
+                           padrão: default_cache_entries())
+            cache_ttl: validade do progresso em cache (segundos)
+            transactional: decorador de transações (padrão: firestore.transactional)
+            layout: 'modules', 'dual' ou 'compact' (padrão: PROGRESS_LAYOUT ou 'modules')
+        """
+        self.db = db
+        self.layout = layout or os.getenv('PROGRESS_LAYOUT', 'modules')
+        if self.layout not in LAYOUTS:
+            logging.warning(f"⚠️ PROGRESS_LAYOUT inválido ({self.layout}), usando 'modules'")
+            self.layout = 'modules'
+        self._transactional = transactional or firestore.transactional
+        entries = cache_entries if cache_entries is not None else default_cache_entries()
+        ttl = cache_ttl or float(os.getenv('PROGRESS_CACHE_TTL', '120'))
+        self._cache = LRUCache(max_entries=entries, ttl=ttl) if entries > 0 else None
+        # Módulos liberados de cada usuário (verificações de acesso)
+        self._unlocked = LRUCache(max_entries=entries, ttl=ttl) if entries > 0 else None
+        self._lock = threading.Lock()
+        self._loading = {}  # user_id -> marca da leitura em andamento (descartada se houver escrita)
+        self._counters = {
+            'firestore_reads': 0, 'reads_saved': 0, 'write_through': 0, 'invalidations': 0,
+            'legacy_fallbacks': 0, 'migrated_on_write': 0, 'unlocked_backfilled': 0
+        }
+
+    def set_client(self, db):
+        self.db = db
+        if self._cache is not None:
+            self._cache.clear()
+            self._unlocked.clear()
+
+    @property
+    def available(self):
+        return self.db is not None
+
+    def _module_ref(self, user_id, module):
+        return self.db.collection('usuarios').document(user_id).collection('conteudo').document(module)
+
+    def _compact_ref(self, user_id):
+        return self.db.collection(COMPACT_COLLECTION).document(user_id)
+
+    def _user_ref(self, user_id):
+        return self.db.collection('usuarios').document(user_id)
+
+    # ------------------------------------------------------------------
+    # Leituras
+    # ------------------------------------------------------------------
+    def get_module(self, user_id, module, fields=PROGRESS_FIELDS, fresh=False):
+        """
+        Dados de um módulo (apenas os campos pedidos) ou None se o documento não existe
+        fresh=True lê direto do Firestore (leituras que antecedem uma escrita)
+        """
+        if not fresh and self._cacheable([module], fields):
+            return self._from_snapshot(user_id, [module], fields)[module]
+        return self._read_modules(user_id, [module], fields)[module]
+
+    def get_modules(self, user_id, modules=MODULE_ORDER, fields=PROGRESS_FIELDS):
+        """
+        Dados de vários módulos em uma única leitura (get_all)
+        Retorna: {modulo: dict ou None se o documento não existe}
+        """
+        if self._cacheable(modules, fields):
+            return self._from_snapshot(user_id, modules, fields)
+        return self._read_modules(user_id, modules, fields)
+
+    def _read_modules(self, user_id, modules, fields):
+        if self.layout == 'modules':
+            return self._read_legacy(user_id, modules, fields)
+
+        # Um documento com todos os módulos
+        self._counters['firestore_reads'] += 1
+        snapshot = self._compact_ref(user_id).get()
+        if snapshot.exists:
+            expanded = expand_compact(snapshot.to_dict() or {})
+            return {module: _select(expanded.get(module), fields) for module in modules}
+        if self.layout == 'dual':
+            # Usuário ainda não migrado
+            self._counters['legacy_fallbacks'] += 1
+            return self._read_legacy(user_id, modules, fields)
+        return {module: None for module in modules}
+
+    def _read_legacy(self, user_id, modules, fields):
+        refs = [self._module_ref(user_id, module) for module in modules]
+        result = {module: None for module in modules}
+        self._counters['firestore_reads'] += len(refs)
+        # get_all não garante a ordem: cada snapshot é associado pelo id do documento
+        for snapshot in self.db.get_all(refs, field_paths=fields):
+            if snapshot.exists:
+                result[snapshot.id] = snapshot.to_dict() or {}
+        return result
+
+    def _cacheable(self, modules, fields):
+        # O cache guarda os campos de PROGRESS_FIELDS dos módulos do curso
+        return (
+            self._cache is not None and fields is not None
+            and set(fields) <= set(PROGRESS_FIELDS) and set(modules) <= set(MODULE_ORDER)
+        )
+
+    def _from_snapshot(self, user_id, modules, fields):
+        """Módulos pedidos a partir do progresso completo do usuário (em cache ou lido agora)"""
+        snapshot = self._cache.get(user_id)
+        if snapshot is not None:
+            self._counters['reads_saved'] += len(modules)
+        else:
+            marker = object()
+            with self._lock:
+                self._loading[user_id] = marker
+            try:
+                snapshot = self._read_modules(user_id, MODULE_ORDER, PROGRESS_FIELDS)
+            except Exception:
+                with self._lock:
+                    if self._loading.get(user_id) is marker:
+                        del self._loading[user_id]
+                raise
+            with self._lock:
+                # Uma escrita durante a leitura tornaria a cópia desatualizada
+                if self._loading.get(user_id) is marker:
+                    del self._loading[user_id]
+                    self._cache.set(user_id, snapshot)
+
+        # Cópias: as rotas alteram as listas antes de gravar
+        return {
+            module: None if snapshot[module] is None else {
+                field: copy.deepcopy(value) for field, value in snapshot[module].items() if field in fields
+            }
+            for module in modules
+        }
+
+    # ------------------------------------------------------------------
+    # Módulos liberados (campo derivado)
+    # ------------------------------------------------------------------
+    def check_access(self, user_id, module):
+        """
+        Verifica se o usuário pode acessar o módulo pelo conjunto de módulos liberados
+        Retorna: (pode_acessar, mensagem)
+        """
+        return self.check_access_all(user_id, [module])[module]
+
+    def check_access_all(self, user_id, modules=MODULE_ORDER):
+        """
+        Acesso a vários módulos com um único conjunto de módulos liberados
+        Liberações nunca são desfeitas: um "liberado" em cache vale, um "bloqueado"
+        é conferido no Firestore (o módulo pode ter sido liberado por outro processo)
+        Retorna: {modulo: (pode_acessar, mensagem)}
+        """
+        gated = [module for module in modules if module in MODULE_ORDER[1:]]
+        unlocked = self.unlocked_modules(user_id) if gated else set()
+        if self._unlocked is not None and any(module not in unlocked for module in gated):
+            unlocked = self.unlocked_modules(user_id, fresh=True)
+
+        access = {}
+        for module in modules:
+            if module not in gated:
+                access[module] = module_access(module, None)
+                continue
+            previous_module = MODULE_ORDER[MODULE_ORDER.index(module) - 1]
+            if module in unlocked:
+                access[module] = (True, f"Módulo {previous_module} completado")
+            else:
+                access[module] = (False, f"Complete todas as {TOTAL_LESSONS} aulas de {previous_module} primeiro")
+        return access
+
+    def unlocked_modules(self, user_id, fresh=False):
+        """
+        Conjunto dos módulos que o usuário pode acessar (em cache por usuário)
+        fresh=True lê do Firestore e atualiza o cache
+        """
+        if self._unlocked is None:
+            return self._load_unlocked(user_id)
+
+        cached = None if fresh else self._unlocked.get(user_id)
+        if cached is not None:
+            return set(cached)
+
+        key = ('unlocked', user_id)
+        marker = object()
+        with self._lock:
+            self._loading[key] = marker
+        try:
+            unlocked = self._load_unlocked(user_id, fresh)
+        except Exception:
+            with self._lock:
+                if self._loading.get(key) is marker:
+                    del self._loading[key]
+            raise
+        with self._lock:
+            # Uma liberação durante a leitura tornaria o conjunto desatualizado
+            if self._loading.get(key) is marker:
+                del self._loading[key]
+                self._unlocked.set(user_id, frozenset(unlocked))
+        return unlocked
+
+    def _load_unlocked(self, user_id, fresh=False):
+        # Progresso do usuário já em cache: deriva sem leitura
+        snapshot = self._cache.peek(user_id) if self._cache is not None and not fresh else None
+        if snapshot is not None:
+            return unlocked_from_progress(snapshot)
+        if self.layout != 'modules':
+            # O documento compacto traz todos os módulos em uma leitura
+            if fresh:
+                return unlocked_from_progress(self._read_modules(user_id, MODULE_ORDER, COMPLETION_FIELDS))
+            return unlocked_from_progress(self.get_modules(user_id, fields=COMPLETION_FIELDS))
+
+        self._counters['firestore_reads'] += 1
+        user = self._user_ref(user_id).get(field_paths=UNLOCK_FIELDS)
+        data = (user.to_dict() or {}) if user.exists else {}
+        if not data.get('modulos_liberados_completo'):
+            # Usuário anterior ao campo derivado: monta a partir do progresso
+            modules_data = self._read_modules(user_id, MODULE_ORDER, COMPLETION_FIELDS) if fresh else None
+            return self.backfill_unlocked(user_id, modules_data)
+        return set(data.get('modulos_liberados', [])) | {MODULE_ORDER[0]}
+
+    def backfill_unlocked(self, user_id, modules_data=None):
+        """
+        Grava o campo derivado a partir do progresso
+        modules_data: {modulo: dict ou None} já lido (padrão: lê os módulos)
+        """
+        if modules_data is None:
+            modules_data = self.get_modules(user_id, fields=COMPLETION_FIELDS)
+        unlocked = unlocked_from_progress(modules_data)
+        self._user_ref(user_id).set(unlocked_document(unlocked), merge=True)
+        self._counters['unlocked_backfilled'] += 1
+        return unlocked
+
+    def unlock_module(self, user_id, module):
+        """Registra a liberação de um módulo (módulo anterior concluído ou pulado)"""
+        if self.layout != 'compact':
+            self._user_ref(user_id).set({'modulos_liberados': firestore.ArrayUnion([module])}, merge=True)
+        self._add_unlocked(user_id, module)
+
+    def _add_unlocked(self, user_id, module):
+        """Write-through da liberação no conjunto em cache"""
+        if self._unlocked is None:
+            return
+        with self._lock:
+            self._loading.pop(('unlocked', user_id), None)
+            cached = self._unlocked.peek(user_id)
+            if cached is not None and module not in cached:
+                self._unlocked.set(user_id, cached | {module})
+
+    # ------------------------------------------------------------------
+    # Escritas (write-through no cache)
+    # ------------------------------------------------------------------
+    def set_module(self, user_id, module, data, merge=False):
+        if self.layout == 'modules':
+            self._module_ref(user_id, module).set(data, merge=merge)
+        else:
+            self._write_compact(user_id, module, data, replace=not merge,
+                                legacy=lambda writer, ref: writer.set(ref, data, merge=merge))
+        self._write_through(user_id, module, data, replace=not merge)
+
+    def update_module(self, user_id, module, data):
+        if self.layout == 'modules':
+            self._module_ref(user_id, module).update(data)
+        else:
+            self._write_compact(user_id, module, data, replace=False,
+                                legacy=lambda writer, ref: writer.update(ref, data))
+        self._write_through(user_id, module, data)
+
+    def _write_compact(self, user_id, module, data, replace, legacy):
+        """
+        Grava a alteração de um módulo no documento compacto; no período dual grava
+        também o documento do módulo (legacy), na mesma transação
+        """
+        changes = compact_changes(module, data, replace)
+        compact_ref = self._compact_ref(user_id)
+        if self.layout == 'compact':
+            if changes:
+                compact_ref.set(changes, merge=True)
+            return
+
+        def apply(transaction):
+            document, exists = self._read_compact(transaction, user_id)
+            legacy(transaction, self._module_ref(user_id, module))
+            if not exists:
+                self._counters['migrated_on_write'] += 1
+                transaction.set(compact_ref, _merge_maps(document, changes))
+            elif changes:
+                transaction.set(compact_ref, changes, merge=True)
+
+        self._transactional(apply)(self.db.transaction())
+
+    def _read_compact(self, transaction, user_id):
+        """
+        Documento compacto lido na transação: (dados, existe)
+        No período dual, quem ainda não foi migrado tem o documento montado a partir
+        dos documentos por módulo (e gravado por inteiro no commit)
+        """
+        for snapshot in transaction.get_all([self._compact_ref(user_id)]):
+            if snapshot.exists:
+                return snapshot.to_dict() or {}, True
+
+        legacy = {module: None for module in MODULE_ORDER}
+        if self.layout == 'dual':
+            refs = [self._module_ref(user_id, module) for module in MODULE_ORDER]
+            for snapshot in transaction.get_all(refs):
+                if snapshot.exists:
+                    legacy[snapshot.id] = snapshot.to_dict() or {}
+        document = compact_document(legacy)
+        document['criado_em'] = firestore.SERVER_TIMESTAMP
+        document['ultima_atualizacao'] = firestore.SERVER_TIMESTAMP
+        return document, False
+
+    def init_user(self, user_id):
+        """
+        Cria os documentos dos módulos que ainda não existem (um batch)
+        Retorna: lista dos módulos criados
+        """
+        existing = self.get_modules(user_id, fields=['total_aulas'])
+        missing = [module for module, data in existing.items() if data is None]
+        if missing and self.layout == 'compact':
+            # Sem documento compacto: cria um vazio (as aulas liberadas são derivadas)
+            if not self.migrate_user(user_id, {module: None for module in MODULE_ORDER}):
+                return []
+            logging.info(f"📚 Progresso criado para {user_id}")
+        elif missing:
+            batch = self.db.batch()
+            for module in missing:
+                batch.set(self._module_ref(user_id, module), new_module_document(module))
+            if len(missing) == len(MODULE_ORDER):
+                # Usuário novo: o campo derivado já nasce completo
+                batch.set(self._user_ref(user_id), unlocked_document({MODULE_ORDER[0]}), merge=True)
+            batch.commit()
+            for module in missing:
+                self._write_through(user_id, module, new_module_document(module), replace=True)
+            logging.info(f"📚 Progresso criado para {user_id}: {', '.join(missing)}")
+            if self.layout == 'dual':
+                self.migrate_user(user_id)
+        return missing
+
+    def migrate_user(self, user_id, legacy=None):
+        """
+        Cria o documento compacto a partir dos documentos por módulo
+        legacy: {modulo: dict ou None} já lido (padrão: lê do Firestore)
+        Retorna False se o documento compacto já existe: ele nunca é sobrescrito,
+        pode ter recebido escritas mais novas que os documentos lidos
+        """
+        if legacy is None:
+            legacy = self._read_legacy(user_id, MODULE_ORDER, None)
+        document = compact_document(legacy)
+        document['criado_em'] = firestore.SERVER_TIMESTAMP
+        document['ultima_atualizacao'] = firestore.SERVER_TIMESTAMP
+        try:
+            self._compact_ref(user_id).create(document)
+        except AlreadyExists:
+            return False
+        # As aulas liberadas passam a ser as derivadas
+        self.invalidate(user_id)
+        return True
+
+    def complete_lesson(self, user_id, module, lesson_number):
+        """
+        Conclui uma aula em uma única transação: marca a aula, libera a próxima e,
+        se o módulo terminou, libera a primeira aula do próximo módulo
+        Os dois documentos são lidos juntos e gravados em um único commit; as listas
+        usam ArrayUnion, então cliques simultâneos não perdem atualizações
+        (a transação é repetida pelo Firestore se houver conflito). No layout
+        compacto a transação lê e grava um único documento.
+        Retorna: dict com as listas resultantes ou None se a aula não está liberada
+        """
+        build = self._complete_in_modules if self.layout == 'modules' else self._complete_in_compact
+        result = self._transactional(build(user_id, module, lesson_number))(self.db.transaction())
+        if result is None:
+            return None
+
+        # Write-through com as listas já resolvidas pela transação
+        self._write_through(user_id, module, result)
+        if result['next_module']:
+            self._write_through(user_id, result['next_module'], result['next_document'],
+                                replace='criado_em' in result['next_document'])
+            logging.info(f"Módulo {result['next_module']} liberado para usuário {user_id}")
+        if result['unlocked_module']:
+            self._add_unlocked(user_id, result['unlocked_module'])
+        return result
+
+    def _complete_in_modules(self, user_id, module, lesson_number):
+        """Função da transação de complete_lesson no layout por módulo"""
+        module_ref = self._module_ref(user_id, module)
+        index = MODULE_ORDER.index(module) if module in MODULE_ORDER else None
+        next_module = MODULE_ORDER[index + 1] if index is not None and index + 1 < len(MODULE_ORDER) else None
+        next_ref = self._module_ref(user_id, next_module) if next_module else None
+
+        def apply(transaction):
+            refs = [module_ref] + ([next_ref] if next_ref else [])
+            docs = {module: None, next_module: None}
+            for snapshot in transaction.get_all(refs):
+                if snapshot.exists:
+                    docs[snapshot.id] = snapshot.to_dict() or {}
+
+            current = docs[module] or {}
+            aulas_concluidas = set(current.get('aulas_concluidas', []))
+            aulas_liberadas = set(current.get('aulas_liberadas', [1]))  # primeira aula sempre liberada
+            total_aulas = current.get('total_aulas', TOTAL_LESSONS)
+            if lesson_number not in aulas_liberadas:
+                return None
+
+            aulas_concluidas.add(lesson_number)
+            changes = {
+                'aulas_concluidas': firestore.ArrayUnion([lesson_number]),
+                'ultima_atualizacao': firestore.SERVER_TIMESTAMP,
+                'total_aulas': total_aulas
+            }
+            next_lesson = lesson_number + 1
+            if next_lesson <= total_aulas:
+                aulas_liberadas.add(next_lesson)
+                changes['aulas_liberadas'] = firestore.ArrayUnion([next_lesson])
+            if docs[module] is None:
+                # Documento ainda não criado: a aula 1 também fica registrada como liberada
+                aulas_liberadas.add(1)
+                changes['aulas_liberadas'] = firestore.ArrayUnion(sorted(aulas_liberadas))
+            transaction.set(module_ref, changes, merge=True)
+
+            # Módulo completo: libera o próximo (criando o documento se preciso)
+            next_document = None
+            unlocked_module = None
+            if next_module and len(aulas_concluidas) >= total_aulas:
+                unlocked_module = next_module
+                transaction.set(self._user_ref(user_id), {
+                    'modulos_liberados': firestore.ArrayUnion([next_module])
+                }, merge=True)
+                next_data = docs[next_module]
+                if next_data is None:
+                    next_document = new_module_document(next_module, [1])
+                    transaction.set(next_ref, next_document)
+                elif 1 not in next_data.get('aulas_liberadas', []):
+                    next_document = {'aulas_liberadas': sorted(set(next_data.get('aulas_liberadas', [])) | {1})}
+                    transaction.update(next_ref, {
+                        'aulas_liberadas': firestore.ArrayUnion([1]),
+                        'ultima_atualizacao': firestore.SERVER_TIMESTAMP
+                    })
+
+            return {
+                'aulas_concluidas': sorted(aulas_concluidas),
+                'aulas_liberadas': sorted(aulas_liberadas),
+                'total_aulas': total_aulas,
+                'next_module': next_module if next_document is not None else None,
+                'next_document': next_document,
+                'unlocked_module': unlocked_module
+            }
+
+        return apply
+
+    def _complete_in_compact(self, user_id, module, lesson_number):
+        """
+        Função da transação de complete_lesson no layout compacto: lê um documento
+        e grava o bitmask do módulo (o próximo módulo é liberado por derivação)
+        """
+        compact_ref = self._compact_ref(user_id)
+        index = MODULE_ORDER.index(module) if module in MODULE_ORDER else None
+        next_module = MODULE_ORDER[index + 1] if index is not None and index + 1 < len(MODULE_ORDER) else None
+
+        def apply(transaction):
+            document, exists = self._read_compact(transaction, user_id)
+            before = expand_compact(document)
+            if module not in before or lesson_number not in before[module]['aulas_liberadas']:
+                return None
+
+            mask = (document.get('concluidas') or {}).get(module, 0) | 1 << (lesson_number - 1)
+            changes = {'concluidas': {module: mask}, 'ultima_atualizacao': firestore.SERVER_TIMESTAMP}
+            if exists:
+                transaction.set(compact_ref, changes, merge=True)
+            else:
+                if self.layout == 'dual':
+                    self._counters['migrated_on_write'] += 1
+                transaction.set(compact_ref, _merge_maps(document, changes))
+
+            after = expand_compact(_merge_maps(document, changes))
+            current = after[module]
+            unlocked_next = (
+                next_module is not None
+                and 1 in after[next_module]['aulas_liberadas']
+                and 1 not in before[next_module]['aulas_liberadas']
+            )
+            completed = next_module is not None and len(current['aulas_concluidas']) >= current['total_aulas']
+            if self.layout == 'dual':
+                # Mantém os documentos por módulo e o campo derivado em dia enquanto o compacto não é o único
+                if completed:
+                    transaction.set(self._user_ref(user_id), {
+                        'modulos_liberados': firestore.ArrayUnion([next_module])
+                    }, merge=True)
+                transaction.set(self._module_ref(user_id, module), {
+                    'aulas_concluidas': firestore.ArrayUnion([lesson_number]),
+                    'aulas_liberadas': firestore.ArrayUnion(current['aulas_liberadas']),
+                    'total_aulas': current['total_aulas'],
+                    'ultima_atualizacao': firestore.SERVER_TIMESTAMP
+                }, merge=True)
+                if unlocked_next:
+                    transaction.set(self._module_ref(user_id, next_module), {
+                        'aulas_liberadas': firestore.ArrayUnion([1]),
+                        'total_aulas': after[next_module]['total_aulas'],
+                        'nome_modulo': after[next_module]['nome_modulo'],
+                        'ultima_atualizacao': firestore.SERVER_TIMESTAMP
+                    }, merge=True)
+
+            return {
+                'aulas_concluidas': current['aulas_concluidas'],
+                'aulas_liberadas': current['aulas_liberadas'],
+                'total_aulas': current['total_aulas'],
+                'next_module': next_module if unlocked_next else None,
+                'next_document': {'aulas_liberadas': after[next_module]['aulas_liberadas']} if unlocked_next else None,
+                'unlocked_module': next_module if completed else None
+            }
+
+        return apply
+
+    def invalidate(self, user_id):
+        """Descarta o progresso do usuário em cache (ex.: escrita que não pode ser aplicada aqui)"""
+        if self._cache is None:
+            return
+        with self._lock:
+            self._loading.pop(user_id, None)
+            self._loading.pop(('unlocked', user_id), None)
+            self._unlocked.pop(user_id)
+            if self._cache.pop(user_id) is not None:
+                self._counters['invalidations'] += 1
+
+    def _write_through(self, user_id, module, data, replace=False):
+        """Aplica a escrita já confirmada pelo Firestore à cópia em cache"""
+        if self._cache is None:
+            return
+        changes = {field: value for field, value in data.items() if field in PROGRESS_FIELDS}
+        # Sentinelas do Firestore (ArrayUnion, Increment...) só são resolvidas no servidor
+        if module not in MODULE_ORDER or not all(
+            value is None or isinstance(value, (list, int, float, str)) for value in changes.values()
+        ):
+            self.invalidate(user_id)
+            return
+
+        with self._lock:
+            self._loading.pop(user_id, None)
+            snapshot = self._cache.peek(user_id)
+            if snapshot is None:
+                return
+            current = {} if replace or snapshot[module] is None else snapshot[module]
+            snapshot = dict(snapshot)
+            snapshot[module] = {**current, **copy.deepcopy(changes)}
+            if self.layout != 'modules':
+                # Aulas liberadas derivadas das concluídas (inclusive as do próximo módulo)
+                snapshot = {
+                    name: _select(derived, PROGRESS_FIELDS)
+                    for name, derived in expand_compact(compact_document(snapshot)).items()
+                }
+            self._cache.set(user_id, snapshot)
+            self._counters['write_through'] += 1
+
+    def stats(self):
+        """Acertos do cache de progresso e leituras do Firestore evitadas (documentos)"""
+        return {
+            'layout': self.layout,
+            'cache': self._cache.stats() if self._cache is not None else None,
+            **self._counters
+        }
+
+
+# Instância global do acesso ao progresso
+progress_store = ProgressStore()
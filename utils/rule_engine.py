@@ -0,0 +1,244 @@
+"""
+Correção local por regras declarativas (sem IA)
+As regras de cada aula ficam em utils/correction_rules.json: construções da AST
+exigidas (print, input, if, laços...), expressões regulares sobre o código ou os
+textos exibidos e modelos de feedback. Na inicialização cada aula vira um
+verificador compilado, que analisa o código com uma única passada pela AST e
+uma única varredura por expressão regular combinada.
+"""
+
+import os
+import re
+import ast
+import json
+import logging
+from collections import Counter
+
+RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'correction_rules.json')
+
+SUCCESS_SUGGESTIONS = [
+    "Execute o código com os valores dos exemplos e compare a saída",
+    "Revise se os nomes das variáveis são claros",
+    "Você está pronto para a próxima aula"
+]
+
+
+class _FeatureCollector(ast.NodeVisitor):
+    """
+    Conta as construções do código em uma única passada pela AST
+    Chaves: nome do nó ('If', 'For'...), 'call:print', 'method:append', 'op:Mod',
+    'cmp:Lt', 'const:float', 'elif', 'nested_loop' e 'subscript2d'
+    """
+
+    def __init__(self):
+        self.features = Counter()
+        self.strings = []
+        self._loop_depth = 0
+
+    def generic_visit(self, node):
+        features = self.features
+        features[type(node).__name__] += 1
+
+        if isinstance(node, ast.Call):
+            func = node.func
+            if isinstance(func, ast.Name):
+                features['call:' + func.id] += 1
+            elif isinstance(func, ast.Attribute):
+                features['method:' + func.attr] += 1
+        elif isinstance(node, (ast.BinOp, ast.AugAssign, ast.BoolOp)):
+            features['op:' + type(node.op).__name__] += 1
+        elif isinstance(node, ast.Compare):
+            for op in node.ops:
+                features['cmp:' + type(op).__name__] += 1
+        elif isinstance(node, ast.Constant):
+            features['const:' + type(node.value).__name__] += 1
+            if isinstance(node.value, str):
+                self.strings.append(node.value)
+        elif isinstance(node, ast.If):
+            if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+                features['elif'] += 1
+        elif isinstance(node, ast.Subscript):
+            if isinstance(node.value, ast.Subscript):
+                features['subscript2d'] += 1
+
+        if isinstance(node, (ast.For, ast.While, ast.comprehension)):
+            self._loop_depth += 1
+            if self._loop_depth >= 2:
+                features['nested_loop'] += 1
+            super().generic_visit(node)
+            self._loop_depth -= 1
+        else:
+            super().generic_visit(node)
+
+
+class _Requirement:
+    """Uma exigência da aula: construções da AST, padrão no código ou casas decimais"""
+
+    def __init__(self, spec, aliases, pattern_name):
+        self.min = spec.get('min', 1)
+        self.max = spec.get('max')
+        self.weight = spec.get('weight', 1)
+        self.feedback = spec.get('feedback')
+        self.hint = spec.get('hint')
+        self.features = None
+        self.pattern = None
+        self.pattern_name = pattern_name
+        self.target = spec.get('in', 'source')
+
+        if 'node' in spec:
+            names = spec['node'] if isinstance(spec['node'], list) else [spec['node']]
+            self.features = [feature for name in names for feature in aliases.get(name, [name])]
+        elif 'decimals' in spec:
+            decimals = int(spec['decimals'])
+            # f"{x:.2f}", "%.2f" % x, "{:.2f}".format(x) ou round(x, 2)
+            self.pattern = rf'\.{decimals}f|round\([^\n]*,\s*{decimals}\s*\)'
+            self.target = 'source'
+            self.feedback = self.feedback or (
+                f"Os valores devem ser exibidos com {decimals} casa(s) decimal(is)."
+            )
+            self.hint = self.hint or f"Formate com f\"{{valor:.{decimals}f}}\""
+        elif 'pattern' in spec:
+            self.pattern = spec['pattern']
+            if spec.get('ignore_case'):
+                self.pattern = f'(?i:{self.pattern})'
+        else:
+            raise ValueError(f"Regra sem 'node', 'pattern' ou 'decimals': {spec}")
+
+        if not self.feedback:
+            raise ValueError(f"Regra sem feedback: {spec}")
+        self.hint = self.hint or self.feedback
+
+    def count(self, features, matched):
+        if self.features is not None:
+            return sum(features[feature] for feature in self.features)
+        return 1 if self.pattern_name in matched else 0
+
+    def satisfied(self, count):
+        return count >= self.min and (self.max is None or count <= self.max)
+
+
+class LessonChecker:
+    """Verificador compilado de uma aula"""
+
+    def __init__(self, exercise_id, specs, aliases, success=None, suggestions=None):
+        self.exercise_id = exercise_id
+        self.success = success
+        self.suggestions = suggestions or SUCCESS_SUGGESTIONS
+        self.requirements = [
+            _Requirement(spec, aliases, f'p{index}') for index, spec in enumerate(specs)
+        ]
+
+        # Todos os padrões da aula em uma expressão por alvo (código ou textos exibidos):
+        # cada padrão é um lookahead opcional com grupo nomeado, então em cada posição
+        # a varredura registra todos os padrões que casam ali, inclusive sobrepostos
+        self._combined = {}
+        for target in ('source', 'strings'):
+            parts = [
+                f'(?:(?=(?P<{requirement.pattern_name}>{requirement.pattern})))?'
+                for requirement in self.requirements
+                if requirement.pattern is not None and requirement.target == target
+            ]
+            if parts:
+                self._combined[target] = (re.compile(''.join(parts)), len(parts))
+
+    def _match_patterns(self, texts):
+        """Nomes dos padrões encontrados: uma única varredura (finditer) por alvo"""
+        matched = set()
+        for target, (regex, count) in self._combined.items():
+            found = set()
+            for match in regex.finditer(texts[target]):
+                found.update(name for name, value in match.groupdict().items() if value is not None)
+                if len(found) == count:
+                    break
+            matched |= found
+        return matched
+
+    def check(self, code):
+        """
+        Aplica as regras ao código
+        Retorna: dict no formato do AICorrector (correct, feedback, score, suggestions)
+        """
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return {
+                "correct": False,
+                "feedback": f"Seu código tem um erro de sintaxe na linha {e.lineno}: {e.msg}. Corrija-o antes de continuar.",
+                "score": 10,
+                "suggestions": [
+                    "Confira parênteses, aspas e dois-pontos",
+                    "Verifique a indentação dos blocos",
+                    "Execute o código para ver a mensagem de erro"
+                ],
+                "checks_passed": 0,
+                "checks_total": len(self.requirements)
+            }
+
+        collector = _FeatureCollector()
+        collector.visit(tree)
+        features = collector.features
+        matched = self._match_patterns({'source': code, 'strings': '\n'.join(collector.strings)})
+
+        total = sum(requirement.weight for requirement in self.requirements)
+        passed = 0
+        failures = []
+        for requirement in self.requirements:
+            count = requirement.count(features, matched)
+            if requirement.satisfied(count):
+                passed += requirement.weight
+            else:
+                failures.append((requirement, count))
+
+        checks = {
+            "checks_passed": len(self.requirements) - len(failures),
+            "checks_total": len(self.requirements)
+        }
+
+        if not failures:
+            return {
+                "correct": True,
+                "feedback": self.success or "Excelente! Seu código usa todas as construções esperadas para este exercício. Execute-o com os valores dos exemplos para conferir a saída.",
+                "score": 95,
+                "suggestions": list(self.suggestions[:3]),
+                **checks
+            }
+
+        requirement, count = failures[0]
+        feedback = requirement.feedback.format(count=count, min=requirement.min, max=requirement.max)
+        if len(failures) > 1:
+            feedback += f" Ainda há mais {len(failures) - 1} ponto(s) a ajustar."
+        return {
+            "correct": False,
+            "feedback": feedback,
+            "score": round(90 * passed / total) if total else 0,
+            "suggestions": [failure.hint for failure, _ in failures[:3]],
+            **checks
+        }
+
+
+class RuleEngine:
+    """Verificadores de todas as aulas, compilados a partir do arquivo de regras"""
+
+    def __init__(self, path=RULES_PATH):
+        with open(path, encoding='utf-8') as rules_file:
+            rules = json.load(rules_file)
+
+        aliases = rules.get('aliases', {})
+        modules = rules.get('modules', {})
+        self.checkers = {}
+        for exercise_id, lesson in rules.get('lessons', {}).items():
+            module = exercise_id.split('/')[0]
+            specs = modules.get(module, {}).get('requires', []) + lesson.get('requires', [])
+            self.checkers[exercise_id] = LessonChecker(
+                exercise_id, specs, aliases,
+                success=lesson.get('success'), suggestions=lesson.get('suggestions')
+            )
+        logging.info(f"📏 Regras de correção local compiladas para {len(self.checkers)} aulas")
+
+    def has_rules(self, exercise_id):
+        return exercise_id in self.checkers
+
+    def check(self, exercise_id, code):
+        """Retorna a correção pelas regras da aula ou None se a aula não possui regras"""
+        checker = self.checkers.get(exercise_id)
+        return checker.check(code) if checker else None
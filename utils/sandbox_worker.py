@@ -0,0 +1,188 @@
+"""
+Processo worker do pool de execução
+Lê jobs (JSON, um por linha) da entrada padrão e responde com o resultado
+Iniciado pelo ExecutionPool com: python -m utils.sandbox_worker
+
+Jobs interativos (terminal) trocam frames durante a execução:
+    worker -> pai: {"event": "output", "data"} e {"event": "input_request", "prompt"}
+    pai -> worker: {"event": "input_reply", "data"}
+"""
+
+import sys
+import os
+import json
+import base64
+import marshal
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows não possui o módulo resource
+    resource = None
+
+from utils.executor import run_sandboxed, DEFAULT_LIMITS
+
+
+def set_cpu_deadline(cpu_seconds):
+    """Limita o tempo de CPU do próximo job (SIGXCPU encerra o processo)"""
+    if resource is None or not cpu_seconds:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    soft = int(used + cpu_seconds) + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def set_memory_limit(max_memory_mb):
+    """Limita a memória do próximo job (relativa ao uso atual do worker)"""
+    if resource is None or not max_memory_mb:
+        return
+    try:
+        with open('/proc/self/statm') as statm:
+            current = int(statm.read().split()[0]) * resource.getpagesize()
+    except (OSError, ValueError, IndexError):
+        # Sem /proc (ex.: macOS): não é possível medir o uso atual com segurança
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    soft = current + max_memory_mb * 1024 * 1024
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (soft, hard))
+
+
+def worker_peak_rss_kb():
+    """
+    Pico de memória residente do processo worker desde que foi iniciado (KB)
+    O worker é reaproveitado: o valor inclui jobs anteriores e não mede esta execução
+    (o pico de memória de uma execução vem do profile, via tracemalloc)
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reporta em bytes, Linux em KB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+class OutputStreamer:
+    """
+    Agrupa a saída do aluno em trechos e envia pelo canal do protocolo
+    Envia ao atingir 4 KB ou a cada 16 ms; o primeiro print sai imediatamente
+    """
+
+    def __init__(self, channel, channel_lock, max_bytes=4096, interval=0.016):
+        self.channel = channel
+        self.channel_lock = channel_lock
+        self.max_bytes = max_bytes
+        self.interval = interval
+        self._buffer = []
+        self._size = 0
+        self._sent_any = False
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._thread.start()
+
+    def write(self, text):
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text)
+            if self._size >= self.max_bytes or not self._sent_any:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+
+    def _flush_loop(self):
+        while not self._stop.wait(self.interval):
+            with self._lock:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        data = ''.join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        self._sent_any = True
+        # Bloqueia se o processo pai não estiver consumindo (backpressure)
+        with self.channel_lock:
+            self.channel.write(json.dumps({'event': 'output', 'data': data}) + '\n')
+            self.channel.flush()
+
+
+def make_input_provider(channel, channel_lock, streamer):
+    """input() interativo: pede o valor ao processo pai e aguarda a resposta"""
+
+    def provide(prompt):
+        # A saída anterior precisa chegar antes do pedido de entrada
+        streamer.flush()
+        with channel_lock:
+            channel.write(json.dumps({'event': 'input_request', 'prompt': prompt}) + '\n')
+            channel.flush()
+
+        line = sys.stdin.readline()
+        if not line:
+            raise EOFError('Terminal encerrado')
+        return json.loads(line).get('data', '')
+
+    return provide
+
+
+def main():
+    # Canal do protocolo: duplica o stdout original e redireciona o fd 1 para
+    # /dev/null, assim nada que o código do aluno escreva corrompe as respostas
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'w', encoding='utf-8')
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    os.dup2(devnull, sys.stdout.fileno())
+
+    channel_lock = threading.Lock()
+
+    channel.write(json.dumps({'ready': True, 'pid': os.getpid()}) + '\n')
+    channel.flush()
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+
+        job = json.loads(line)
+        limits = {**DEFAULT_LIMITS, **job.get('limits', {})}
+        set_cpu_deadline(limits['cpu_seconds'])
+        set_memory_limit(limits['max_memory_mb'])
+
+        if 'bytecode' in job:
+            code = marshal.loads(base64.b64decode(job['bytecode']))
+        else:
+            code = job['code']
+
+        interactive = bool(job.get('interactive'))
+        streamer = OutputStreamer(channel, channel_lock) if job.get('stream') or interactive else None
+        input_provider = make_input_provider(channel, channel_lock, streamer) if interactive else None
+
+        result = run_sandboxed(
+            code, job.get('inputs'), limits, job.get('transcript'),
+            on_output=streamer.write if streamer else None,
+            profile=bool(job.get('profile')),
+            input_provider=input_provider
+        )
+        result['usage']['worker_peak_rss_kb'] = worker_peak_rss_kb()
+
+        # Todo trecho pendente sai antes do resultado final
+        if streamer:
+            streamer.close()
+
+        with channel_lock:
+            channel.write(json.dumps(result) + '\n')
+            channel.flush()
+
+
+if __name__ == '__main__':
+    main()
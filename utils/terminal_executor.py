@@ -3,30 +3,159 @@ Executor de código Python com terminal interativo
 Suporta input() em tempo real via WebSocket
 """
 
-import sys
-import io
-import traceback
+import os
+import time
+import logging
 import threading
-from contextlib import redirect_stdout, redirect_stderr
+from collections import deque
 from queue import Queue, Empty
 
+from utils.executor import DEFAULT_LIMITS
+from utils.execution_pool import SandboxProcess
+
+logger = logging.getLogger(__name__)
+
+
+def _debug(message, *args):
+    """Log de depuração: a mensagem só é formatada se o nível DEBUG estiver ativo"""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(message, *args)
+
+
+class CoalescedOutput:
+    """
+    Agrupa os prints de uma sessão em poucos frames do WebSocket
+    Envia ao atingir max_bytes ou após interval segundos; flush() força o envio
+    (usado antes de cada input() e ao fim da execução)
+    Os frames recentes ficam em um buffer circular para reenvio após reconexão
+    """
+
+    def __init__(self, socketio, session_id, max_bytes=None, interval=None, history_bytes=None):
+        self.socketio = socketio
+        self.session_id = session_id
+        self.max_bytes = max_bytes or int(os.getenv('TERMINAL_FLUSH_BYTES', '4096'))
+        self.interval = interval or float(os.getenv('TERMINAL_FLUSH_MS', '16')) / 1000
+        self.history_bytes = history_bytes or int(os.getenv('TERMINAL_REPLAY_BYTES', str(64 * 1024)))
+
+        self.frames = 0
+        self.bytes = 0
+        # Número de sequência do último frame enviado (o cliente informa o último recebido)
+        self.seq = 0
+
+        self._history = deque()
+        self._history_size = 0
+        self._run_start_seq = 0
+
+        self._lock = threading.Lock()
+        self._buffer = []
+        self._size = 0
+        self._stop = None
+        self._thread = None
+
+    def start(self):
+        """Inicia a thread que esvazia o buffer periodicamente durante a execução"""
+        with self._lock:
+            # Uma nova execução limpa o terminal: o histórico anterior não é reenviado
+            self._history.clear()
+            self._history_size = 0
+            self._run_start_seq = self.seq
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, args=(self._stop,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._stop is not None:
+            self._stop.set()
+            self._thread.join()
+            self._stop = None
+            self._thread = None
+        self.flush()
+
+    def write(self, text):
+        if not text:
+            return
+        with self._lock:
+            self._buffer.append(text)
+            self._size += len(text)
+            if self._size >= self.max_bytes:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def replay(self, after_seq=0):
+        """
+        Frames enviados depois de after_seq que ainda estão no histórico
+        Retorna: (lista de {'seq', 'data'}, True se parte da saída já foi descartada)
+        """
+        with self._lock:
+            self._flush_locked()
+            frames = [{'seq': seq, 'data': data} for seq, data in self._history if seq > after_seq]
+            oldest = self._history[0][0] if self._history else self.seq + 1
+            # Frames de execuções anteriores foram limpos de propósito, não contam como perdidos
+            return frames, oldest > max(after_seq, self._run_start_seq) + 1
+
+    def _flush_loop(self, stop):
+        while not stop.wait(self.interval):
+            self.flush()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        data = ''.join(self._buffer)
+        self._buffer = []
+        self._size = 0
+        self.seq += 1
+        self.socketio.emit('output', {'data': data, 'seq': self.seq}, room=self.session_id)
+        self.frames += 1
+        self.bytes += len(data.encode('utf-8'))
+
+        self._history.append((self.seq, data))
+        self._history_size += len(data)
+        while self._history_size > self.history_bytes and len(self._history) > 1:
+            _, dropped = self._history.popleft()
+            self._history_size -= len(dropped)
+        _debug("[OUTPUT] %s: frame com %d caracteres", self.session_id[:8], len(data))
+
 
 class InteractiveExecutor:
     """Executor que permite interação em tempo real com o código"""
     
-    def __init__(self, socketio, session_id):
+    def __init__(self, socketio, session_id, input_timeout=None):
         self.socketio = socketio
         self.session_id = session_id
         self.input_queue = Queue()
         self.should_stop = False
         self.is_cancelled = False
         self.execution_thread = None
+        # Tempo máximo aguardando cada input() do aluno (segundos)
+        self.input_timeout = input_timeout or float(os.getenv('TERMINAL_INPUT_TIMEOUT', '120'))
+        # Saída agrupada em frames (contadores acumulados da sessão)
+        self.output = CoalescedOutput(socketio, session_id)
+        
+        # Cada execução roda em um processo próprio, com os limites da execução em lote
+        self.limits = dict(DEFAULT_LIMITS)
+        # Prazo total da execução, incluindo o tempo aguardando inputs (segundos)
+        self.max_seconds = float(os.getenv('TERMINAL_MAX_SECONDS', '600'))
+        self.startup_timeout = 10
+        self.process = None
+        self._process_lock = threading.Lock()
+        # Prompt do input() aguardando resposta (reenviado ao reconectar)
+        self.pending_prompt = None
+    
+    def reset(self):
+        """Prepara o executor para uma nova execução na mesma sessão"""
+        self.is_cancelled = False
+        while not self.input_queue.empty():
+            try:
+                self.input_queue.get_nowait()
+            except Empty:
+                break
     
     def cleanup(self):
         """Limpa recursos do executor"""
-        import sys
-        sys.stdout.write(f"[CLEANUP] Limpando executor {self.session_id[:8]}\n")
-        sys.stdout.flush()
+        _debug("[CLEANUP] Limpando executor %s", self.session_id[:8])
         
         self.is_cancelled = True
         
@@ -43,38 +172,44 @@ class InteractiveExecutor:
         except:
             pass
         
-        sys.stdout.write(f"[CLEANUP] Limpeza completa\n")
-        sys.stdout.flush()
+        # Cliente desconectou: o processo em execução é encerrado na hora
+        self._kill_process()
+        
+        _debug("[CLEANUP] Limpeza completa")
+    
+    def wait_for_input(self, prompt="", deadline=None):
+        """
+        Aguarda input do usuário via WebSocket
+        deadline: prazo da execução (time.monotonic()); a espera não passa dele
+        """
+        _debug("[WAIT_INPUT] Solicitando input com prompt: %r", prompt)
         
-    def wait_for_input(self, prompt=""):
-        """Aguarda input do usuário via WebSocket"""
-        import sys
-        sys.stdout.write(f"[WAIT_INPUT] Solicitando input com prompt: {repr(prompt)}\n")
-        sys.stdout.flush()
+        # A saída pendente precisa chegar antes do pedido de entrada
+        self.output.flush()
         
         # Envia solicitação de input para o cliente
+        self.pending_prompt = prompt
         self.socketio.emit('request_input', {'prompt': prompt}, room=self.session_id)
         
-        # Aguarda resposta do usuário (com timeout)
+        # Aguarda resposta do usuário (com timeout, limitado ao prazo da execução)
+        timeout = self.input_timeout
+        if deadline is not None:
+            timeout = max(0, min(timeout, deadline - time.monotonic()))
         try:
-            sys.stdout.write(f"[WAIT_INPUT] Aguardando resposta na fila...\n")
-            sys.stdout.flush()
+            user_input = self.input_queue.get(timeout=timeout)
+            self.pending_prompt = None
             
-            user_input = self.input_queue.get(timeout=5)  # Timeout de 5 segundos para testar
-            
-            sys.stdout.write(f"[WAIT_INPUT] Recebido: {repr(user_input)}\n")
-            sys.stdout.flush()
+            _debug("[WAIT_INPUT] Recebido: %r", user_input)
             
             # Verifica se foi cancelado
             if self.is_cancelled:
-                sys.stdout.write(f"[WAIT_INPUT] Foi cancelado!\n")
-                sys.stdout.flush()
+                _debug("[WAIT_INPUT] Foi cancelado!")
                 raise KeyboardInterrupt("Execução cancelada")
-                
+            
             return str(user_input)
         except Empty:
-            sys.stdout.write(f"[WAIT_INPUT] TIMEOUT aguardando entrada!\n")
-            sys.stdout.flush()
+            self.pending_prompt = None
+            _debug("[WAIT_INPUT] TIMEOUT aguardando entrada!")
             raise TimeoutError("Timeout aguardando entrada do usuário")
     
     def provide_input(self, user_input):
@@ -90,118 +225,133 @@ class InteractiveExecutor:
             self.input_queue.put("")
         except:
             pass
+        # Código sem input() (ex.: loop infinito) só para matando o processo
+        self._kill_process()
     
     def execute(self, code):
         """Executa código Python com suporte a input interativo"""
-        import sys
-        sys.stdout.write(f"[EXECUTE] Iniciando execução, cancelado={self.is_cancelled}\n")
-        sys.stdout.flush()
+        _debug("[EXECUTE] Iniciando execução, cancelado=%s", self.is_cancelled)
         
-        try:
-            # Verifica se foi cancelado antes de começar
-            if self.is_cancelled:
-                sys.stdout.write(f"[EXECUTE] Já estava cancelado!\n")
-                sys.stdout.flush()
-                return {
-                    'success': False,
-                    'output': '',
-                    'error': 'Execução cancelada antes de iniciar'
-                }
-            
-            # Cria namespace com input interativo
-            # Importa builtins padrão e sobrescreve print e input
-            import builtins
-            
-            custom_builtins = {
-                'print': self._make_print_function(),
-                'input': self.wait_for_input,
-            }
-            
-            # Cria um dict que herda de builtins e adiciona nossas customizações
-            namespace = {
-                '__builtins__': {**vars(builtins), **custom_builtins}
-            }
-            
-            exec(code, namespace)
-            
-            # Verifica se foi cancelado após execução
-            if self.is_cancelled:
-                return {
-                    'success': False,
-                    'output': '',
-                    'error': 'Execução cancelada'
-                }
-            
-            return {
-                'success': True,
-                'output': '',
-                'error': None
-            }
-            
-        except KeyboardInterrupt:
-            return {
-                'success': False,
-                'output': '',
-                'error': 'Execução cancelada pelo usuário'
-            }
-        except Exception as e:
-            error_trace = traceback.format_exc()
-            error_message = f"{str(e)}\n{error_trace}"
-            # Envia erro para o terminal também
-            self.socketio.emit('output', {'data': f"\n{error_message}"}, room=self.session_id)
+        # Verifica se foi cancelado antes de começar
+        if self.is_cancelled:
+            _debug("[EXECUTE] Já estava cancelado!")
             return {
                 'success': False,
                 'output': '',
-                'error': error_message
+                'error': 'Execução cancelada antes de iniciar'
             }
+        
+        frames_before = self.output.frames
+        bytes_before = self.output.bytes
+        self.output.start()
+        try:
+            result = self._run(code)
+        finally:
+            self.output.stop()
+        
+        # Frames e bytes enviados nesta execução
+        result['frames'] = self.output.frames - frames_before
+        result['output_bytes'] = self.output.bytes - bytes_before
+        return result
     
-    def _make_print_function(self):
-        """Cria função print que envia output via WebSocket em tempo real"""
-        socketio = self.socketio
-        session_id = self.session_id
+    def _run(self, code):
+        """
+        Executa o código em um processo filho (um por execução)
+        O processo é morto imediatamente ao cancelar, desconectar ou estourar o prazo
+        """
+        try:
+            process = SandboxProcess(f'terminal-{self.session_id[:8]}')
+        except OSError as e:
+            logging.error(f"Não foi possível iniciar o processo do terminal: {e}")
+            return {'success': False, 'output': '', 'error': 'Erro interno ao iniciar o terminal'}
         
-        def custom_print(*args, **kwargs):
-            # Log temporário para debug
-            import sys
-            sys.stdout.write(f"[CUSTOM_PRINT] Args: {args}\n")
-            sys.stdout.flush()
-            
-            # Converte args para string como print normal faria
-            sep = kwargs.get('sep', ' ')
-            end = kwargs.get('end', '\n')
-            output = sep.join(str(arg) for arg in args) + end
-            
-            sys.stdout.write(f"[CUSTOM_PRINT] Output: {repr(output)}\n")
-            sys.stdout.flush()
-            
-            # Converte \n para \r\n para o terminal
-            output = output.replace('\n', '\r\n')
+        with self._process_lock:
+            self.process = process
+        
+        deadline = None
+        try:
+            # Cancelado enquanto o processo iniciava
+            if self.is_cancelled or not process.wait_ready(self.startup_timeout):
+                raise KeyboardInterrupt("Execução cancelada")
             
-            sys.stdout.write(f"[CUSTOM_PRINT] Enviando para {session_id}\n")
-            sys.stdout.flush()
+            deadline = time.monotonic() + self.max_seconds
+            process.send({'code': code, 'limits': self.limits, 'interactive': True})
             
-            # Envia output para o cliente via WebSocket
-            try:
-                socketio.emit('output', {'data': output}, room=session_id)
-                socketio.sleep(0)  # Força flush do SocketIO
-                sys.stdout.write(f"[CUSTOM_PRINT] Enviado com sucesso!\n")
-                sys.stdout.flush()
-            except Exception as e:
-                sys.stdout.write(f"[CUSTOM_PRINT] ERRO: {e}\n")
-                sys.stdout.flush()
+            while True:
+                frame = process.receive(max(0, deadline - time.monotonic()))
+                
+                if frame is None:
+                    # Processo encerrado: cancelamento ou limite de CPU/memória
+                    if self.is_cancelled:
+                        raise KeyboardInterrupt("Execução cancelada")
+                    reason = process.exit_reason()
+                    messages = {
+                        'cpu': 'Execução interrompida: limite de tempo de CPU excedido.',
+                        'memory': 'Execução interrompida: limite de memória excedido.',
+                    }
+                    return self._failure(
+                        messages.get(reason, 'Execução interrompida: limite de recursos excedido.'),
+                        [reason] if reason else []
+                    )
+                
+                event = frame.get('event')
+                if event == 'output':
+                    # Converte \n para \r\n para o terminal
+                    self.output.write(frame['data'].replace('\n', '\r\n'))
+                    continue
+                
+                if event == 'input_request':
+                    value = self.wait_for_input(frame.get('prompt', ''), deadline)
+                    process.send({'event': 'input_reply', 'data': value})
+                    continue
+                
+                # Resultado final
+                if frame.get('error'):
+                    # Envia erro para o terminal também (depois da saída já produzida)
+                    self.output.write(f"\n{frame['error']}".replace('\n', '\r\n'))
+                return {
+                    'success': frame['success'],
+                    'output': '',
+                    'error': frame.get('error'),
+                    'limits_hit': frame.get('limits_hit', [])
+                }
         
-        return custom_print
-
-
-class ExecutionThread(threading.Thread):
-    """Thread para executar código de forma não-bloqueante"""
+        except Empty:
+            return self._failure(
+                f'Tempo limite do terminal excedido ({self.max_seconds:g}s).', ['time']
+            )
+        except KeyboardInterrupt:
+            return self._failure('Execução cancelada pelo usuário')
+        except TimeoutError:
+            if deadline is not None and time.monotonic() >= deadline:
+                return self._failure(
+                    f'Tempo limite do terminal excedido ({self.max_seconds:g}s).', ['time']
+                )
+            return self._failure('Tempo esgotado aguardando a entrada do usuário', ['input'])
+        except (OSError, ValueError) as e:
+            # Pipe fechado: o processo foi morto durante a escrita
+            if self.is_cancelled:
+                return self._failure('Execução cancelada pelo usuário')
+            logging.error(f"Erro de comunicação com o processo do terminal: {e}")
+            return self._failure('Erro interno do servidor')
+        finally:
+            with self._process_lock:
+                self.process = None
+            process.kill()
     
-    def __init__(self, executor, code, callback):
-        super().__init__(daemon=True)
-        self.executor = executor
-        self.code = code
-        self.callback = callback
+    def _kill_process(self):
+        """Mata o processo em execução (e seu grupo de processos)"""
+        with self._process_lock:
+            process = self.process
+        if process is not None:
+            process.kill()
     
-    def run(self):
-        result = self.executor.execute(self.code)
-        self.callback(result)
+    @staticmethod
+    def _failure(error, limits_hit=None):
+        return {
+            'success': False,
+            'output': '',
+            'error': error,
+            'limits_hit': limits_hit or []
+        }
+
@@ -0,0 +1,343 @@
+"""
+Registro de sessões do terminal interativo
+Um número fixo de threads executa os programas; sessões excedentes aguardam
+em uma fila FIFO e sessões ociosas são removidas periodicamente.
+Cada sessão é identificada por um token: se a conexão cair, o cliente pode
+reconectar com o mesmo token, receber a saída perdida e continuar a execução.
+"""
+
+import os
+import time
+import logging
+import secrets
+import threading
+from collections import deque
+
+from utils.terminal_executor import InteractiveExecutor
+
+
+class TerminalSession:
+    """Estado de um terminal (sobrevive a reconexões do cliente)"""
+
+    def __init__(self, session_id, executor):
+        self.session_id = session_id
+        self.executor = executor
+        self.state = 'idle'  # idle | queued | running
+        self.code = None
+        self.last_activity = time.monotonic()
+        # Conexões Socket.IO ligadas à sessão; vazio = sessão órfã
+        self.clients = set()
+        self.detached_at = None
+
+    def touch(self):
+        self.last_activity = time.monotonic()
+
+
+class TerminalSessionManager:
+    """
+    Agenda as execuções do terminal com limite de concorrência
+    Evita uma thread por execução: no máximo max_concurrent programas rodam ao mesmo tempo
+    """
+
+    def __init__(self, socketio, max_concurrent=None, max_queued=None,
+                 idle_timeout=None, input_timeout=None, resume_grace=None, reap_interval=None):
+        """
+        Args:
+            socketio: instância do Flask-SocketIO usada para emitir eventos
+            max_concurrent: execuções simultâneas (threads de execução)
+            max_queued: sessões aguardando na fila antes de recusar
+            idle_timeout: segundos sem atividade para remover uma sessão
+            input_timeout: segundos aguardando cada input() do aluno
+            resume_grace: segundos que uma sessão sem conexão aguarda a reconexão
+        """
+        self.socketio = socketio
+        self.max_concurrent = max_concurrent or int(os.getenv('TERMINAL_MAX_CONCURRENT', '4'))
+        self.max_queued = max_queued if max_queued is not None else int(os.getenv('TERMINAL_MAX_QUEUED', '32'))
+        self.idle_timeout = idle_timeout or float(os.getenv('TERMINAL_IDLE_TIMEOUT', '600'))
+        self.input_timeout = input_timeout or float(os.getenv('TERMINAL_INPUT_TIMEOUT', '120'))
+        self.resume_grace = resume_grace or float(os.getenv('TERMINAL_RESUME_GRACE', '60'))
+        self.reap_interval = reap_interval or min(30, self.resume_grace / 2)
+
+        self._lock = threading.Condition()
+        self._sessions = {}
+        self._clients = {}  # sid da conexão -> token da sessão
+        self._queue = deque()
+        self._running = 0
+        self._threads = []
+        self._started = False
+
+        self._counters = {
+            'executed': 0,
+            'rejected': 0,
+            'cancelled': 0,
+            'evicted': 0,
+            'resumed': 0,
+            'orphans_reaped': 0,
+            'output_frames': 0,
+            'output_bytes': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------------
+    def start(self):
+        """Cria as threads de execução e a de limpeza (apenas na primeira chamada)"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for index in range(self.max_concurrent):
+                thread = threading.Thread(
+                    target=self._worker_loop, name=f'terminal-exec-{index}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+            reaper = threading.Thread(target=self._reap_loop, name='terminal-reaper', daemon=True)
+            reaper.start()
+            self._threads.append(reaper)
+        logging.info(f"🖥️ Terminal interativo: {self.max_concurrent} execuções simultâneas, "
+                     f"fila de {self.max_queued}")
+
+    # ------------------------------------------------------------------
+    # Conexões
+    # ------------------------------------------------------------------
+    def open_session(self, sid):
+        """Cria uma sessão para a conexão e retorna seu token"""
+        self.start()
+        token = secrets.token_urlsafe(24)
+        with self._lock:
+            session = self._get_or_create(token)
+            session.clients.add(sid)
+            self._clients[sid] = token
+        return token
+
+    def resume_session(self, token, sid, last_seq=0):
+        """
+        Religa uma conexão a uma sessão existente
+        Retorna: dict com state, replay (frames após last_seq), truncated e
+                 pending_prompt, ou None se a sessão não existe mais
+        """
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is None:
+                return None
+            session.clients.add(sid)
+            session.detached_at = None
+            session.touch()
+            self._clients[sid] = token
+            self._counters['resumed'] += 1
+            state = session.state
+
+        replay, truncated = session.executor.output.replay(last_seq)
+        return {
+            'state': state,
+            'replay': replay,
+            'truncated': truncated,
+            'pending_prompt': session.executor.pending_prompt if state == 'running' else None,
+        }
+
+    def detach(self, sid):
+        """
+        Conexão caiu: a sessão continua (inclusive a execução) aguardando reconexão
+        Sessões órfãs por mais de resume_grace segundos são removidas pelo reaper
+        """
+        with self._lock:
+            token = self._clients.pop(sid, None)
+            session = self._sessions.get(token)
+            if session is None:
+                return
+            session.clients.discard(sid)
+            if not session.clients:
+                session.detached_at = time.monotonic()
+
+    def token_for(self, sid):
+        with self._lock:
+            return self._clients.get(sid)
+
+    # ------------------------------------------------------------------
+    # Operações das sessões
+    # ------------------------------------------------------------------
+    def submit(self, session_id, code):
+        """
+        Coloca a execução da sessão na fila
+        Retorna: dict com 'queued' e 'position' ou com 'error'
+        """
+        self.start()
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and session.state != 'idle':
+                return {'queued': False, 'error': 'Já existe uma execução em andamento neste terminal'}
+
+            if len(self._queue) >= self.max_queued:
+                self._counters['rejected'] += 1
+                return {'queued': False, 'error': 'Servidor ocupado: muitos terminais em execução. Tente novamente em instantes.'}
+
+            session = self._get_or_create(session_id)
+            session.touch()
+            session.state = 'queued'
+            session.code = code
+            self._queue.append(session)
+            position = len(self._queue)
+            self._lock.notify()
+
+        return {'queued': True, 'position': position}
+
+    def provide_input(self, session_id, value):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.touch()
+        session.executor.provide_input(value)
+
+    def cancel(self, session_id):
+        """Cancela a execução da sessão (na fila ou em andamento)"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return
+            session.touch()
+
+            if session.state == 'queued':
+                self._queue.remove(session)
+                session.state = 'idle'
+                session.code = None
+                self._counters['cancelled'] += 1
+                self._emit('execution_complete', {
+                    'success': False,
+                    'output': '',
+                    'error': 'Execução cancelada pelo usuário'
+                }, session_id)
+                self._notify_positions()
+                return
+
+            if session.state == 'running':
+                self._counters['cancelled'] += 1
+        session.executor.cancel()
+
+    def remove(self, session_id):
+        """Remove a sessão e encerra sua execução"""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return
+            for sid in session.clients:
+                self._clients.pop(sid, None)
+            if session.state == 'queued':
+                self._queue.remove(session)
+                self._notify_positions()
+        session.executor.cleanup()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'orphaned': sum(1 for session in self._sessions.values() if not session.clients),
+                'running': self._running,
+                'queued': len(self._queue),
+                'max_concurrent': self.max_concurrent,
+                'max_queued': self.max_queued,
+                'idle_timeout': self.idle_timeout,
+                'input_timeout': self.input_timeout,
+                'resume_grace': self.resume_grace,
+                **self._counters
+            }
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _get_or_create(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is None:
+            executor = InteractiveExecutor(self.socketio, session_id, input_timeout=self.input_timeout)
+            session = TerminalSession(session_id, executor)
+            self._sessions[session_id] = session
+        return session
+
+    def _worker_loop(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._lock.wait()
+                session = self._queue.popleft()
+                # Limpa o estado da execução anterior junto com a mudança para 'running':
+                # um cancel() a partir daqui marca o executor e não é desfeito
+                session.executor.reset()
+                session.state = 'running'
+                self._running += 1
+                code = session.code
+                self._notify_positions()
+
+            self._emit('execution_started', {}, session.session_id)
+            try:
+                result = session.executor.execute(code)
+            except Exception as e:
+                logging.error(f"Erro no terminal interativo: {e}")
+                result = {'success': False, 'output': '', 'error': 'Erro interno do servidor'}
+
+            with self._lock:
+                self._running -= 1
+                self._counters['executed'] += 1
+                self._counters['output_frames'] += result.get('frames', 0)
+                self._counters['output_bytes'] += result.get('output_bytes', 0)
+                session.state = 'idle'
+                session.code = None
+                session.touch()
+            self._emit('execution_complete', result, session.session_id)
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(self.reap_interval)
+            self._reap_orphans()
+            self._evict_idle()
+
+    def _reap_orphans(self):
+        """Remove sessões sem conexão há mais de resume_grace (matando a execução)"""
+        now = time.monotonic()
+        with self._lock:
+            orphans = [
+                session.session_id for session in self._sessions.values()
+                if not session.clients and session.detached_at is not None
+                and now - session.detached_at > self.resume_grace
+            ]
+            self._counters['orphans_reaped'] += len(orphans)
+
+        for token in orphans:
+            self.remove(token)
+
+        if orphans:
+            logging.info(f"🧹 {len(orphans)} sessão(ões) órfã(s) do terminal removida(s)")
+
+    def _evict_idle(self):
+        """Remove sessões sem atividade há mais de idle_timeout (exceto as em execução)"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [
+                session for session in self._sessions.values()
+                if session.state == 'idle' and now - session.last_activity > self.idle_timeout
+            ]
+            for session in expired:
+                del self._sessions[session.session_id]
+                for sid in session.clients:
+                    self._clients.pop(sid, None)
+                self._counters['evicted'] += 1
+
+        for session in expired:
+            session.executor.cleanup()
+            self._emit('session_expired', {
+                'message': 'Sessão encerrada por inatividade'
+            }, session.session_id)
+
+        if expired:
+            logging.info(f"🧹 {len(expired)} sessão(ões) do terminal removida(s) por inatividade")
+
+    def _notify_positions(self):
+        # Chamado com o lock: informa a posição de cada sessão na fila
+        for position, session in enumerate(self._queue, start=1):
+            self._emit('execution_queued', {'position': position}, session.session_id)
+
+    def _emit(self, event, data, session_id):
+        try:
+            self.socketio.emit(event, data, room=session_id)
+        except Exception as e:
+            logging.error(f"Erro ao enviar evento '{event}' ao terminal: {e}")